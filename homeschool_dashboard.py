@@ -1,386 +1,987 @@
 import argparse
-import os
+import gzip
+import json
+import sys
+import warnings
 import webbrowser
-from datetime import datetime
+from contextlib import ExitStack
 
 import pandas as pd
 from bokeh.embed import components
-from bokeh.models import Div
 from bokeh.resources import INLINE
 from jinja2 import Template
 
-from hsd_constants import LOGO_BW, OUTPUT_FILE, PALETTE
-from hsd_plot import barchart, curricula, days, donut, reading_level, reading_list
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from hsd_cli import summary_argv
+from hsd_constants import (
+    COMPRESSION,
+    DEFAULT_WIDGETS,
+    LOGO_BW,
+    OUTPUT_FILE,
+    WEBGL_MODES,
+    WEBGL_THRESHOLD,
+    WIDGETS,
+)
+from hsd_data import (
+    DUPLICATE_CHECKS,
+    ORDERS,
+    OVERLAP_CHECKS,
+    inspect_grade,
+    load_dashboard_data,
+)
+from hsd_index import INDEX_FILE, discover
+from hsd_ingest import FORMATS, PREFETCH_WORKERS
+from hsd_plot import (
+    barchart,
+    calendar_heatmap,
+    cumulative_hours,
+    curricula,
+    day_columns,
+    days,
+    donut,
+    grade_comparison,
+    lifetime_hours,
+    link_totals,
+    reading_level,
+    reading_list_index,
+    reading_list_sources,
+    reading_list_views,
+    teacher_class_heatmap,
+    time_of_day_heatmap,
+    total_hours,
+    week_slot_hours,
+    window_hours,
+)
 from styles import CSS
 from templates import INNER_TEMPLATE_STR, OUTER_TEMPLATE_STR
-from fi import get_percentage
-from utils import parse_date
+from utils import minify_html
 
 
-def _find_bad_rows(df, checks):
-    """Find rows with invalid data and return formatted error messages.
+def _reading_list_components(model):
+    """Embed the reading lists of every grade with a single components()
+    call. Each distinct reading list gets one set of data sources and one
+    search index, which are shared by the tables of every grade that
+    points at it, so its book data is serialized into the page once.
 
     Args:
-        df (DataFrame): the DataFrame being validated.
-        checks (list): list of (mask, message) tuples where mask is a
-            boolean Series and message describes the problem.
+        model (DashboardData): the model being rendered.
 
     Returns:
-        list: formatted error strings, one per bad row/field.
+        tuple: the script for all reading lists and, for each grade in the
+        order of model.grades, the div of its search box, or None, and a
+        list of (heading, table) div pairs, one per sheet.
     """
-    bad_rows = []
-    # Combine all boolean masks into one using bitwise OR (|=) so
-    # that any row flagged by any check is included. This is a
-    # vectorized pandas operation, not a per-row loop.
-    combined = pd.Series(False, index=df.index)
-    for mask, _ in checks:
-        combined |= mask
-    # Only loop over rows when there's actually bad data
-    if combined.any():
-        for idx in df.index[combined]:
-            row_num = idx + 2  # +1 for 0-index, +1 for header row
-            for mask, msg in checks:
-                if mask.at[idx]:
-                    bad_rows.append(f"  Row {row_num}: {msg}")
-    return bad_rows
-
-
-def generate_plots(files):
-    """Main function that generates the plots and all corresponding html.
+    registry = {}
+    widgets = {}
+    keys = []
+    for g, grade in enumerate(model.grades):
+        keys.append((None, []))
+        if grade.reading_list not in model.reading_lists:
+            continue
+        if grade.reading_list not in registry:
+            sources = reading_list_sources(model.reading_lists[grade.reading_list])
+            registry[grade.reading_list] = sources, reading_list_index(sources)
+        search, *sheets = reading_list_views(*registry[grade.reading_list])
+        widgets[f'{g}-search'] = search[0]
+        pairs = []
+        for i, (heading, table) in enumerate(sheets):
+            widgets[f'{g}-{i}-heading'] = heading
+            widgets[f'{g}-{i}-table'] = table
+            pairs.append((f'{g}-{i}-heading', f'{g}-{i}-table'))
+        keys[g] = f'{g}-search', pairs
+    if not widgets:
+        return '', [(None, []) for g in model.grades]
+    script, divs = components(widgets)
+    return script, [
+        (divs[search] if search else None, [(divs[h], divs[t]) for h, t in pairs])
+        for search, pairs in keys
+    ]
+
+
+def _calendar(grade):
+    by_day = grade.cube.by_day
+    if not by_day.empty:
+        return calendar_heatmap(by_day.index, by_day.values)
+
+
+def _time_of_day(grade):
+    sessions = grade.sessions
+    if not sessions.empty:
+        return time_of_day_heatmap(
+            week_slot_hours(sessions['start'], sessions['end'])
+        )
+
+
+def _teachers(grade):
+    if not grade.cube.teacher_classes.empty:
+        return teacher_class_heatmap(grade.cube.teacher_classes)
+
+
+def _reading_level(grade):
+    if not grade.reading_level.empty:
+        return reading_level(
+            grade.reading_level['level'], grade.reading_level['date']
+        )
+
+
+def _curricula(grade):
+    if not grade.curricula.empty:
+        return curricula(grade.curricula)
+
+
+# Widgets that only need their own grade's data. Each builder returns None
+# when there is nothing to show.
+WIDGET_BUILDERS = {
+    'calendar': _calendar,
+    'time_of_day': _time_of_day,
+    'teachers': _teachers,
+    'reading_level': _reading_level,
+    'curricula': _curricula,
+}
+SUMMARY_WIDGETS = ('total_hours', 'barchart', 'donut')
+
+
+def grade_widgets(
+    grade, linked_totals=False, day_data=None, widgets=DEFAULT_WIDGETS, webgl=None
+):
+    """Build the Bokeh widgets for one grade. Only the data needed by the
+    requested widgets is computed.
 
     Args:
-        files (list): list of strings.
+        grade (GradeData): the grade to show.
+        linked_totals (bool): link the summary to the days range, see
+            generate_plots. Needs the days widget.
+        day_data (dict): optional columns for the days plot, see
+            hsd_plot.day_columns. Defaults to every session of the grade.
+        widgets (iterable): names of the widgets to build, any of
+            hsd_constants.WIDGETS. 'days' also builds the 'slider'.
+        webgl (bool): draw the days plot with WebGL, see hsd_plot.days.
+            By default WebGL is used for grades with at least
+            WEBGL_THRESHOLD sessions, even if day_data only holds some.
 
     Returns:
-        HTML (str): everything needed to display the data including
-        Javascript and CSS.
+        dict: widget names mapped to Bokeh models.
     """
-    seconds_in_an_hour = 3600
-    name = ''
-    inner_html = ''
-    for file in files:
-        spreadsheet = pd.ExcelFile(file)
-        sheet_names = spreadsheet.sheet_names
-
-        grade = ''
-        hours = []
-        teacher_hours = {}
-        min_date = datetime.max
-        max_date = datetime.min
-        day_data = {}
-        level = pd.Series([])
-        level_date = pd.Series([])
-        reading_lists = ''
-        reading_list_path = ''
-        curricula_data = {
-            'Course': [],
-            'Materials': [],
-            'ISBN': [],
-        }
-
-        for key in sheet_names:
-            day_data[key] = {
-                'dates': [],
-                'date_strings': [],
-                'hours': [],
-                'start_times': [],
-                'start_time_strings': [],
-                'end_times': [],
-                'end_time_strings': [],
-                'color': [],
-                'class': [],
-                'description': [],
-            }
-
-        filename = os.path.basename(file)
-
-        for i, sheet_name in enumerate(sheet_names):
-            try:
-                df = pd.read_excel(file, sheet_name=sheet_name)
-                df.columns = df.columns.str.lower()
-
-                # Validate required columns exist
-                required_cols = ['date', 'start time', 'end time']
-                missing = [c for c in required_cols if c not in df.columns]
-                if missing:
-                    raise KeyError(
-                        f"Missing required column(s): "
-                        f"{', '.join(missing)}"
-                    )
-
-                # Drop rows with NaT values
-                df = df.dropna(subset=['end time'])
-                df = df.dropna(subset=['start time'])
-                df = df.dropna(subset=['date'])
-
-                # Make usre that start times and date times (datetime objects)
-                # are treated as strings so they can be reparsed for consistency
-                data_types = {'start time': str, 'end time': str}
-                df = df.astype(data_types)
-
-                start_time = df['start time'] = pd.to_datetime(
-                    df['start time'].apply(parse_date), errors='coerce'
-                )
-                end_time = df['end time'] = pd.to_datetime(
-                    df['end time'].apply(parse_date), errors='coerce'
-                )
-
-                parsed_dates = pd.to_datetime(
-                    df['date'], errors='coerce'
-                )
-
-                # Check for unparseable dates/times and report row numbers
-                bad_rows = _find_bad_rows(df, [
-                    (parsed_dates.isna(), "invalid 'date'"),
-                    (start_time.isna(), "invalid 'start time'"),
-                    (end_time.isna(), "invalid 'end time'"),
-                ])
-                if bad_rows:
-                    detail = "\n".join(bad_rows)
-                    raise ValueError(
-                        f"Invalid data found:\n{detail}"
-                    )
-
-                duration = end_time - start_time
-
-                # Check for end times before start times (e.g. AM/PM error)
-                bad_durations = _find_bad_rows(df, [
-                    (duration < pd.Timedelta(0),
-                     "end time is before start time"),
-                ])
-                if bad_durations:
-                    detail = "\n".join(bad_durations)
-                    raise ValueError(
-                        f"Invalid data found:\n{detail}"
-                    )
-
-                hours_decimal = (
-                    duration.dt.total_seconds() / seconds_in_an_hour
-                )
-                df['hours'] = hours_decimal
-
-                oldest_date = parsed_dates.min()
-                newest_date = parsed_dates.max()
-                if oldest_date < min_date:
-                    min_date = oldest_date
-                if newest_date > max_date:
-                    max_date = newest_date
-
-                day_data[sheet_name]['dates'].extend(parsed_dates)
-                day_data[sheet_name]['date_strings'].extend(
-                    parsed_dates.dt.strftime('%Y-%m-%d')
-                )
-                num_cells = len(day_data[sheet_name]['dates'])
-                day_data[sheet_name]['start_times'].extend(
-                    start_time.dt.time
-                )
-                day_data[sheet_name]['start_time_strings'].extend(
-                    start_time.dt.strftime('%I:%M %p')
-                )
-                day_data[sheet_name]['end_times'].extend(end_time.dt.time)
-                day_data[sheet_name]['end_time_strings'].extend(
-                    end_time.dt.strftime('%I:%M %p')
-                )
-                day_data[sheet_name]['hours'].extend(df['hours'])
-                day_data[sheet_name]['color'].extend(
-                    [PALETTE[i] for x in range(num_cells)]
-                )
-                day_data[sheet_name]['class'].extend(
-                    [sheet_name for x in range(num_cells)]
-                )
-                day_data[sheet_name]['description'].extend(
-                    df['description']
-                )
+    widgets = set(widgets)
+    built = {}
+    # Every summary is a roll-up of the grade's aggregate cube
+    cube = grade.cube
+    classes = grade.classes
+
+    if 'days' in widgets:
+        by_day = cube.by_day
+        if day_data is None:
+            day_data = day_columns(grade.sessions, classes)
+        if webgl is None:
+            webgl = len(grade.sessions) >= WEBGL_THRESHOLD
+        built['days'], built['slider'] = days(
+            day_data, by_day.index.min(), by_day.index.max(), webgl=webgl
+        )
 
-                total_hours = df['hours'].sum()
-                hours.append(total_hours)
-
-                # Accumulate hours per teacher
-                try:
-                    teachers = df['teacher'].fillna('Independent')
-                    for teacher, h in df.groupby(teachers)['hours'].sum().items():
-                        teacher_hours[teacher] = (
-                            teacher_hours.get(teacher, 0) + h
-                        )
-                except (KeyError):
-                    pass
-
-                # Populate curricula data
-                try:
-                    materials = df['materials'].dropna()
-                    if len(materials) > 0:
-                        curricula_data['Materials'].extend(materials)
-                        curricula_data['Course'].append(sheet_name)
-                        curricula_data['Course'].extend(
-                            [pd.NA for i in range(len(materials) - 1)]
-                        )
-                        isbn = df['isbn'][: len(materials)].fillna('')
-                        curricula_data['ISBN'].extend(isbn)
-                except (KeyError):
-                    pass
-
-                # Set global variables if they exist in the first row of
-                # any spreadsheet. These are treated like user
-                # configuration.
-                try:
-                    column_index = df.columns.get_loc('grade')
-                    tmp_grade = df.iloc[0, column_index]
-                    if isinstance(tmp_grade, str):
-                        grade = tmp_grade
-                except (KeyError):
-                    pass
-
-                try:
-                    column_index = df.columns.get_loc('name')
-                    tmp_name = df.iloc[0, column_index]
-                    if isinstance(tmp_name, str):
-                        name = tmp_name
-                except (KeyError):
-                    pass
-
-                try:
-                    column_index = df.columns.get_loc('reading list')
-                    reading_list_path = df.iloc[0, column_index]
-                except (KeyError):
-                    pass
-
-                # Build reading lists if a path was found.
-                if reading_list_path:
-                    reading_lists = reading_list(
-                        reading_list_path,
-                        base_dir=os.path.dirname(os.path.abspath(file)),
-                    )
-
-                # Reading level if it exists.
-                try:
-                    level = df['reading level'].dropna()
-                    copy = df.loc[level.index]
-                    level_date = pd.to_datetime(copy['date'])
-                except (KeyError):
-                    pass
-
-            except Exception as e:
-                raise type(e)(
-                    f"Sheet '{sheet_name}' in '{filename}': {e}"
-                ) from e
+    if widgets.intersection(SUMMARY_WIDGETS):
+        hours = cube.by_class.tolist()
+        total = cube.total
+        teacher_hours = cube.by_teacher
+
+        # In linked mode the summary starts out showing the hours inside
+        # the initial range of the days plot. Daily roll-ups keep the
+        # running totals to one entry per day.
+        linked_totals = linked_totals and 'days' in built
+        if linked_totals:
+            x_range = built['days'].x_range
+            window = (x_range.start, x_range.end)
+            class_cumulative = cumulative_hours(
+                cube.rollup('date', 'class').reset_index(), 'class', classes
+            )
+            teacher_cumulative = cumulative_hours(
+                cube.rollup('date', 'teacher').reset_index(),
+                'teacher',
+                list(teacher_hours.index),
+            )
+            hours = window_hours(*class_cumulative, *window)
+            total = sum(hours)
+            teacher_hours = pd.Series(
+                window_hours(*teacher_cumulative, *window),
+                index=teacher_hours.index,
+            ).sort_values(ascending=False)
 
         # Simple HTML elements to drop on the page.
-        total = sum(hours)
-        teacher_html = ''
-        if teacher_hours:
-            sorted_teachers = sorted(
-                teacher_hours.items(), key=lambda x: x[1], reverse=True
-            )
-            lines = [
-                f'{name}: {get_percentage(h, total, r=True)}%'
-                for name, h in sorted_teachers
-            ]
-            teacher_html = (
-                '<hr style="margin: 0.5em 0;"/>'
-                '<p style="font-size: 0.5em;">'
-                + '<br/>'.join(lines)
-                + '</p>'
+        if 'total_hours' in widgets:
+            built['total_hours'] = total_hours(total, teacher_hours.items())
+        if 'barchart' in widgets:
+            built['barchart'] = barchart(classes, hours)
+        if 'donut' in widgets:
+            built['donut'] = donut(classes, hours)
+        if linked_totals:
+            link_totals(
+                x_range,
+                class_cumulative,
+                teacher_cumulative,
+                built.get('barchart'),
+                built.get('donut'),
+                built.get('total_hours'),
             )
-        total_hours_taught = Div(
-            styles={'text-align': 'center', 'font-size': '2em'},
-            text=(
-                f'<p><strong>{round(total, 2)}</strong>'
-                f' <br/>hours of learning</p>'
-                f'{teacher_html}'
-            ),
-            sizing_mode='stretch_width',
-        )
 
-        days_plot, days_select = days(day_data, min_date, max_date)
-
-        # Reading lists are special
-        dyn_scripts = []
-        dyn_divs = []
-        for component_set in reading_lists:
-            for component in component_set:
-                dyn_script, dyn_div = components(component)
-                dyn_scripts.append(dyn_script)
-                dyn_divs.append(dyn_div)
-
-        # Widgets and plots to display
-        widgets = {
-            'total_hours': total_hours_taught,
-            'barchart': barchart(sheet_names, hours),
-            'donut': donut(sheet_names, hours),
-            'days': days_plot,
-            'slider': days_select,
-        }
-
-        # Optional widgets and plots to dispaly
-        if not level.empty and not level_date.empty:
-            widgets['reading_level'] = reading_level(level, level_date)
-        if any(list(curricula_data.values())[1:]):
-            widgets['curricula'] = curricula(curricula_data)
-
-        inner_template = Template(INNER_TEMPLATE_STR)
-
-        script, div = components(widgets)
-        html = inner_template.render(
-            plot_script=script,
-            plot_div=div,
-            dyn_scripts=dyn_scripts,
-            dyn_divs=dyn_divs,
-            grade=grade,
+    # Optional widgets and plots to dispaly
+    for name, builder in WIDGET_BUILDERS.items():
+        if name in widgets:
+            widget = builder(grade)
+            if widget is not None:
+                built[name] = widget
+    return built
+
+
+def _grade_label(grade, taken):
+    """A label for a grade on the comparison plots that isn't taken yet."""
+    base = ' '.join(t for t in (grade.name, grade.grade) if t) or grade.source
+    label = base
+    n = 2
+    while label in taken:
+        label = f'{base} ({n})'
+        n += 1
+    return label
+
+
+def comparison_widgets(model):
+    """Plots comparing the grades of a dashboard: the hours of each class
+    per grade and the running total of hours of each student. They are
+    built from every grade's class and monthly totals, the sessions aren't
+    looked at again.
+
+    Args:
+        model (DashboardData): the loaded data.
+
+    Returns:
+        dict: 'classes' and 'lifetime' mapped to Bokeh plots, empty if
+        there are fewer than two grades to compare.
+    """
+    if len(model.grades) < 2:
+        return {}
+    labels = []
+    class_hours = {}
+    monthly = {}
+    for i, grade in enumerate(model.grades):
+        labels.append(_grade_label(grade, labels))
+        for name, hours in grade.cube.by_class.items():
+            per_grade = class_hours.setdefault(str(name), [0.0] * len(model.grades))
+            per_grade[i] = float(hours)
+        monthly.setdefault(grade.name or 'All grades', []).append(
+            grade.cube.by_month
         )
-        inner_html += html
+    monthly = {
+        student: pd.concat(months).groupby(level=0).sum().sort_index()
+        for student, months in monthly.items()
+    }
+    return {
+        'classes': grade_comparison(labels, class_hours),
+        'lifetime': lifetime_hours(monthly),
+    }
+
+
+def _render_grade(
+    grade,
+    inner_template,
+    reading_list_divs,
+    linked_totals=False,
+    widgets=DEFAULT_WIDGETS,
+    webgl=None,
+):
+    """Render the accordion panel for one grade.
+
+    Args:
+        grade (GradeData): the grade to render.
+        inner_template (Template): the compiled INNER_TEMPLATE_STR.
+        reading_list_divs (tuple): the grade's reading list search box and
+            sheet divs, see _reading_list_components.
+        linked_totals (bool): link the summary to the days range, see
+            generate_plots.
+        widgets (iterable): names of the widgets to show, see
+            grade_widgets.
+        webgl (bool): optional, see grade_widgets.
+
+    Returns:
+        str: HTML
+    """
+    models = grade_widgets(
+        grade, linked_totals=linked_totals, widgets=widgets, webgl=webgl
+    )
+    script, div = components(models) if models else ('', {})
+    search_div, sheet_divs = reading_list_divs
+    return inner_template.render(
+        plot_script=script,
+        plot_div=div,
+        search_div=search_div,
+        sheet_divs=sheet_divs,
+        grade=grade.grade,
+    )
+
 
-        # Redundant closing of file but necessary for some reason
-        spreadsheet.close()
+def _template(source, minify=False):
+    if minify:
+        return Template(minify_html(source), trim_blocks=True, lstrip_blocks=True)
+    return Template(source)
 
-    js_resources = INLINE.render_js()
-    css_resources = INLINE.render_css()
-    outer_template = Template(OUTER_TEMPLATE_STR)
-    outer_html = outer_template.render(
-        content=inner_html,
-        name=name,
+
+def render_chunks(
+    model,
+    linked_totals=False,
+    minify=False,
+    resources=INLINE,
+    widgets=DEFAULT_WIDGETS,
+    css_url=None,
+    home_url=None,
+    webgl=None,
+):
+    """Render a dashboard from data that has already been loaded, piece by
+    piece, so it can be written out or compressed while it's rendered.
+
+    Args:
+        model (DashboardData): the output of load_dashboard_data, or a
+            model restored with DashboardData.from_json.
+        linked_totals (bool): link the summary to the days range, see
+            generate_plots.
+        minify (bool): strip indentation and blank lines from the HTML
+            and CSS.
+        resources (Resources): how the page loads BokehJS, inlined in the
+            page by default.
+        widgets (iterable): names of the widgets to show, any of
+            hsd_constants.WIDGETS. Widgets that aren't shown aren't
+            computed and their rows are left out of the page.
+        css_url (str): optional, link to the stylesheet at this URL
+            instead of embedding it, see hsd_site.
+        home_url (str): optional, add a link back to this URL to the
+            header.
+        webgl (bool): draw the days plots with WebGL (True) or the
+            canvas (False). By default WebGL is used for grades with at
+            least hsd_constants.WEBGL_THRESHOLD sessions.
+
+    Yields:
+        str: consecutive pieces of the page.
+    """
+    widgets = list(widgets)
+    unknown = [w for w in widgets if w not in WIDGETS]
+    if unknown:
+        raise ValueError(
+            f"Unknown widget(s): {', '.join(unknown)}, "
+            f"use any of: {', '.join(WIDGETS)}"
+        )
+    inner_template = _template(INNER_TEMPLATE_STR, minify)
+    comparison_script, comparison_div = '', {}
+    if 'comparison' in widgets:
+        comparison = comparison_widgets(model)
+        if comparison:
+            comparison_script, comparison_div = components(comparison)
+    if 'reading_lists' in widgets:
+        reading_list_script, reading_list_divs = _reading_list_components(model)
+    else:
+        reading_list_script = ''
+        reading_list_divs = [(None, []) for g in model.grades]
+    # Grades are rendered one at a time as the outer template reaches them
+    content = (
+        _render_grade(
+            grade,
+            inner_template,
+            divs,
+            linked_totals=linked_totals,
+            widgets=widgets,
+            webgl=webgl,
+        )
+        for grade, divs in zip(model.grades, reading_list_divs)
+    )
+    js_resources = resources.render_js()
+    css_resources = resources.render_css()
+    outer_template = _template(OUTER_TEMPLATE_STR, minify)
+    yield from outer_template.generate(
+        content=content,
+        comparison_script=comparison_script,
+        comparison_div=comparison_div,
+        reading_list_script=reading_list_script,
+        name=model.name,
         bokeh_js=js_resources,
         bokeh_css=css_resources,
-        css=CSS,
+        css=minify_html(CSS) if minify else CSS,
+        css_url=css_url,
+        home_url=home_url,
         logo=LOGO_BW,
     )
-    return outer_html
 
 
-def run_in_code(files):
+def render(model, **options):
+    """Render a dashboard from data that has already been loaded.
+
+    Args:
+        model (DashboardData): the output of load_dashboard_data, or a
+            model restored with DashboardData.from_json.
+        options: rendering options, see render_chunks.
+
+    Returns:
+        HTML (str): everything needed to display the data including
+        Javascript and CSS.
+    """
+    return ''.join(render_chunks(model, **options))
+
+
+def generate_plots(
+    files,
+    fmt=None,
+    chunksize=None,
+    workers=PREFETCH_WORKERS,
+    names=None,
+    reading_list_resolver=None,
+    order=None,
+    overlaps=None,
+    duplicates=None,
+    **options,
+):
+    """Main function that generates the plots and all corresponding html.
+
+    Args:
+        files (list): time logs in any format supported by hsd_ingest, as
+            paths, bytes or file-like objects, e.g. uploaded files.
+        fmt (str): optional input format for all files, one of
+            hsd_ingest.FORMATS. Guessed from each file extension if None.
+        chunksize (int): read time logs this many rows at a time to keep
+            memory use flat, see hsd_data.load_grade.
+        workers (int): number of files read concurrently before parsing,
+            0 reads them one at a time, see hsd_data.load_dashboard_data.
+        names (list): optional display names of the files. In-memory
+            files need a name with an extension, e.g. 'Time-1.xlsx', unless
+            fmt is given.
+        reading_list_resolver (callable): optional, maps the reading list
+            path written in a time log and the display name of the time log
+            to a path, bytes or a file-like object, see
+            hsd_data.load_grade.
+        order (str): optional, 'oldest' or 'newest' to sort grades by the
+            first date in their time log, see hsd_data.load_dashboard_data.
+        overlaps (str): optional, 'warn' or 'fail' on sessions that overlap
+            in time, see hsd_data.check_overlaps.
+        duplicates (str): optional, 'warn', 'drop' or 'fail' on sessions
+            entered more than once, see hsd_data.check_duplicates.
+        options: rendering options, see render_chunks. With
+            linked_totals=True the hours summary, barchart and donut show
+            the hours inside the range selected on the days plot and update
+            as the range moves, instead of showing the whole year. widgets
+            picks the widgets to show, reading lists are only loaded when
+            'reading_lists' is one of them. With more than one file
+            'comparison' adds plots comparing the grades to the top of the
+            page, see comparison_widgets.
+
+    Returns:
+        HTML (str): everything needed to display the data including
+        Javascript and CSS.
+    """
+    model = load_dashboard_data(
+        files,
+        fmt=fmt,
+        chunksize=chunksize,
+        workers=workers,
+        names=names,
+        reading_list_resolver=reading_list_resolver,
+        reading_lists='reading_lists' in options.get('widgets', DEFAULT_WIDGETS),
+        order=order,
+        overlaps=overlaps,
+        duplicates=duplicates,
+    )
+    return render(model, **options)
+
+
+def write_html(chunks, output_path=OUTPUT_FILE, compress=(), plain=True):
+    """Write a page as it is rendered, compressing it on the fly. Compressed
+    copies go next to the plain file with .gz or .br appended so a web
+    server can pick them up as precompressed variants.
+
+    Args:
+        chunks (iterable): strings that make up the page, see render_chunks.
+        output_path (str): name of a file, should end in .html.
+        compress (iterable): any of COMPRESSION, brotli is skipped with a
+            warning if it isn't installed.
+        plain (bool): also write the uncompressed file.
+
+    Returns:
+        list: paths of the files written.
+    """
+    paths = []
+    writers = []
+    with ExitStack() as stack:
+        if plain:
+            f = stack.enter_context(open(output_path, 'wb'))
+            writers.append(f.write)
+            paths.append(output_path)
+        for method in compress:
+            path = output_path + COMPRESSION[method]
+            if method == 'gzip':
+                # mtime=0 keeps the output identical for identical pages
+                f = stack.enter_context(gzip.GzipFile(path, 'wb', mtime=0))
+                writers.append(f.write)
+            elif brotli is None:
+                warnings.warn(
+                    'brotli is not installed, skipping .br output',
+                    RuntimeWarning,
+                )
+                continue
+            else:
+                f = stack.enter_context(open(path, 'wb'))
+                compressor = brotli.Compressor()
+                writers.append(
+                    lambda data, f=f, c=compressor: f.write(c.process(data))
+                )
+                # Runs before the file is closed
+                stack.callback(lambda f=f, c=compressor: f.write(c.finish()))
+            paths.append(path)
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            for write in writers:
+                write(data)
+    return paths
+
+
+def run_in_code(
+    files, fmt=None, chunksize=None, workers=PREFETCH_WORKERS, **options
+):
     """Build a webpage in code and open it in the browser.
 
     Args:
         files (list): paths to files.
+        fmt (str): optional input format, see generate_plots.
+        chunksize (int): optional chunk size, see generate_plots.
+        workers (int): concurrent file reads, see generate_plots.
+        options: rendering options, see render_chunks.
     """
-    html = generate_plots(files)
-    with open(OUTPUT_FILE, 'w') as f:
-        f.write(html)
+    save_html(files, fmt=fmt, chunksize=chunksize, workers=workers, **options)
     webbrowser.open(OUTPUT_FILE)
 
 
-def save_html(files, output_path=OUTPUT_FILE):
+def save_html(
+    files,
+    output_path=OUTPUT_FILE,
+    fmt=None,
+    chunksize=None,
+    workers=PREFETCH_WORKERS,
+    names=None,
+    reading_list_resolver=None,
+    order=None,
+    overlaps=None,
+    duplicates=None,
+    compress=(),
+    plain=True,
+    **options,
+):
     """Build a webpage and save it.
 
     Args:
-        files (list): paths to files.
+        files (list): paths to files, bytes or file-like objects.
         output_file (str): name of a file, should end in .html.
+        fmt (str): optional input format, see generate_plots.
+        chunksize (int): optional chunk size, see generate_plots.
+        workers (int): concurrent file reads, see generate_plots.
+        names (list): optional display names, see generate_plots.
+        reading_list_resolver (callable): optional, see generate_plots.
+        order (str): optional grade order, see generate_plots.
+        overlaps (str): optional overlap check, see generate_plots.
+        duplicates (str): optional duplicate check, see generate_plots.
+        compress (iterable): write precompressed copies, see write_html.
+        plain (bool): write the uncompressed file, see write_html.
+        options: rendering options, see render_chunks.
+
+    Returns:
+        list: paths of the files written.
     """
-    html = generate_plots(files)
-    with open(output_path, 'w') as f:
-        f.write(html)
+    model = load_dashboard_data(
+        files,
+        fmt=fmt,
+        chunksize=chunksize,
+        workers=workers,
+        names=names,
+        reading_list_resolver=reading_list_resolver,
+        reading_lists='reading_lists' in options.get('widgets', DEFAULT_WIDGETS),
+        order=order,
+        overlaps=overlaps,
+        duplicates=duplicates,
+    )
+    return write_html(
+        render_chunks(model, **options),
+        output_path,
+        compress=compress,
+        plain=plain,
+    )
 
 
-def run():
-    """Build a webpage and open it in the browser."""
-    parser = argparse.ArgumentParser()
+def _widget_list(value):
+    """Parse a comma separated list of widget names."""
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in WIDGETS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown widget(s): {', '.join(unknown)}, "
+            f"use any of: {', '.join(WIDGETS)}"
+        )
+    return names
+
+
+def _selected_widgets(args):
+    """Widgets picked with --widgets and --skip, in display order."""
+    chosen = args.widgets or DEFAULT_WIDGETS
+    skipped = args.skip or []
+    return [name for name in WIDGETS if name in chosen and name not in skipped]
+
+
+def _input_files(args):
+    """Files given on the command line followed by the time logs found
+    under --root."""
+    files = list(args.files)
+    if args.root:
+        files.extend(discover(args.root, workers=args.workers))
+    return files
+
+
+def _add_dashboard_arguments(parser):
+    """Arguments shared by every way of building a dashboard."""
     parser.add_argument('files', nargs='*', help='List of files')
-    args = parser.parse_args()
-    files = args.files
+    parser.add_argument(
+        '--root',
+        help='Also show every time log found under this directory, what is '
+        f'found is remembered in {INDEX_FILE} at its top',
+    )
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Input format, guessed from the file extension by default',
+    )
+    parser.add_argument(
+        '--linked-totals',
+        action='store_true',
+        help='Show hours for the range selected on the days plot',
+    )
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        help='Read time logs this many rows at a time to bound memory use',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=PREFETCH_WORKERS,
+        help='Read this many files at the same time before parsing, '
+        'useful on network storage. 0 reads files one at a time',
+    )
+    parser.add_argument(
+        '--order',
+        choices=ORDERS,
+        help='Sort grades by their first date instead of the order of files',
+    )
+    parser.add_argument(
+        '--overlaps',
+        choices=OVERLAP_CHECKS,
+        help='Warn about or fail on sessions that overlap in time',
+    )
+    parser.add_argument(
+        '--duplicates',
+        choices=DUPLICATE_CHECKS,
+        help='Warn about, drop or fail on sessions entered more than once',
+    )
+    parser.add_argument(
+        '--widgets',
+        type=_widget_list,
+        help=f"Comma separated widgets to show, any of: {', '.join(WIDGETS)}",
+    )
+    parser.add_argument(
+        '--skip',
+        type=_widget_list,
+        help='Comma separated widgets to leave out',
+    )
+    parser.add_argument(
+        '--webgl',
+        choices=tuple(WEBGL_MODES),
+        default='auto',
+        help='Draw the days plot with WebGL, by default for grades with at '
+        f'least {WEBGL_THRESHOLD} sessions',
+    )
 
-    html = generate_plots(files)
-    with open(OUTPUT_FILE, 'w') as f:
-        f.write(html)
-    webbrowser.open(OUTPUT_FILE)
+
+def run_server(argv=None):
+    """Serve the dashboard over HTTP, see hsd_serve."""
+    # Imported here, hsd_serve builds on this module
+    from hsd_serve import CACHE_SIZE, HOST, PORT, RENDER_WORKERS, serve
+
+    parser = argparse.ArgumentParser(prog='homeschool_dashboard serve')
+    _add_dashboard_arguments(parser)
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        help='Strip indentation and blank lines from the page',
+    )
+    parser.add_argument(
+        '--host',
+        default=HOST,
+        help='Address to listen on, 0.0.0.0 for every device on the network',
+    )
+    parser.add_argument('--port', type=int, default=PORT, help='Port to listen on')
+    parser.add_argument(
+        '--render-workers',
+        type=int,
+        default=RENDER_WORKERS,
+        help='Maximum number of dashboards rendered at the same time',
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=CACHE_SIZE,
+        help='Number of rendered dashboards to keep',
+    )
+    args = parser.parse_args(argv)
+    widgets = _selected_widgets(args)
+
+    serve(
+        _input_files(args),
+        host=args.host,
+        port=args.port,
+        workers=args.render_workers,
+        cache_size=args.cache_size,
+        load_options={
+            'fmt': args.format,
+            'chunksize': args.chunksize,
+            'workers': args.workers,
+            'reading_lists': 'reading_lists' in widgets,
+            'order': args.order,
+            'overlaps': args.overlaps,
+            'duplicates': args.duplicates,
+        },
+        render_options={
+            'linked_totals': args.linked_totals,
+            'minify': args.minify,
+            'widgets': widgets,
+            'webgl': WEBGL_MODES[args.webgl],
+        },
+    )
+
+
+def run_site(argv=None):
+    """Write the dashboard as a static site, see hsd_site."""
+    # Imported here, hsd_site builds on this module
+    from hsd_site import SITE_DIR, build_site
+
+    parser = argparse.ArgumentParser(prog='homeschool_dashboard site')
+    _add_dashboard_arguments(parser)
+    parser.add_argument(
+        '-o', '--output', default=SITE_DIR, help='Directory of the site'
+    )
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        help='Strip indentation and blank lines from the pages',
+    )
+    parser.add_argument(
+        '--gzip',
+        action='append_const',
+        const='gzip',
+        dest='compress',
+        help='Also write gzip compressed pages (.html.gz)',
+    )
+    parser.add_argument(
+        '--brotli',
+        action='append_const',
+        const='br',
+        dest='compress',
+        help='Also write brotli compressed pages (.html.br)',
+    )
+    args = parser.parse_args(argv)
+    widgets = _selected_widgets(args)
+
+    rendered = build_site(
+        _input_files(args),
+        args.output,
+        load_options={
+            'fmt': args.format,
+            'chunksize': args.chunksize,
+            'workers': args.workers,
+            'reading_lists': 'reading_lists' in widgets,
+            'order': args.order,
+            'overlaps': args.overlaps,
+            'duplicates': args.duplicates,
+        },
+        render_options={
+            'linked_totals': args.linked_totals,
+            'minify': args.minify,
+            'widgets': widgets,
+            'webgl': WEBGL_MODES[args.webgl],
+        },
+        compress=args.compress or (),
+    )
+    print(f'Wrote {len(rendered)} page(s) to {args.output}')
+
+
+def run_app(argv=None):
+    """Run the dashboard as a Bokeh server application, see hsd_app."""
+    # Imported here, hsd_app builds on this module
+    from hsd_app import HOST, PORT, app
+
+    parser = argparse.ArgumentParser(prog='homeschool_dashboard app')
+    _add_dashboard_arguments(parser)
+    parser.add_argument(
+        '--host',
+        default=HOST,
+        help='Address to listen on, 0.0.0.0 for every device on the network',
+    )
+    parser.add_argument('--port', type=int, default=PORT, help='Port to listen on')
+    parser.add_argument(
+        '--allow-origin',
+        action='append',
+        default=[],
+        help='Also allow pages opened as this host[:port], e.g. the IP '
+        'address of this machine on the network, can be repeated',
+    )
+    args = parser.parse_args(argv)
+    widgets = _selected_widgets(args)
+
+    app(
+        _input_files(args),
+        host=args.host,
+        port=args.port,
+        load_options={
+            'fmt': args.format,
+            'chunksize': args.chunksize,
+            'workers': args.workers,
+            'reading_lists': 'reading_lists' in widgets,
+            'order': args.order,
+            'overlaps': args.overlaps,
+            'duplicates': args.duplicates,
+        },
+        linked_totals=args.linked_totals,
+        widgets=widgets,
+        webgl=WEBGL_MODES[args.webgl],
+        allow_origins=args.allow_origin,
+    )
+
+
+def _info_table(infos):
+    """Plain text summary of GradeInfo, a line per time log followed by
+    its classes."""
+    lines = []
+    for info in infos:
+        span = ''
+        if info.start is not None:
+            span = f'from {info.start:%Y-%m-%d}'
+        if info.end is not None:
+            span += f' to {info.end:%Y-%m-%d}'
+        lines.append(
+            f'{info.source}: {info.name or "?"}, {info.grade or "?"}, '
+            f'{info.rows} rows, {span or "no dates"} ({info.elapsed_ms:.0f} ms)'
+        )
+        lines.extend(f'    {name}: {rows}' for name, rows in info.classes.items())
+        if info.reading_list:
+            lines.append(f'    reading list: {info.reading_list}')
+    return '\n'.join(lines)
+
+
+def run_inspect(argv=None):
+    """Print what is in time logs without building a dashboard, see
+    hsd_data.inspect_grade."""
+    parser = argparse.ArgumentParser(prog='homeschool_dashboard inspect')
+    parser.add_argument('files', nargs='*', help='List of files')
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Input format, guessed from the file extension by default',
+    )
+    parser.add_argument(
+        '--first-rows',
+        action='store_true',
+        help="Only read the first row of each sheet, faster for large "
+        "workbooks but the last date isn't known",
+    )
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+    args = parser.parse_args(argv)
+
+    infos = [
+        inspect_grade(file, fmt=args.format, last_rows=not args.first_rows)
+        for file in args.files
+    ]
+    if args.json:
+        print(json.dumps([info.to_dict() for info in infos], indent=2))
+    else:
+        print(_info_table(infos))
+
+
+def run(argv=None):
+    """Build a webpage and open it in the browser, serve it with the serve
+    subcommand, write a site with a page per grade with the site
+    subcommand or run it as a Bokeh app with the app subcommand. The
+    inspect subcommand describes time logs without building anything, and
+    --summary prints the totals, see hsd_summary."""
+    argv = sys.argv[1:] if argv is None else argv
+    summary = summary_argv(argv)
+    if summary is not None:
+        from hsd_summary import run as run_summary
+
+        run_summary(summary)
+        return
+    if argv[:1] == ['inspect']:
+        run_inspect(argv[1:])
+        return
+    if argv[:1] == ['serve']:
+        run_server(argv[1:])
+        return
+    if argv[:1] == ['app']:
+        run_app(argv[1:])
+        return
+    if argv[:1] == ['site']:
+        run_site(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser()
+    _add_dashboard_arguments(parser)
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        help='Strip indentation and blank lines from the page',
+    )
+    parser.add_argument(
+        '-o', '--output', default=OUTPUT_FILE, help='Path of the HTML file'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='append_const',
+        const='gzip',
+        dest='compress',
+        help='Also write a gzip compressed copy (.html.gz)',
+    )
+    parser.add_argument(
+        '--brotli',
+        action='append_const',
+        const='br',
+        dest='compress',
+        help='Also write a brotli compressed copy (.html.br)',
+    )
+    parser.add_argument(
+        '--no-plain',
+        action='store_true',
+        help="Only write the compressed copies, don't open the browser",
+    )
+    args = parser.parse_args(argv)
+    files = _input_files(args)
+
+    save_html(
+        files,
+        args.output,
+        fmt=args.format,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        order=args.order,
+        overlaps=args.overlaps,
+        duplicates=args.duplicates,
+        compress=args.compress or (),
+        plain=not args.no_plain,
+        linked_totals=args.linked_totals,
+        minify=args.minify,
+        widgets=_selected_widgets(args),
+        webgl=WEBGL_MODES[args.webgl],
+    )
+    if not args.no_plain:
+        webbrowser.open(args.output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,304 @@
+"""Module Description
+
+This module contains the Bokeh server application behind the app
+subcommand. It shows the same widgets as the static page, one tab per
+grade, but the days plot only holds the sessions around the range that
+is selected with the slider. Sessions stay on the server sorted by date,
+and a new window of them is sent to the browser whenever the selected
+range moves outside of the one already sent.
+"""
+import socket
+
+import numpy as np
+import pandas as pd
+from bokeh.application import Application
+from bokeh.application.handlers.function import FunctionHandler
+from bokeh.layouts import column, row
+from bokeh.models import Div, TabPanel, Tabs
+from bokeh.server.server import Server
+
+from homeschool_dashboard import SUMMARY_WIDGETS, comparison_widgets, grade_widgets
+from hsd_constants import DEFAULT_WIDGETS
+from hsd_data import load_dashboard_data
+from hsd_plot import (
+    day_columns,
+    reading_list_index,
+    reading_list_sources,
+    reading_list_views,
+)
+
+HOST = 'localhost'
+PORT = 5006
+# Extra days loaded on both sides of the selected range, as a share of its
+# width, so small drags don't need a round trip to the server.
+WINDOW_MARGIN = 0.5
+
+
+def _timestamp(value):
+    """Range values come back from the browser as milliseconds since the
+    epoch."""
+    if isinstance(value, (int, float)):
+        return pd.Timestamp(value, unit='ms')
+    return pd.Timestamp(value)
+
+
+class SessionWindow:
+    """The sessions of one grade sorted by date, so the sessions in a date
+    range can be found with a binary search.
+
+    Args:
+        sessions (DataFrame): sessions with hsd_data.SESSION_COLUMNS.
+        classes (list): class names in display order.
+    """
+
+    def __init__(self, sessions, classes):
+        self.classes = list(classes)
+        self.sessions = sessions.sort_values(
+            'date', kind='stable', ignore_index=True
+        )
+        self._dates = pd.to_datetime(self.sessions['date']).to_numpy()
+
+    def between(self, start, end):
+        """Sessions from start to end, both inclusive.
+
+        Args:
+            start: first date, anything pd.Timestamp takes.
+            end: last date.
+
+        Returns:
+            DataFrame
+        """
+        lo = np.searchsorted(self._dates, np.datetime64(_timestamp(start)), 'left')
+        hi = np.searchsorted(self._dates, np.datetime64(_timestamp(end)), 'right')
+        return self.sessions.iloc[lo:hi]
+
+    def span(self, start, end, margin=WINDOW_MARGIN):
+        """A date range around start and end, widened by margin times its
+        width on both sides.
+
+        Returns:
+            tuple: start and end Timestamps.
+        """
+        start, end = _timestamp(start), _timestamp(end)
+        extra = (end - start) * margin
+        return start - extra, end + extra
+
+    def day_data(self, start, end):
+        """Columns for the days plot with the sessions from start to end,
+        see hsd_plot.day_columns."""
+        return day_columns(self.between(start, end), self.classes)
+
+
+def link_window(days_plot, window, span):
+    """Keep the days plot filled with the sessions around its visible
+    range. Only the data sources of the plot are replaced, the plot
+    itself stays as it is.
+
+    Args:
+        days_plot (figure): the days plot, see hsd_plot.days.
+        window (SessionWindow): sessions of the plotted grade.
+        span (tuple): start and end of the sessions the plot holds now.
+    """
+    # days() draws one segment renderer per class, in class order
+    sources = dict(
+        zip(window.classes, (r.data_source for r in days_plot.renderers))
+    )
+    loaded = list(span)
+    pending = []
+    x_range = days_plot.x_range
+
+    def refresh():
+        pending.clear()
+        start, end = _timestamp(x_range.start), _timestamp(x_range.end)
+        if loaded[0] <= start and end <= loaded[1]:
+            return
+        loaded[:] = window.span(start, end)
+        for class_name, data in window.day_data(*loaded).items():
+            sources[class_name].data = data
+
+    def update(attr, old, new):
+        # Start and end arrive as separate changes, in a server session
+        # they are handled together on the next tick.
+        doc = days_plot.document
+        if doc is None or doc.session_context is None:
+            refresh()
+        elif not pending:
+            pending.append(doc.add_next_tick_callback(refresh))
+
+    x_range.on_change('start', update)
+    x_range.on_change('end', update)
+
+
+def grade_panel(
+    grade,
+    window,
+    reading_list=(),
+    linked_totals=False,
+    widgets=DEFAULT_WIDGETS,
+    webgl=None,
+):
+    """Tab with the widgets of one grade.
+
+    Args:
+        grade (GradeData): the grade to show.
+        window (SessionWindow): sessions of the grade.
+        reading_list (list): the grade's reading list views, see
+            hsd_plot.reading_list_views.
+        linked_totals (bool): link the summary to the days range.
+        widgets (iterable): names of the widgets to show, see
+            homeschool_dashboard.grade_widgets.
+        webgl (bool): optional, draw the days plot with WebGL, by default
+            decided by the sessions of the whole grade.
+
+    Returns:
+        TabPanel
+    """
+    day_data = span = None
+    if 'days' in widgets:
+        # Same initial range as hsd_plot.days
+        end = grade.cube.by_day.index.max()
+        span = window.span(end - pd.Timedelta(days=30), end)
+        day_data = window.day_data(*span)
+    models = grade_widgets(
+        grade,
+        linked_totals=linked_totals,
+        day_data=day_data,
+        widgets=widgets,
+        webgl=webgl,
+    )
+    if span:
+        link_window(models['days'], window, span)
+
+    summary = [models.pop(name) for name in SUMMARY_WIDGETS if name in models]
+    children = [row(*summary)] if summary else []
+    children.extend(models.values())
+    for views in reading_list:
+        children.extend(views)
+    return TabPanel(
+        child=column(*children, sizing_mode='stretch_width'),
+        title=grade.grade or grade.source,
+    )
+
+
+def dashboard(
+    model, windows, linked_totals=False, widgets=DEFAULT_WIDGETS, webgl=None
+):
+    """Layout of the whole dashboard for one browser session.
+
+    Args:
+        model (DashboardData): the loaded data.
+        windows (list): a SessionWindow for each grade.
+        linked_totals (bool): link the summaries to the days ranges.
+        widgets (iterable): names of the widgets to show.
+        webgl (bool): optional, see grade_panel.
+
+    Returns:
+        Bokeh layout
+    """
+    # Grades that share a reading list share its data sources and index
+    sources = {}
+    for path, sheets in model.reading_lists.items():
+        sheet_sources = reading_list_sources(sheets)
+        sources[path] = sheet_sources, reading_list_index(sheet_sources)
+    panels = [
+        grade_panel(
+            grade,
+            window,
+            reading_list=(
+                reading_list_views(*sources[grade.reading_list])
+                if grade.reading_list in sources and 'reading_lists' in widgets
+                else ()
+            ),
+            linked_totals=linked_totals,
+            widgets=widgets,
+            webgl=webgl,
+        )
+        for grade, window in zip(model.grades, windows)
+    ]
+    title = Div(text=f'<h1>{model.name}</h1>' if model.name else '')
+    children = [title]
+    if 'comparison' in widgets:
+        comparison = comparison_widgets(model)
+        if comparison:
+            children.append(row(*comparison.values(), sizing_mode='stretch_width'))
+    children.append(Tabs(tabs=panels))
+    return column(*children, sizing_mode='stretch_width')
+
+
+def websocket_origins(host, port, allow_origins=()):
+    """Origins whose pages may open a session, as host:port. Listening on
+    every address allows this machine's host name, other origins, e.g. an
+    IP address on the network, have to be allowed explicitly.
+
+    Args:
+        host (str): address the app listens on.
+        port (int): port the app listens on.
+        allow_origins (iterable): more hosts, with or without a port.
+            Without one port is used.
+
+    Returns:
+        list: origins for Bokeh's allow_websocket_origin.
+    """
+    hosts = ['localhost']
+    if host == '0.0.0.0':
+        hosts.extend([socket.gethostname(), socket.getfqdn()])
+    else:
+        hosts.append(host)
+    hosts.extend(allow_origins)
+    return list(dict.fromkeys(h if ':' in h else f'{h}:{port}' for h in hosts))
+
+
+def app(
+    files,
+    host=HOST,
+    port=PORT,
+    load_options=None,
+    linked_totals=False,
+    widgets=DEFAULT_WIDGETS,
+    webgl=None,
+    allow_origins=(),
+):
+    """Run the dashboard as a Bokeh server application until interrupted.
+    The data is loaded once, every browser session gets its own widgets.
+
+    Args:
+        files (list): paths to time logs.
+        host (str): address to listen on, use '0.0.0.0' to make the
+            dashboard available to other devices on the network.
+        port (int): port to listen on.
+        load_options: keyword arguments for load_dashboard_data.
+        linked_totals (bool): link the summaries to the days ranges.
+        widgets (iterable): names of the widgets to show.
+        webgl (bool): optional, see grade_panel.
+        allow_origins (iterable): more origins that may open sessions,
+            see websocket_origins.
+    """
+    model = load_dashboard_data(files, **(load_options or {}))
+    windows = [SessionWindow(g.sessions, g.classes) for g in model.grades]
+
+    def make_document(doc):
+        doc.title = 'Homeschool Dashboard'
+        doc.add_root(
+            dashboard(
+                model,
+                windows,
+                linked_totals=linked_totals,
+                widgets=widgets,
+                webgl=webgl,
+            )
+        )
+
+    server = Server(
+        {'/': Application(FunctionHandler(make_document))},
+        address=host,
+        port=port,
+        allow_websocket_origin=websocket_origins(host, port, allow_origins),
+    )
+    server.start()
+    print(f'Serving the dashboard app at http://{host}:{port}/')
+    try:
+        server.io_loop.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
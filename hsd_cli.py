@@ -0,0 +1,45 @@
+"""Module Description
+
+This module is the homeschool_dashboard command. It only imports what the
+command asked for, so --summary, which needs neither Bokeh nor Jinja,
+starts as quickly as hsd_summary itself. Everything else is handed to
+homeschool_dashboard.run.
+"""
+import sys
+
+SUBCOMMANDS = ('inspect', 'serve', 'app', 'site')
+
+
+def summary_argv(argv):
+    """Arguments for hsd_summary when the default command is asked for a
+    summary.
+
+    Args:
+        argv (list): command line arguments without the program name.
+
+    Returns:
+        list: argv without --summary, or None if argv isn't a summary,
+        e.g. because it starts with one of the SUBCOMMANDS.
+    """
+    if argv[:1] and argv[0] in SUBCOMMANDS or '--summary' not in argv:
+        return None
+    return [arg for arg in argv if arg != '--summary']
+
+
+def run(argv=None):
+    """Print a summary with --summary, otherwise build or serve the
+    dashboard, see homeschool_dashboard.run."""
+    argv = sys.argv[1:] if argv is None else argv
+    summary = summary_argv(argv)
+    if summary is not None:
+        from hsd_summary import run as run_summary
+
+        run_summary(summary)
+        return
+    from homeschool_dashboard import run as run_dashboard
+
+    run_dashboard(argv)
+
+
+if __name__ == "__main__":
+    run()
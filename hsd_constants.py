@@ -1,8 +1,35 @@
-from bokeh.palettes import Spectral10
+from bokeh.palettes import Greens9, Spectral10
 
 COLUMN_HEIGHT = 450
+CALENDAR_HEIGHT = 220
 PALETTE = Spectral10
+HEATMAP_PALETTE = Greens9[::-1]
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+# Width of the time of day bins of the time_of_day widget
+SLOT_MINUTES = 30
 OUTPUT_FILE = 'homeschool-dashboard.html'
+WIDGETS = (
+    'total_hours',
+    'barchart',
+    'donut',
+    'days',
+    'calendar',
+    'time_of_day',
+    'teachers',
+    'curricula',
+    'reading_level',
+    'reading_lists',
+    'comparison',
+)
+# Widgets built when none are chosen, remove any to leave them out of
+# every build
+DEFAULT_WIDGETS = WIDGETS
+COMPRESSION = {'gzip': '.gz', 'br': '.br'}
+# Sessions in a grade above which the days plot and its slider are drawn
+# with WebGL instead of the canvas
+WEBGL_THRESHOLD = 2000
+# Choices of the --webgl option, None picks WebGL by the threshold
+WEBGL_MODES = {'auto': None, 'always': True, 'never': False}
 LOGO_BW = '''
 <svg viewBox="0 0 128.871 34.592" xmlns="http://www.w3.org/2000/svg"><g fill="#fff"><path d="M99.391 19.482h5.875v15.11h-5.875zM107.26 19.482h5.875v15.11h-5.875zM115.128 0h5.875v34.592h-5.875zM122.996 9.55h5.875v25.042h-5.875z"/><g stroke-width=".582" aria-label="Homeschool"><path d="M8.472 17.786v-6.869h-5.72v6.869H0V1.762h2.752v6.38h5.72v-6.38h2.752v16.024zM23.427 11.622q0 1.41-.319 2.582t-.966 2.024q-.637.841-1.604 1.32-.955.465-2.24.465-1.228 0-2.172-.466t-1.58-1.308q-.638-.841-.968-2.013-.318-1.182-.318-2.604 0-1.376.307-2.536.318-1.171.944-2.024.637-.853 1.592-1.33.967-.478 2.252-.478 1.364 0 2.32.477.966.478 1.57 1.33.613.842.897 2.014.285 1.16.285 2.547zm-2.74 0q0-2.195-.592-3.184-.58-.99-1.695-.99-1.16 0-1.774 1.001-.614 1.001-.614 3.173 0 1.103.16 1.9.159.795.454 1.307.307.512.728.762.42.239.921.239.58 0 1.024-.239.455-.25.762-.762t.466-1.308q.16-.796.16-1.899zM31.456 17.786v-6.903q0-.717-.08-1.308-.08-.603-.262-1.023-.182-.433-.477-.671-.296-.24-.717-.24-.398 0-.728.262-.33.25-.568.728-.228.467-.364 1.126-.125.648-.125 1.433v6.596h-2.627V8.233q0-.398-.011-.819 0-.42-.012-.796-.011-.386-.023-.682-.011-.307-.022-.455h2.49q.023.137.034.444.023.295.046.66.023.363.034.727.011.364.011.614h.034q.49-1.41 1.206-2.047.728-.637 1.74-.637 1.16 0 1.853.694.706.682.944 1.99h.057q.273-.762.58-1.274.319-.511.694-.818.375-.319.819-.455.443-.137.966-.137.83 0 1.4.364.58.364.932 1.001.364.637.523 1.501.17.864.17 1.865v7.813H37.37v-6.903q0-.717-.08-1.308-.08-.603-.261-1.023-.182-.433-.478-.671-.284-.24-.705-.24-.386 0-.716.251-.319.239-.557.694-.24.443-.376 1.069-.125.625-.148 1.387v6.744zM46.626 18.013q-1.092 0-1.967-.386-.876-.398-1.49-1.194-.614-.808-.944-2.013-.318-1.217-.318-2.843 0-1.763.386-2.969.387-1.205 1.035-1.944.66-.75 1.513-1.08.864-.33 1.82-.33 1.193 0 2.035.511.841.5 1.376 1.41.546.91.796 2.184.261 1.262.261 2.798v.09h-6.47q0 .774.102 1.445.114.66.364 1.148.25.478.648.762.41.273.978.273.694 0 1.126-.352.444-.364.626-1.115l2.467.262q-.17.523-.477 1.114-.296.592-.796 1.092-.5.49-1.251.819-.75.318-1.82.318zm0-10.746q-.398 0-.75.17-.353.16-.615.523-.25.353-.409.921-.16.569-.182 1.365h3.923q-.08-1.49-.59-2.229-.513-.75-1.377-.75zM61.615 14.192q0 .887-.307 1.592-.296.705-.876 1.206-.58.489-1.422.762-.83.261-1.91.261-.955 0-1.729-.17-.773-.17-1.364-.558-.58-.398-.978-1.023-.387-.625-.58-1.547l2.308-.42q.114.511.307.83.194.318.478.489.296.17.682.227.387.057.876.057.443 0 .83-.057.398-.068.682-.216.285-.16.444-.432.16-.284.16-.705 0-.478-.24-.75-.227-.285-.625-.456-.387-.181-.933-.307-.534-.136-1.137-.307-.637-.17-1.25-.409-.615-.239-1.104-.648-.478-.41-.785-1.035-.295-.637-.295-1.604 0-.875.284-1.558.284-.693.819-1.17.546-.49 1.342-.74.796-.262 1.83-.262.82 0 1.525.194.716.182 1.273.591.557.398.933 1.024.386.625.534 1.512l-2.331.296q-.068-.444-.239-.728-.16-.296-.41-.466-.238-.171-.568-.228-.33-.068-.716-.068-.933 0-1.4.296-.465.284-.465.966 0 .421.182.671.193.25.545.421.353.16.83.284.478.114 1.047.285.705.182 1.376.432.682.239 1.205.67.535.421.853 1.092t.319 1.706zM67.938 18.013q-1.206 0-2.104-.455-.899-.454-1.501-1.285-.592-.83-.887-1.99-.296-1.171-.296-2.581 0-1.536.318-2.73.33-1.205.944-2.024.614-.83 1.513-1.262.91-.432 2.047-.432.978 0 1.74.318t1.307.876q.558.546.899 1.296.341.75.466 1.615l-2.638.16q-.114-.945-.557-1.502-.444-.568-1.274-.568-1.058 0-1.535 1.057t-.478 3.07q0 4.254 2.058 4.254.75 0 1.251-.569.5-.58.626-1.717l2.627.148q-.091.853-.432 1.637-.33.774-.899 1.377-.557.59-1.364.955-.796.352-1.831.352zM76.933 7.938q.535-1.41 1.33-2.047.808-.637 1.923-.637.91 0 1.535.364.637.364 1.035 1 .398.637.568 1.501.182.865.182 1.866v7.8h-2.615v-6.89q0-.717-.091-1.309-.091-.602-.307-1.023-.217-.432-.57-.671-.34-.239-.83-.239-.477 0-.864.262-.386.25-.67.728-.273.466-.433 1.125-.147.649-.147 1.433v6.585h-2.627V.909h2.627v4.606q0 .364-.012.74-.011.363-.023.693-.011.319-.022.58t-.023.41zM95.606 11.622q0 1.41-.318 2.582-.319 1.171-.967 2.024-.637.841-1.603 1.32-.956.465-2.24.465-1.229 0-2.173-.466t-1.58-1.308q-.637-.841-.967-2.013-.319-1.182-.319-2.604 0-1.376.308-2.536.318-1.171.943-2.024.637-.853 1.593-1.33.966-.478 2.251-.478 1.365 0 2.32.477.967.478 1.57 1.33.614.842.898 2.014.284 1.16.284 2.547zm-2.74 0q0-2.195-.592-3.184-.58-.99-1.694-.99-1.16 0-1.774 1.001t-.614 3.173q0 1.103.159 1.9.159.795.455 1.307.307.512.727.762.421.239.922.239.58 0 1.023-.239.455-.25.762-.762t.466-1.308q.16-.796.16-1.899zM107.274 11.622q0 1.41-.318 2.582-.319 1.171-.967 2.024-.637.841-1.603 1.32-.956.465-2.24.465-1.229 0-2.173-.466t-1.58-1.308q-.637-.841-.967-2.013-.319-1.182-.319-2.604 0-1.376.307-2.536.319-1.171.944-2.024.637-.853 1.592-1.33.967-.478 2.252-.478 1.365 0 2.32.477.967.478 1.57 1.33.614.842.898 2.014.284 1.16.284 2.547zm-2.74 0q0-2.195-.592-3.184-.58-.99-1.694-.99-1.16 0-1.774 1.001t-.615 3.173q0 1.103.16 1.9.159.795.455 1.307.307.512.727.762.421.239.921.239.58 0 1.024-.239.455-.25.762-.762t.466-1.308q.16-.796.16-1.899zM109.355 17.786V.909h2.627v16.877z"/></g><g stroke-width=".487" aria-label="Dashboard"><path d="M24.683 27.557q0 1.676-.419 2.96-.41 1.276-1.133 2.143-.714.856-1.694 1.304-.98.438-2.104.438h-4.112V20.989h3.636q1.276 0 2.342.39 1.066.38 1.837 1.19.78.8 1.21 2.037.437 1.238.437 2.951zm-1.504 0q0-1.361-.324-2.323-.314-.97-.894-1.59-.572-.618-1.38-.904-.8-.295-1.762-.295h-2.113v10.5h2.456q.866 0 1.599-.342.733-.343 1.266-1.02.543-.675.847-1.684.305-1.01.305-2.342zM29.343 34.592q-1.276 0-1.914-.819-.637-.818-.637-2.246 0-1.019.314-1.666.323-.657.828-1.028.514-.371 1.17-.514.658-.143 1.334-.162l1.904-.038v-.562q0-.638-.115-1.085-.104-.448-.333-.724-.228-.276-.571-.4-.333-.133-.8-.133-.409 0-.733.077-.323.066-.57.257-.239.18-.391.504-.143.314-.19.8l-1.467-.162q.077-.61.296-1.114.218-.514.618-.885t1-.571q.61-.21 1.475-.21 1.59 0 2.39.895.809.885.809 2.57v4.436q0 .762.162 1.152.162.381.628.381.114 0 .229-.019.123-.019.228-.048v1.067q-.267.076-.533.114-.257.038-.552.038-.4 0-.686-.124-.285-.133-.466-.39-.171-.267-.267-.647-.095-.39-.123-.905h-.038q-.229.495-.505.895-.267.4-.628.685-.353.277-.819.429-.457.152-1.047.152zm.324-1.285q.675 0 1.17-.295.505-.305.838-.771.333-.467.495-1.019.172-.552.172-1.056v-.848l-1.543.038q-.514.01-.98.096-.467.076-.819.314-.343.238-.552.666t-.21 1.123q0 .838.372 1.295t1.057.457zM43.094 31.555q0 .724-.229 1.295-.228.562-.666.952-.438.38-1.076.59-.638.2-1.456.2-.733 0-1.323-.143-.59-.133-1.038-.438-.438-.304-.743-.8-.295-.504-.438-1.227l1.238-.295q.18.828.743 1.218.561.38 1.56.38.458 0 .829-.075.38-.076.657-.257.276-.19.428-.495.153-.314.153-.771 0-.467-.181-.762-.181-.305-.505-.504-.314-.2-.771-.343l-1.009-.333q-.505-.162-1.01-.362-.494-.2-.894-.524-.4-.333-.657-.818-.247-.486-.247-1.219 0-1.409.818-2.142.829-.742 2.409-.742 1.4 0 2.218.6.828.6 1.047 1.922l-1.266.19q-.067-.399-.257-.666-.19-.276-.457-.437-.267-.172-.6-.238-.323-.077-.685-.077-.952 0-1.41.353-.447.352-.447 1.066 0 .419.162.695.172.266.467.457.304.18.723.314l.933.295.686.219q.352.124.685.295.333.162.619.39.295.22.514.533.219.315.343.733.133.42.133.971zM46.82 25.863q.239-.524.505-.886.276-.37.6-.609.333-.238.723-.343.39-.114.876-.114.81 0 1.323.267.524.266.82.752.304.476.418 1.142t.114 1.466v6.864H50.79v-6.53q0-.658-.066-1.153-.067-.495-.257-.818-.19-.333-.533-.495-.343-.172-.886-.172-.495 0-.904.22-.4.218-.686.618-.285.4-.447.971-.152.571-.152 1.285v6.074h-1.41V20.275h1.41v3.674q0 .314-.01.629l-.019.58q-.01.267-.019.457-.01.181-.019.248zM62.123 29.204q0 5.388-3.103 5.388-.962 0-1.6-.419-.628-.428-1.027-1.37h-.02q0 .247-.009.513t-.019.495l-.029.39q-.01.163-.019.2h-1.36q.009-.085.018-.285.01-.21.01-.495.01-.285.01-.628.009-.343.009-.714V20.275h1.408V24.3q0 .286-.009.553 0 .257-.01.457-.009.238-.019.447h.039q.39-.99 1.028-1.418.647-.429 1.599-.429 1.6 0 2.351 1.314t.752 3.979zm-1.475.057q0-1.066-.105-1.828-.105-.761-.352-1.247-.238-.495-.619-.723-.371-.229-.914-.229-.552 0-.98.22-.42.218-.705.704-.285.485-.438 1.275-.142.79-.142 1.933 0 1.104.142 1.856.153.752.438 1.228.286.467.705.676.419.2.97.2.515 0 .886-.219.38-.219.628-.704t.362-1.257q.124-.78.124-1.885zM71.686 29.242q0 2.704-.98 4.027-.972 1.323-2.828 1.323-.885 0-1.58-.324-.686-.323-1.171-.99-.476-.666-.733-1.666-.248-1.009-.248-2.37 0-5.33 3.78-5.33.98 0 1.694.332.723.334 1.18 1t.667 1.666q.219 1 .219 2.332zm-1.476 0q0-1.2-.152-1.98-.143-.78-.438-1.247-.295-.466-.724-.647-.418-.19-.942-.19-.543 0-.98.2-.429.19-.734.666-.304.466-.466 1.247-.152.78-.152 1.951 0 1.2.171 1.99.171.78.467 1.247.304.466.713.657t.895.19q.543 0 .971-.18.438-.191.743-.658.304-.466.466-1.256.162-.79.162-1.99zM76.26 34.592q-1.276 0-1.914-.819-.637-.818-.637-2.246 0-1.019.314-1.666.323-.657.828-1.028.514-.371 1.17-.514.658-.143 1.334-.162l1.903-.038v-.562q0-.638-.114-1.085-.105-.448-.333-.724-.228-.276-.571-.4-.333-.133-.8-.133-.41 0-.733.077-.323.066-.571.257-.238.18-.39.504-.143.314-.19.8l-1.467-.162q.076-.61.295-1.114.22-.514.62-.885.399-.371.999-.571.609-.21 1.475-.21 1.59 0 2.39.895.809.885.809 2.57v4.436q0 .762.162 1.152.162.381.628.381.114 0 .228-.019.124-.019.229-.048v1.067q-.267.076-.533.114-.257.038-.552.038-.4 0-.686-.124-.285-.133-.466-.39-.172-.267-.267-.647-.095-.39-.123-.905h-.039q-.228.495-.504.895-.267.4-.628.685-.353.277-.82.429-.456.152-1.046.152zm.323-1.285q.676 0 1.171-.295.505-.305.838-.771.333-.467.495-1.019.171-.552.171-1.056v-.848l-1.542.038q-.514.01-.98.096-.467.076-.819.314-.343.238-.552.666t-.21 1.123q0 .838.372 1.295t1.056.457zM83.7 34.402v-8.568q0-.333-.01-.647l-.02-.59-.019-.495h1.333q.01.218.019.504l.019.571q.019.295.019.562v.466h.038q.152-.59.314-1.018.162-.438.39-.714.229-.286.543-.42.314-.142.752-.142.172 0 .324.038.162.029.247.057v1.571q-.142-.048-.333-.067-.18-.028-.419-.028-.485 0-.828.266-.333.267-.552.743-.21.466-.314 1.123-.095.648-.095 1.419v5.369zM94.994 32.745q-.39.99-1.037 1.419-.638.428-1.59.428-1.6 0-2.352-1.314-.752-1.313-.752-3.979 0-5.388 3.104-5.388.961 0 1.599.429.638.428 1.028 1.36h.02q0-.094-.01-.304v-.419q-.01-.228-.01-.428v-4.274h1.408v12.718q.01.343.01.628l.019.495q.01.2.02.286h-1.343q-.02-.095-.029-.267-.01-.18-.028-.41l-.02-.475v-.505zm-4.255-3.503q0 1.066.105 1.828.104.761.342 1.256.248.486.62.714.38.229.922.229.553 0 .971-.22.429-.218.714-.704.286-.495.429-1.285.152-.79.152-1.932 0-1.095-.152-1.847-.143-.761-.438-1.228-.286-.466-.705-.666-.409-.21-.961-.21-.514 0-.895.22-.371.218-.619.704-.247.485-.37 1.266-.115.77-.115 1.875z"/></g></g></svg>
 '''
@@ -0,0 +1,974 @@
+"""Module Description
+
+This module contains the data model behind the dashboard and the functions
+that load it from time logs. It doesn't depend on Bokeh, so the numbers can
+be computed, cached and reused without rendering anything.
+"""
+import json
+import os
+import time
+import warnings
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import cached_property
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from hsd_ingest import (
+    PREFETCH_WORKERS,
+    Prefetcher,
+    as_source,
+    iter_chunks,
+    read_heads,
+    read_sheets,
+    resolve_reading_list_path,
+    source_name,
+)
+from utils import parse_date
+
+SECONDS_IN_AN_HOUR = 3600
+SESSION_COLUMNS = [
+    'class',
+    'date',
+    'start',
+    'end',
+    'hours',
+    'teacher',
+    'description',
+    'row',
+]
+CURRICULA_COLUMNS = ['Course', 'Materials', 'ISBN']
+READING_LEVEL_COLUMNS = ['date', 'level']
+# Columns every class sheet of a time log has
+REQUIRED_COLUMNS = ['date', 'start time', 'end time']
+# Every column load_grade uses, other columns of a time log aren't read
+TIME_LOG_COLUMNS = REQUIRED_COLUMNS + [
+    'description',
+    'teacher',
+    'materials',
+    'isbn',
+    'grade',
+    'name',
+    'reading list',
+    'reading level',
+]
+# Ways grades can be ordered in load_dashboard_data, by their first date
+ORDERS = ('oldest', 'newest')
+# What to do about sessions that overlap in time, see check_overlaps
+OVERLAP_CHECKS = ('warn', 'fail')
+# What to do about sessions entered twice, see check_duplicates
+DUPLICATE_CHECKS = ('warn', 'drop', 'fail')
+
+
+def find_overlaps(sessions):
+    """Find sessions that overlap in time, across all classes of a time
+    log. Sessions are sorted by start time and swept once, keeping the
+    session that ends last so far. Each session that starts before that
+    one ends is reported against it, so a session overlapping several
+    others is only reported once.
+
+    Args:
+        sessions (DataFrame): sessions with SESSION_COLUMNS.
+
+    Returns:
+        list: formatted error strings like those of _find_bad_rows, one
+        per overlapping session.
+    """
+    if len(sessions) < 2:
+        return []
+    ordered = sessions.sort_values('start', kind='stable')
+    starts = ordered['start'].to_numpy()
+    ends = ordered['end'].to_numpy()
+    latest = np.maximum.accumulate(ends)
+    # Position of the session that ends last among those before each one
+    positions = np.arange(len(ends))
+    holder = np.maximum.accumulate(np.where(ends == latest, positions, 0))
+    overlapping = np.flatnonzero(starts[1:] < latest[:-1]) + 1
+
+    classes = ordered['class'].to_numpy()
+    rows = ordered['row'].to_numpy()
+    messages = []
+    for i in overlapping:
+        j = holder[i - 1]
+        messages.append(
+            f"  Row {rows[i]} of '{classes[i]}': overlaps row {rows[j]} of "
+            f"'{classes[j]}'"
+        )
+    return messages
+
+
+def check_overlaps(sessions, filename, action='warn'):
+    """Warn about or fail on overlapping sessions, see find_overlaps.
+    Double-booked time is counted twice in every total.
+
+    Args:
+        sessions (DataFrame): sessions with SESSION_COLUMNS.
+        filename (str): display name of the time log.
+        action (str): one of OVERLAP_CHECKS.
+    """
+    if action not in OVERLAP_CHECKS:
+        raise ValueError(
+            f"Unknown overlap check '{action}', expected one of: "
+            f"{', '.join(OVERLAP_CHECKS)}"
+        )
+    overlaps = find_overlaps(sessions)
+    if not overlaps:
+        return
+    detail = "\n".join(overlaps)
+    message = f"Overlapping sessions found in '{filename}':\n{detail}"
+    if action == 'fail':
+        raise ValueError(message)
+    warnings.warn(message, RuntimeWarning)
+
+
+def _session_keys(sessions):
+    """64-bit hash of every session's date, start, end, class and
+    description. Descriptions are compared ignoring case and surrounding
+    whitespace."""
+    keys = pd.DataFrame(
+        {
+            'date': pd.to_datetime(sessions['date']).dt.normalize(),
+            'start': sessions['start'],
+            'end': sessions['end'],
+            'class': sessions['class'].astype(str),
+            'description': sessions['description']
+            .fillna('')
+            .astype(str)
+            .str.strip()
+            .str.casefold(),
+        }
+    )
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def find_duplicates(sessions):
+    """Find sessions entered more than once, e.g. rows pasted twice into a
+    sheet. Every session is hashed in one pass, the first session with a
+    hash is kept and later ones are duplicates of it.
+
+    Args:
+        sessions (DataFrame): sessions with SESSION_COLUMNS.
+
+    Returns:
+        tuple: a boolean array that is True for every duplicate, in the
+        order of sessions, and formatted error strings like those of
+        _find_bad_rows, one per duplicate.
+    """
+    if len(sessions) < 2:
+        return np.zeros(len(sessions), dtype=bool), []
+    codes, _ = pd.factorize(_session_keys(sessions))
+    _, first = np.unique(codes, return_index=True)
+    original = first[codes]
+    positions = np.arange(len(codes))
+    duplicate = positions != original
+
+    classes = sessions['class'].to_numpy()
+    rows = sessions['row'].to_numpy()
+    messages = [
+        f"  Row {rows[i]} of '{classes[i]}': duplicates row {rows[j]} of "
+        f"'{classes[j]}'"
+        for i, j in zip(positions[duplicate], original[duplicate])
+    ]
+    return duplicate, messages
+
+
+def check_duplicates(sessions, filename, action='warn'):
+    """Warn about, drop or fail on duplicate sessions, see
+    find_duplicates. Sessions entered twice are counted twice in every
+    total.
+
+    Args:
+        sessions (DataFrame): sessions with SESSION_COLUMNS.
+        filename (str): display name of the time log.
+        action (str): one of DUPLICATE_CHECKS. 'drop' keeps the first of
+            each set of duplicates and warns about the others.
+
+    Returns:
+        DataFrame: the sessions, without duplicates if action is 'drop'.
+    """
+    if action not in DUPLICATE_CHECKS:
+        raise ValueError(
+            f"Unknown duplicate check '{action}', expected one of: "
+            f"{', '.join(DUPLICATE_CHECKS)}"
+        )
+    duplicate, messages = find_duplicates(sessions)
+    if not messages:
+        return sessions
+    detail = "\n".join(messages)
+    if action == 'fail':
+        raise ValueError(f"Duplicate sessions found in '{filename}':\n{detail}")
+    if action == 'drop':
+        warnings.warn(
+            f"Dropped duplicate sessions from '{filename}':\n{detail}",
+            RuntimeWarning,
+        )
+        return sessions[~duplicate]
+    warnings.warn(
+        f"Duplicate sessions found in '{filename}':\n{detail}", RuntimeWarning
+    )
+    return sessions
+
+
+def _find_bad_rows(df, checks):
+    """Find rows with invalid data and return formatted error messages.
+
+    Args:
+        df (DataFrame): the DataFrame being validated.
+        checks (list): list of (mask, message) tuples where mask is a
+            boolean Series and message describes the problem.
+
+    Returns:
+        list: formatted error strings, one per bad row/field.
+    """
+    bad_rows = []
+    # Combine all boolean masks into one using bitwise OR (|=) so
+    # that any row flagged by any check is included. This is a
+    # vectorized pandas operation, not a per-row loop.
+    combined = pd.Series(False, index=df.index)
+    for mask, _ in checks:
+        combined |= mask
+    # Only loop over rows when there's actually bad data
+    if combined.any():
+        for idx in df.index[combined]:
+            row_num = idx + 2  # +1 for 0-index, +1 for header row
+            for mask, msg in checks:
+                if mask.at[idx]:
+                    bad_rows.append(f"  Row {row_num}: {msg}")
+    return bad_rows
+
+
+def _frame_to_dict(df):
+    return json.loads(df.to_json(orient='table', index=False))
+
+
+def _frame_from_dict(data):
+    return pd.read_json(StringIO(json.dumps(data)), orient='table')
+
+
+class HoursCube:
+    """Hours of learning summed by (date, class, teacher), built once per
+    grade. Every summary on the dashboard is a roll-up of the cube, and
+    roll-ups are cached, so no summary has to go back to the sessions.
+
+    Args:
+        sessions (DataFrame): sessions with SESSION_COLUMNS.
+        classes (list): class names in display order.
+    """
+
+    LEVELS = ('date', 'class', 'teacher')
+
+    def __init__(self, sessions, classes):
+        self.classes = list(classes)
+        self.hours = sessions.groupby(
+            [pd.to_datetime(sessions['date']).dt.normalize(), 'class', 'teacher'],
+            sort=False,
+            dropna=False,
+        )['hours'].sum()
+        self.hours.index.names = self.LEVELS
+        self._rollups = {}
+
+    def rollup(self, *levels):
+        """Sum the cube over every level that isn't listed.
+
+        Args:
+            levels (str): any of LEVELS.
+
+        Returns:
+            Series: hours indexed by the listed levels, or a float if no
+            levels are listed.
+        """
+        if levels not in self._rollups:
+            if levels:
+                rollup = self.hours.groupby(
+                    level=list(levels), sort=False, dropna=False
+                ).sum()
+            else:
+                rollup = float(self.hours.sum())
+            self._rollups[levels] = rollup
+        return self._rollups[levels]
+
+    @property
+    def total(self):
+        """float: total hours."""
+        return self.rollup()
+
+    @property
+    def by_class(self):
+        """Series: hours per class, in the order of classes."""
+        return self.rollup('class').reindex(self.classes, fill_value=0)
+
+    @property
+    def by_day(self):
+        """Series: hours per day, sorted by date."""
+        return self.rollup('date').sort_index()
+
+    @property
+    def by_month(self):
+        """Series: hours per month, indexed by the first day of the month."""
+        by_day = self.by_day
+        return by_day.groupby(by_day.index.to_period('M')).sum().to_timestamp()
+
+    @property
+    def teacher_classes(self):
+        """DataFrame: hours with teachers as the index and classes as the
+        columns, teachers sorted by their total hours. Sessions from sheets
+        without a teacher column are left out."""
+        crosstab = (
+            self.rollup('teacher', 'class')
+            .loc[lambda h: h.index.get_level_values('teacher').notna()]
+            .unstack(fill_value=0)
+        )
+        order = crosstab.sum(axis=1).sort_values(ascending=False).index
+        return crosstab.loc[
+            order, [c for c in self.classes if c in crosstab.columns]
+        ]
+
+    @property
+    def by_teacher(self):
+        """Series: hours per teacher, largest first."""
+        return self.teacher_classes.sum(axis=1)
+
+
+@dataclass
+class GradeData:
+    """Everything computed from one time log, usually one school year.
+
+    Attributes:
+        source (str): display name of the time log.
+        grade (str): grade from the first row of the sheets.
+        name (str): student name from the first row of the sheets.
+        classes (list): class names in the order of the sheets.
+        sessions (DataFrame): one row per session with SESSION_COLUMNS.
+            'start' and 'end' are full datetimes on the session date and
+            'row' is the spreadsheet row the session came from.
+        curricula (DataFrame): CURRICULA_COLUMNS, materials for each class.
+        reading_level (DataFrame): READING_LEVEL_COLUMNS.
+        reading_list (str): absolute path of the reading list, if any, or
+            the name of a reading list handed over in memory by a
+            reading_list_resolver.
+    """
+
+    source: str
+    grade: str = ''
+    name: str = ''
+    classes: list = field(default_factory=list)
+    sessions: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=SESSION_COLUMNS)
+    )
+    curricula: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=CURRICULA_COLUMNS)
+    )
+    reading_level: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame(columns=READING_LEVEL_COLUMNS)
+    )
+    reading_list: str = None
+
+    @cached_property
+    def cube(self):
+        """HoursCube: the aggregate every summary is derived from."""
+        return HoursCube(self.sessions, self.classes)
+
+    @property
+    def class_hours(self):
+        """list: total hours for each class, in the order of classes."""
+        return self.cube.by_class.tolist()
+
+    @property
+    def total_hours(self):
+        """float: total hours of learning."""
+        return self.cube.total
+
+    @property
+    def teacher_classes(self):
+        """DataFrame: hours per teacher and class, see HoursCube."""
+        return self.cube.teacher_classes
+
+    @property
+    def teacher_hours(self):
+        """Series: total hours per teacher, largest first."""
+        return self.cube.by_teacher
+
+    def to_dict(self):
+        """Convert to a dictionary of JSON serializable values."""
+        return {
+            'source': self.source,
+            'grade': self.grade,
+            'name': self.name,
+            'classes': list(self.classes),
+            'sessions': _frame_to_dict(self.sessions),
+            'curricula': _frame_to_dict(self.curricula),
+            'reading_level': _frame_to_dict(self.reading_level),
+            'reading_list': self.reading_list,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from the output of to_dict."""
+        return cls(
+            source=data['source'],
+            grade=data['grade'],
+            name=data['name'],
+            classes=data['classes'],
+            sessions=_frame_from_dict(data['sessions']),
+            curricula=_frame_from_dict(data['curricula']),
+            reading_level=_frame_from_dict(data['reading_level']),
+            reading_list=data['reading_list'],
+        )
+
+
+@dataclass
+class DashboardData:
+    """Everything needed to render a dashboard.
+
+    Attributes:
+        grades (list): GradeData, one per time log.
+        reading_lists (dict): absolute paths of reading lists mapped to
+            dictionaries of sheet names and DataFrames. Grades that share
+            a reading list share the entry.
+    """
+
+    grades: list = field(default_factory=list)
+    reading_lists: dict = field(default_factory=dict)
+
+    @property
+    def name(self):
+        """str: student name, taken from the last time log that has one."""
+        names = [g.name for g in self.grades if g.name]
+        return names[-1] if names else ''
+
+    def to_dict(self):
+        """Convert to a dictionary of JSON serializable values."""
+        return {
+            'grades': [g.to_dict() for g in self.grades],
+            'reading_lists': {
+                path: {
+                    sheet: _frame_to_dict(df) for sheet, df in sheets.items()
+                }
+                for path, sheets in self.reading_lists.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from the output of to_dict."""
+        return cls(
+            grades=[GradeData.from_dict(g) for g in data['grades']],
+            reading_lists={
+                path: {
+                    sheet: _frame_from_dict(df) for sheet, df in sheets.items()
+                }
+                for path, sheets in data['reading_lists'].items()
+            },
+        )
+
+    def to_json(self):
+        """Serialize to a JSON string."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text):
+        """Create from the output of to_json."""
+        return cls.from_dict(json.loads(text))
+
+
+@dataclass
+class GradeInfo:
+    """What a quick look at a time log tells, see inspect_grade.
+
+    Attributes:
+        source (str): display name of the time log.
+        grade (str): grade from the first row of the sheets.
+        name (str): student name from the first row of the sheets.
+        reading_list (str): reading list path as written in the time log.
+        classes (dict): class names mapped to their number of rows.
+        start (Timestamp): date of the earliest first or last row of a
+            sheet, None if there are no dates.
+        end (Timestamp): date of the latest first or last row of a sheet,
+            None if last rows weren't read.
+        elapsed_ms (float): time the look took in milliseconds.
+        time_log (bool): False if no sheet has the REQUIRED_COLUMNS, e.g.
+            for a reading list.
+    """
+
+    source: str
+    grade: str = ''
+    name: str = ''
+    reading_list: str = None
+    classes: dict = field(default_factory=dict)
+    start: pd.Timestamp = None
+    end: pd.Timestamp = None
+    elapsed_ms: float = 0.0
+    time_log: bool = False
+
+    @property
+    def rows(self):
+        """int: total number of rows."""
+        return sum(self.classes.values())
+
+    def to_dict(self):
+        """Convert to a dictionary of JSON serializable values."""
+        return {
+            'source': self.source,
+            'grade': self.grade,
+            'name': self.name,
+            'reading_list': self.reading_list,
+            'classes': self.classes,
+            'rows': self.rows,
+            'start': self.start.strftime('%Y-%m-%d') if self.start else None,
+            'end': self.end.strftime('%Y-%m-%d') if self.end else None,
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'time_log': self.time_log,
+        }
+
+
+def inspect_grade(file, fmt=None, name=None, last_rows=True):
+    """Describe a time log without parsing it. Only the header, first and
+    last row of each sheet are read, see hsd_ingest.read_heads, so this is
+    a lot faster than load_grade. The date span assumes each sheet is in
+    date order, which is how time logs are kept.
+
+    Args:
+        file: path, bytes or file-like object, see load_grade.
+        fmt (str): optional input format, one of hsd_ingest.FORMATS.
+        name (str): optional display name, see load_grade.
+        last_rows (bool): also read the last row of each sheet. If False
+            only the start of the date span is known, which is enough to
+            order grades and much faster for large workbooks.
+
+    Returns:
+        GradeInfo
+    """
+    started = time.perf_counter()
+    filename = source_name(file, name) or 'time log'
+    info = GradeInfo(source=filename)
+    try:
+        heads = read_heads(as_source(file, name), fmt=fmt, last_rows=last_rows)
+    except Exception as e:
+        raise type(e)(f"'{filename}': {e}") from e
+
+    dates = []
+    for sheet_name, (df, rows) in heads.items():
+        info.classes[sheet_name] = rows
+        df = df.set_axis(df.columns.astype(str).str.lower(), axis=1)
+        if all(c in df.columns for c in REQUIRED_COLUMNS):
+            info.time_log = True
+        # Same precedence as load_grade, the last sheet that has a value
+        # wins.
+        tmp_grade = _first_row_value(df, 'grade')
+        if isinstance(tmp_grade, str):
+            info.grade = tmp_grade
+        tmp_name = _first_row_value(df, 'name')
+        if isinstance(tmp_name, str):
+            info.name = tmp_name
+        # A blank cell keeps the list, every class of a long file has the
+        # column but usually only the first one names the list.
+        tmp_list = _first_row_value(df, 'reading list')
+        if isinstance(tmp_list, str) and tmp_list.strip():
+            info.reading_list = tmp_list
+        if 'date' in df.columns:
+            dates.extend(pd.to_datetime(df['date'], errors='coerce').dropna())
+
+    if dates:
+        info.start = min(dates)
+        info.end = max(dates) if last_rows else None
+    info.elapsed_ms = (time.perf_counter() - started) * 1000
+    return info
+
+
+def _concat(frames):
+    """Concatenate chunks, skipping empty ones unless they're all empty."""
+    return pd.concat([f for f in frames if not f.empty] or frames[:1])
+
+
+def _first_row_value(df, column):
+    """Values in the first row of a sheet are treated like user
+    configuration, e.g. the grade or the student name."""
+    if column not in df.columns or df.empty:
+        return None
+    return df.iloc[0, df.columns.get_loc(column)]
+
+
+def _parse_times(values):
+    """Parse a column of times as strings. A log repeats the same few
+    start and end times, so each distinct one is parsed only once."""
+    text = values.astype(str)
+    parsed = {value: parse_date(value) for value in text.unique()}
+    return pd.to_datetime(text.map(parsed), errors='coerce')
+
+
+def parse_sessions(df, class_name):
+    """Validate one sheet of a time log and convert it to sessions.
+
+    Args:
+        df (DataFrame): a sheet with lower case column names.
+        class_name (str): name of the class the sheet is for.
+
+    Returns:
+        tuple: the sheet with incomplete rows dropped and a DataFrame of
+        sessions with SESSION_COLUMNS.
+    """
+    # Validate required columns exist
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise KeyError(f"Missing required column(s): {', '.join(missing)}")
+
+    # Drop rows with NaT values
+    df = df.dropna(subset=['end time', 'start time', 'date'])
+
+    # Make usre that start times and date times (datetime objects)
+    # are treated as strings so they can be reparsed for consistency
+    start_time = _parse_times(df['start time'])
+    end_time = _parse_times(df['end time'])
+    parsed_dates = pd.to_datetime(df['date'], errors='coerce')
+
+    # Check for unparseable dates/times and report row numbers
+    bad_rows = _find_bad_rows(df, [
+        (parsed_dates.isna(), "invalid 'date'"),
+        (start_time.isna(), "invalid 'start time'"),
+        (end_time.isna(), "invalid 'end time'"),
+    ])
+    if bad_rows:
+        detail = "\n".join(bad_rows)
+        raise ValueError(f"Invalid data found:\n{detail}")
+
+    duration = end_time - start_time
+
+    # Check for end times before start times (e.g. AM/PM error)
+    bad_durations = _find_bad_rows(df, [
+        (duration < pd.Timedelta(0), "end time is before start time"),
+    ])
+    if bad_durations:
+        detail = "\n".join(bad_durations)
+        raise ValueError(f"Invalid data found:\n{detail}")
+
+    # Sheets without a teacher column don't count towards any teacher,
+    # blank cells were taught independently.
+    try:
+        teachers = df['teacher'].fillna('Independent')
+    except (KeyError):
+        teachers = None
+
+    dates = parsed_dates.dt.normalize()
+    sessions = pd.DataFrame(
+        {
+            'class': class_name,
+            'date': parsed_dates,
+            'start': dates + (start_time - start_time.dt.normalize()),
+            'end': dates + (end_time - end_time.dt.normalize()),
+            'hours': duration.dt.total_seconds() / SECONDS_IN_AN_HOUR,
+            'teacher': teachers,
+            'description': df['description'],
+            'row': df.index + 2,
+        },
+        columns=SESSION_COLUMNS,
+    )
+    return df, sessions
+
+
+def _sheet_frames(file, name, fmt=None, chunksize=None, prefetcher=None):
+    """Sheet names and DataFrames of a time log, whole sheets at a time or
+    in chunks of rows, with only the TIME_LOG_COLUMNS. Read errors name the
+    file they came from. Chunked time logs are streamed from where they
+    are, reading them whole through the prefetcher would undo the chunks."""
+    try:
+        source = as_source(file, name)
+        if prefetcher and not chunksize:
+            source = prefetcher.get(source)
+        if chunksize:
+            yield from iter_chunks(
+                source, fmt=fmt, chunksize=chunksize, columns=TIME_LOG_COLUMNS
+            )
+        else:
+            yield from read_sheets(source, fmt=fmt, columns=TIME_LOG_COLUMNS).items()
+    except Exception as e:
+        raise type(e)(f"'{name}': {e}") from e
+
+
+def _reading_list(value, time_log, base_dir=None, resolver=None):
+    """Find the reading list named in a time log.
+
+    Args:
+        value: the 'reading list' cell of the time log.
+        time_log (str): display name of the time log.
+        base_dir (str): directory of the time log, if it has one.
+        resolver (callable): optional, see load_grade.
+
+    Returns:
+        tuple: the key of the reading list in DashboardData.reading_lists
+        and a path or in-memory source to read it from, both None if there
+        is no reading list.
+    """
+    if resolver is None:
+        path = resolve_reading_list_path(value, base_dir=base_dir)
+        return path, path
+    if not isinstance(value, str) or not value.strip():
+        return None, None
+    source = resolver(value.strip(), time_log)
+    if source is None:
+        return None, None
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source), source
+    name = source_name(source) or value.strip()
+    return name, as_source(source, name)
+
+
+def load_grade(
+    file,
+    fmt=None,
+    reading_lists=None,
+    chunksize=None,
+    prefetcher=None,
+    name=None,
+    reading_list_resolver=None,
+    overlaps=None,
+    duplicates=None,
+):
+    """Load one time log.
+
+    Args:
+        file: path to a time log in any format supported by hsd_ingest,
+            or the time log itself as bytes or a file-like object.
+        fmt (str): optional input format, one of hsd_ingest.FORMATS.
+        reading_lists (dict): optional reading list cache, see
+            DashboardData.reading_lists. The grade's reading list is loaded
+            into it unless it is already there.
+        chunksize (int): if set, read the time log this many rows at a time
+            and keep only the sessions of each chunk, so memory use stays
+            flat for very long logs.
+        prefetcher (Prefetcher): optional, read the time log and its
+            reading list through it. The reading list is fetched as soon
+            as its path turns up, while the rest of the log is parsed.
+            With chunksize only the reading list is, the time log is
+            streamed from its path.
+        name (str): display name of the time log, e.g. 'Time-1.xlsx'.
+            Defaults to the file name. In-memory time logs need a name
+            with an extension unless fmt is given.
+        reading_list_resolver (callable): optional, called with the
+            reading list path written in the time log and the display name
+            of the time log. Returns a path, bytes, a file-like object or
+            None if there is no reading list. By default paths are
+            resolved against the directory of the time log, or the working
+            directory for in-memory time logs.
+        overlaps (str): optional, one of OVERLAP_CHECKS. Warn about or fail
+            on sessions that overlap in time, see check_overlaps.
+        duplicates (str): optional, one of DUPLICATE_CHECKS. Warn about,
+            drop or fail on sessions entered more than once, see
+            check_duplicates. Checked before overlaps, so dropped
+            duplicates aren't reported as overlapping.
+
+    Returns:
+        GradeData
+    """
+    filename = source_name(file, name) or 'time log'
+    base_dir = None
+    if isinstance(file, (str, os.PathLike)):
+        base_dir = os.path.dirname(os.path.abspath(file))
+    grade = GradeData(source=filename)
+    reading_list_source = None
+    reading_list_value = None
+    classes = {}
+    sessions = []
+    materials = {}
+    levels = {}
+    configured = set()
+
+    for sheet_name, df in _sheet_frames(
+        file, filename, fmt=fmt, chunksize=chunksize, prefetcher=prefetcher
+    ):
+        classes.setdefault(sheet_name)
+        try:
+            df.columns = df.columns.str.lower()
+            df, sheet_sessions = parse_sessions(df, sheet_name)
+            sessions.append(sheet_sessions)
+
+            # Curricula data, materials with the ISBN on the same row
+            if 'materials' in df.columns:
+                sheet_materials = df['materials'].dropna()
+                if 'isbn' in df.columns:
+                    isbn = df['isbn'].reindex(sheet_materials.index).fillna('')
+                else:
+                    isbn = pd.Series('', index=sheet_materials.index)
+                materials.setdefault(sheet_name, []).append(
+                    pd.DataFrame({'Materials': sheet_materials, 'ISBN': isbn})
+                )
+
+            # Set global variables if they exist in the first row of
+            # any spreadsheet. These are treated like user
+            # configuration.
+            if sheet_name not in configured and not df.empty:
+                configured.add(sheet_name)
+                tmp_grade = _first_row_value(df, 'grade')
+                if isinstance(tmp_grade, str):
+                    grade.grade = tmp_grade
+                tmp_name = _first_row_value(df, 'name')
+                if isinstance(tmp_name, str):
+                    grade.name = tmp_name
+                # Only a sheet naming another list replaces it, see
+                # inspect_grade.
+                tmp_list = _first_row_value(df, 'reading list')
+                if (
+                    isinstance(tmp_list, str)
+                    and tmp_list.strip()
+                    and tmp_list != reading_list_value
+                ):
+                    reading_list_value = tmp_list
+                    grade.reading_list, reading_list_source = _reading_list(
+                        tmp_list,
+                        filename,
+                        base_dir=base_dir,
+                        resolver=reading_list_resolver,
+                    )
+                    if (
+                        prefetcher
+                        and grade.reading_list
+                        and reading_lists is not None
+                        and grade.reading_list not in reading_lists
+                    ):
+                        prefetcher.fetch(reading_list_source)
+
+            # Reading level if it exists.
+            if 'reading level' in df.columns:
+                level = df['reading level'].dropna()
+                levels.setdefault(sheet_name, []).append(
+                    pd.DataFrame(
+                        {
+                            'date': pd.to_datetime(df.loc[level.index, 'date']),
+                            'level': level,
+                        },
+                        columns=READING_LEVEL_COLUMNS,
+                    )
+                )
+
+        except Exception as e:
+            raise type(e)(f"Sheet '{sheet_name}' in '{filename}': {e}") from e
+
+    grade.classes = list(classes)
+    if sessions:
+        grade.sessions = _concat(sessions)
+    if duplicates:
+        grade.sessions = check_duplicates(
+            grade.sessions, filename, action=duplicates
+        )
+    if overlaps:
+        check_overlaps(grade.sessions, filename, action=overlaps)
+
+    curricula_data = {col: [] for col in CURRICULA_COLUMNS}
+    for class_name in grade.classes:
+        if class_name not in materials:
+            continue
+        class_materials = _concat(materials[class_name])
+        if len(class_materials) > 0:
+            curricula_data['Course'].append(class_name)
+            curricula_data['Course'].extend(
+                [pd.NA for i in range(len(class_materials) - 1)]
+            )
+            curricula_data['Materials'].extend(class_materials['Materials'])
+            curricula_data['ISBN'].extend(class_materials['ISBN'])
+    grade.curricula = pd.DataFrame(curricula_data, columns=CURRICULA_COLUMNS)
+
+    # The reading level of the last sheet that has one wins
+    level_classes = [c for c in grade.classes if c in levels]
+    if level_classes:
+        grade.reading_level = _concat(levels[level_classes[-1]])
+
+    if reading_lists is not None and grade.reading_list:
+        if grade.reading_list not in reading_lists:
+            if prefetcher:
+                reading_list_source = prefetcher.get(reading_list_source)
+            reading_lists[grade.reading_list] = read_sheets(
+                reading_list_source, class_column=None
+            )
+    return grade
+
+
+def _ordered(inputs, fmt, newest=False):
+    """Sort files and their names by the first date in each, files
+    without dates go last. Only the first row of every sheet is read, while
+    a prefetcher may already be reading the whole files."""
+    keyed = []
+    for file, name in inputs:
+        if not isinstance(file, (str, os.PathLike)):
+            # Read once into a named buffer, which load_grade rewinds
+            file, name = as_source(file, name), None
+        start = inspect_grade(file, fmt=fmt, name=name, last_rows=False).start
+        keyed.append((start, (file, name)))
+    dated = sorted(
+        (k for k in keyed if k[0] is not None),
+        key=lambda k: k[0],
+        reverse=newest,
+    )
+    return [i for _, i in dated] + [i for s, i in keyed if s is None]
+
+
+def load_dashboard_data(
+    files,
+    fmt=None,
+    chunksize=None,
+    workers=PREFETCH_WORKERS,
+    names=None,
+    reading_list_resolver=None,
+    reading_lists=True,
+    order=None,
+    overlaps=None,
+    duplicates=None,
+):
+    """Load every time log and its reading list.
+
+    Args:
+        files (list): time logs in any format supported by hsd_ingest, as
+            paths, bytes or file-like objects.
+        fmt (str): optional input format for all files, one of
+            hsd_ingest.FORMATS. Guessed from each file extension if None.
+        chunksize (int): read time logs in chunks of rows, see load_grade.
+        workers (int): number of files read into memory at the same time
+            before parsing starts, see hsd_ingest.Prefetcher. Every time log
+            is fetched up front, unless chunksize is set and time logs are
+            streamed to keep memory use flat. Pass 0 to read files in
+            place, one at a time.
+        names (list): optional display names, one per file, see
+            load_grade. None entries fall back to the default.
+        reading_list_resolver (callable): optional, see load_grade.
+        reading_lists (bool): also load reading lists. If False only their
+            paths are kept, see GradeData.reading_list.
+        order (str): optional, one of ORDERS. Sort grades by the first date
+            of their time log, found with inspect_grade before anything is
+            parsed. Grades keep the order of files if None.
+        overlaps (str): optional overlap check, see load_grade.
+        duplicates (str): optional duplicate check, see load_grade.
+
+    Returns:
+        DashboardData
+    """
+    if order is not None and order not in ORDERS:
+        raise ValueError(
+            f"Unknown order '{order}', expected one of: {', '.join(ORDERS)}"
+        )
+    data = DashboardData()
+    with ExitStack() as stack:
+        prefetcher = None
+        if workers:
+            prefetcher = stack.enter_context(Prefetcher(max_workers=workers))
+            # Chunked time logs are streamed, only reading lists are fetched
+            if not chunksize:
+                for file in files:
+                    prefetcher.fetch(file)
+        inputs = list(zip(files, names or [None] * len(files)))
+        if order:
+            inputs = _ordered(inputs, fmt, newest=order == 'newest')
+        for file, name in inputs:
+            data.grades.append(
+                load_grade(
+                    file,
+                    fmt=fmt,
+                    reading_lists=data.reading_lists if reading_lists else None,
+                    chunksize=chunksize,
+                    prefetcher=prefetcher,
+                    name=name,
+                    reading_list_resolver=reading_list_resolver,
+                    overlaps=overlaps,
+                    duplicates=duplicates,
+                )
+            )
+    return data
@@ -0,0 +1,253 @@
+"""Module Description
+
+This module finds time logs under a directory tree, e.g. an archive with
+a folder per student and grade. What is known about each spreadsheet is
+kept in a small index file at the top of the tree, so later runs only
+stat files and open just the ones that are new or changed. A directory
+of per-class .csv files is one time log, like hsd_ingest.read_sheets
+reads it.
+"""
+import json
+import os
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+
+from hsd_data import inspect_grade
+from hsd_ingest import (
+    EXTENSIONS,
+    PREFETCH_WORKERS,
+    detect_format,
+    resolve_reading_list_path,
+)
+
+INDEX_FILE = '.homeschool-dashboard-index.json'
+# Bump when the entries change, older indexes are then rebuilt
+INDEX_VERSION = 2
+
+
+@dataclass
+class IndexEntry:
+    """What the index knows about one spreadsheet or directory time log.
+
+    Attributes:
+        path (str): path relative to the root of the tree.
+        mtime_ns (int): modification time when the file was inspected, the
+            latest one of its class files for a directory.
+        size (int): size in bytes when the file was inspected, the total of
+            its class files for a directory.
+        time_log (bool): True for time logs, False for reading lists and
+            any other spreadsheet.
+        student (str): student name from the time log.
+        grade (str): grade from the time log.
+        start (str): first date in the time log, as YYYY-MM-DD.
+        reading_list (str): path of the reading list relative to the root,
+            None if there is none or it's outside of the tree.
+        class_file (bool): True for a .csv file without a class column,
+            i.e. one class of a directory time log.
+    """
+
+    path: str
+    mtime_ns: int
+    size: int
+    time_log: bool = False
+    student: str = ''
+    grade: str = ''
+    start: str = None
+    reading_list: str = None
+    class_file: bool = False
+
+    def matches(self, stat):
+        """bool: True if the file is unchanged since it was inspected."""
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+
+def walk(root):
+    """Paths of every spreadsheet under root in a stable order. Hidden
+    files and directories and Office lock files are skipped. Directories
+    of per-class files are found by update_index, once their files are
+    known to be class files.
+
+    Args:
+        root (str): directory to search.
+
+    Returns:
+        list: paths relative to root.
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        for filename in filenames:
+            if filename.startswith(('.', '~$')):
+                continue
+            if os.path.splitext(filename)[1].lower() in EXTENSIONS:
+                found.append(
+                    os.path.relpath(os.path.join(dirpath, filename), root)
+                )
+    return sorted(found)
+
+
+def load_index(path):
+    """Read an index file.
+
+    Args:
+        path (str): path of the index.
+
+    Returns:
+        dict: relative paths mapped to IndexEntry. Empty if the index
+        doesn't exist, can't be read or is from another version.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            return {}
+        return {e['path']: IndexEntry(**e) for e in data['files']}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def save_index(path, entries):
+    """Write an index file, replacing the old one in one step so a run
+    that is interrupted never leaves half an index behind.
+
+    Args:
+        path (str): path of the index.
+        entries (iterable): IndexEntry to store.
+    """
+    data = {
+        'version': INDEX_VERSION,
+        'files': [asdict(e) for e in entries],
+    }
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _inspect(root, path, stat):
+    """A fresh IndexEntry for a new or changed file or directory. Files
+    that can't be read are kept as non time logs, so they aren't opened
+    again until they change."""
+    entry = IndexEntry(path, stat.st_mtime_ns, stat.st_size)
+    full_path = os.path.join(root, path)
+    try:
+        info = inspect_grade(full_path, last_rows=False)
+    except KeyError:
+        # A file without a class column, one class of a directory if it's
+        # in the format directories are read in
+        directory = os.path.dirname(full_path) or os.curdir
+        ext = os.path.splitext(path)[1].lower()
+        entry.class_file = EXTENSIONS.get(ext) == detect_format(directory)
+        return entry
+    except Exception as e:
+        warnings.warn(f"Skipping '{full_path}': {e}", RuntimeWarning)
+        return entry
+
+    entry.time_log = info.time_log
+    if not info.time_log:
+        return entry
+    entry.student = info.name
+    entry.grade = info.grade
+    if info.start is not None:
+        entry.start = info.start.strftime('%Y-%m-%d')
+    reading_list = resolve_reading_list_path(
+        info.reading_list, os.path.dirname(os.path.abspath(full_path))
+    )
+    if reading_list:
+        relative = os.path.relpath(reading_list, os.path.abspath(root))
+        if not relative.startswith(os.pardir):
+            entry.reading_list = relative
+    return entry
+
+
+def _directory_stats(entries):
+    """Directories of class files mapped to what stands in for their stat
+    result: the latest modification time and the total size of their
+    class files, so adding, removing or changing a class changes it."""
+    files = defaultdict(list)
+    for entry in entries.values():
+        if entry.class_file:
+            files[os.path.dirname(entry.path) or os.curdir].append(entry)
+    return {
+        directory: SimpleNamespace(
+            st_mtime_ns=max(e.mtime_ns for e in class_files),
+            st_size=sum(e.size for e in class_files),
+        )
+        for directory, class_files in files.items()
+    }
+
+
+def update_index(root, index_path=None, workers=PREFETCH_WORKERS):
+    """Bring the index of a tree up to date. Every spreadsheet is stat'ed,
+    only new and changed ones are opened, see hsd_data.inspect_grade.
+    Directories of class files are then opened as one time log each, again
+    only if one of their classes is new or changed.
+
+    Args:
+        root (str): directory to search.
+        index_path (str): optional, defaults to INDEX_FILE in root.
+        workers (int): number of new or changed files opened at the same
+            time.
+
+    Returns:
+        list: IndexEntry for every spreadsheet and directory time log,
+        sorted by path.
+    """
+    index_path = index_path or os.path.join(root, INDEX_FILE)
+    old = load_index(index_path)
+    entries = {}
+    changed = []
+    for path in walk(root):
+        try:
+            stat = os.stat(os.path.join(root, path))
+        except OSError:
+            continue
+        entry = old.get(path)
+        if entry is not None and entry.matches(stat):
+            entries[path] = entry
+        else:
+            changed.append((path, stat))
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for entry in pool.map(lambda c: _inspect(root, *c), changed):
+            entries[entry.path] = entry
+
+        changed_directories = []
+        for path, stat in _directory_stats(entries).items():
+            entry = old.get(path)
+            if entry is not None and entry.matches(stat):
+                entries[path] = entry
+            else:
+                changed_directories.append((path, stat))
+        for entry in pool.map(lambda c: _inspect(root, *c), changed_directories):
+            entries[entry.path] = entry
+        changed.extend(changed_directories)
+    entries = [entries[path] for path in sorted(entries)]
+
+    if changed or len(entries) != len(old):
+        try:
+            save_index(index_path, entries)
+        except OSError as e:
+            warnings.warn(f"Couldn't save the index: {e}", RuntimeWarning)
+    return entries
+
+
+def discover(root, index_path=None, workers=PREFETCH_WORKERS):
+    """Find the time logs under a directory tree.
+
+    Args:
+        root (str): directory to search.
+        index_path (str): optional, see update_index.
+        workers (int): see update_index.
+
+    Returns:
+        list: paths of the time logs, files and directories, sorted.
+    """
+    return [
+        os.path.join(root, e.path)
+        for e in update_index(root, index_path=index_path, workers=workers)
+        if e.time_log
+    ]
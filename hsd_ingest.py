@@ -0,0 +1,516 @@
+"""Module Description
+
+This module contains functions for reading time logs and reading lists
+from the supported input formats. Every reader returns the same thing,
+an ordered dictionary of sheet names to DataFrames, so the rest of the
+pipeline doesn't need to know where the data came from.
+"""
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from itertools import islice
+
+import openpyxl
+import pandas as pd
+
+FORMATS = ('excel', 'ods', 'csv', 'parquet')
+EXTENSIONS = {
+    '.xlsx': 'excel',
+    '.xlsm': 'excel',
+    '.xls': 'excel',
+    '.ods': 'ods',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+CLASS_COLUMN = 'class'
+CHUNKSIZE = 5000
+PREFETCH_WORKERS = 8
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _is_directory(source):
+    return _is_path(source) and os.path.isdir(source)
+
+
+def _source_name(source):
+    """Path of a source, or the name given to an in-memory buffer."""
+    return source if _is_path(source) else getattr(source, 'name', None)
+
+
+def source_name(source, name=None):
+    """Display name of an input.
+
+    Args:
+        source: a path, bytes or a file-like object.
+        name (str): explicit display name, wins if given.
+
+    Returns:
+        str: name, the file name of a path or the file name of a
+        file-like object's name attribute. None if there is nothing to go
+        on.
+    """
+    if name:
+        return name
+    path = _source_name(source)
+    if isinstance(path, (str, os.PathLike)):
+        return os.path.basename(path)
+    return None
+
+
+def as_source(source, name=None):
+    """Turn an input into something every reader takes. Paths are returned
+    unchanged. Bytes and file-like objects become in-memory buffers with a
+    name attribute, so formats can still be detected from the extension.
+
+    Args:
+        source: a path, bytes, BytesIO or any object with a read method.
+        name (str): name for the buffer, e.g. 'Time-1.xlsx'. Defaults to
+            the name attribute of a file-like object.
+
+    Returns:
+        str or BytesIO
+    """
+    if _is_path(source):
+        return source
+    if name is None:
+        name = getattr(source, 'name', None)
+    if (
+        isinstance(source, BytesIO)
+        and isinstance(name, str)
+        and getattr(source, 'name', None) == name
+    ):
+        # Already a named buffer, possibly read before
+        source.seek(0)
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        data = source.read()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+    buffer = BytesIO(data)
+    buffer.name = name
+    return buffer
+
+
+def detect_format(source):
+    """Work out the format of a time log from its file extension.
+
+    Args:
+        source (str): path to a file or a directory of per-class files, or
+            a buffer with a name attribute, see as_source.
+
+    Returns:
+        str: one of FORMATS.
+    """
+    if _is_directory(source):
+        return 'csv'
+    name = _source_name(source)
+    if not isinstance(name, (str, os.PathLike)):
+        raise ValueError(
+            'Unable to detect the format of an input without a name, '
+            'give it a name or pass a format'
+        )
+    ext = os.path.splitext(name)[1].lower()
+    try:
+        return EXTENSIONS[ext]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported file format '{ext}', use one of: "
+            f"{', '.join(sorted(EXTENSIONS))}"
+        ) from None
+
+
+def _usecols(columns, class_column=None):
+    """Function telling whether a column is one of columns, ignoring case,
+    or None to keep every column."""
+    if columns is None:
+        return None
+    wanted = {c.lower() for c in columns}
+    if class_column:
+        wanted.add(class_column)
+    return lambda column: str(column).lower() in wanted
+
+
+def _parquet_columns(parquet_file, usecols):
+    """Names of the columns of a ParquetFile to read, None for all."""
+    if usecols is None:
+        return None
+    return [c for c in parquet_file.schema_arrow.names if usecols(c)]
+
+
+def _read_table(path, fmt, usecols=None):
+    if fmt == 'parquet':
+        if usecols is None:
+            return pd.read_parquet(path)
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        return parquet_file.read(
+            columns=_parquet_columns(parquet_file, usecols)
+        ).to_pandas()
+    return pd.read_csv(path, usecols=usecols)
+
+
+def _split_classes(df, class_column):
+    """Split a long format table into one DataFrame per class. Rows keep
+    their original index so error messages point at the right line."""
+    lower = {c.lower(): c for c in df.columns if isinstance(c, str)}
+    if class_column not in lower:
+        raise KeyError(f"Missing required column(s): {class_column}")
+    column = lower[class_column]
+    df = df.dropna(subset=[column])
+    return {
+        str(name): group
+        for name, group in df.groupby(column, sort=False)
+    }
+
+
+def _directory_files(path, fmt):
+    """Class names and paths of a directory with one file per class, named
+    after the class."""
+    extensions = [e for e, f in EXTENSIONS.items() if f == fmt]
+    file_names = sorted(
+        f for f in os.listdir(path)
+        if os.path.splitext(f)[1].lower() in extensions
+    )
+    if not file_names:
+        raise ValueError(f"No {fmt} files found in '{path}'")
+    return [
+        (os.path.splitext(f)[0], os.path.join(path, f)) for f in file_names
+    ]
+
+
+def _read_directory(path, fmt, usecols=None):
+    return {
+        name: _read_table(file_path, fmt, usecols)
+        for name, file_path in _directory_files(path, fmt)
+    }
+
+
+def read_sheets(source, fmt=None, class_column=CLASS_COLUMN, columns=None):
+    """Read a time log or reading list in any of the supported formats.
+
+    Spreadsheets (.xlsx, .ods) contribute one DataFrame per sheet. A
+    directory of .csv or .parquet files contributes one DataFrame per file
+    and a single .csv or .parquet file is treated as long format data with
+    a 'class' column that is used to split it up.
+
+    Args:
+        source (str): path to a file or directory, or a buffer returned by
+            as_source.
+        fmt (str): optional format, one of FORMATS. Guessed from the file
+            extension when not provided.
+        class_column (str): column used to split long format data. Pass
+            None to keep a single .csv or .parquet file as one sheet named
+            after the file.
+        columns (iterable): optional lower case names of the columns to
+            read, matched against the header ignoring case. Other columns,
+            e.g. notes kept beside a log, are never parsed. All columns are
+            read by default.
+
+    Returns:
+        dict: sheet names mapped to DataFrames, in their original order.
+    """
+    fmt = fmt or detect_format(source)
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Unsupported format '{fmt}', use one of: {', '.join(FORMATS)}"
+        )
+    if fmt in ('excel', 'ods'):
+        engine = 'odf' if fmt == 'ods' else None
+        return pd.read_excel(
+            source, sheet_name=None, engine=engine, usecols=_usecols(columns)
+        )
+    if _is_directory(source):
+        return _read_directory(source, fmt, _usecols(columns))
+    df = _read_table(source, fmt, _usecols(columns, class_column))
+    if class_column is None:
+        name = os.path.splitext(source_name(source) or '')[0]
+        return {name: df}
+    return _split_classes(df, class_column)
+
+
+def _frame(rows, columns, start):
+    """DataFrame for a chunk of rows whose index continues from the
+    previous chunk, so row numbers in error messages stay right."""
+    return pd.DataFrame(
+        rows, columns=columns, index=pd.RangeIndex(start, start + len(rows))
+    )
+
+
+def _columns(header):
+    """Column names of a header row read with openpyxl, named the way
+    pandas names them."""
+    return [f'Unnamed: {i}' if h is None else str(h) for i, h in enumerate(header)]
+
+
+def _iter_excel_chunks(path, chunksize, usecols=None):
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            columns = _columns(next(rows, ()))
+            padding = (None,) * len(columns)
+            # Positions of the columns to keep, taken from the header
+            keep = [
+                i for i, c in enumerate(columns) if usecols is None or usecols(c)
+            ]
+            columns = [columns[i] for i in keep]
+            start = 0
+            while True:
+                chunk = [
+                    tuple((row + padding)[i] for i in keep)
+                    for row in islice(rows, chunksize)
+                ]
+                if chunk or start == 0:
+                    yield sheet_name, _frame(chunk, columns, start)
+                if len(chunk) < chunksize:
+                    break
+                start += len(chunk)
+    finally:
+        workbook.close()
+
+
+def _iter_table_chunks(path, fmt, chunksize, usecols=None):
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        start = 0
+        for batch in parquet_file.iter_batches(
+            batch_size=chunksize, columns=_parquet_columns(parquet_file, usecols)
+        ):
+            df = batch.to_pandas()
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield df
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=usecols)
+
+
+def iter_chunks(
+    source, fmt=None, chunksize=CHUNKSIZE, class_column=CLASS_COLUMN, columns=None
+):
+    """Read a time log a few rows at a time, so memory use stays flat no
+    matter how long the log gets. Takes the same inputs as read_sheets
+    except .ods, which can't be streamed. Excel workbooks are opened
+    read-only and read row by row.
+
+    Args:
+        source (str): path to a file or directory, or a buffer returned by
+            as_source.
+        fmt (str): optional format, one of FORMATS.
+        chunksize (int): maximum number of rows per chunk.
+        class_column (str): column used to split long format data.
+        columns (iterable): optional names of the columns to read, see
+            read_sheets.
+
+    Yields:
+        tuple: sheet name and a DataFrame of at most chunksize rows. Every
+        sheet yields at least one, possibly empty, chunk. Indexes continue
+        from one chunk of a sheet to the next.
+    """
+    fmt = fmt or detect_format(source)
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Unsupported format '{fmt}', use one of: {', '.join(FORMATS)}"
+        )
+    if fmt == 'ods':
+        raise ValueError('Reading in chunks is not supported for .ods files')
+    if fmt == 'excel':
+        yield from _iter_excel_chunks(source, chunksize, _usecols(columns))
+    elif _is_directory(source):
+        for name, path in _directory_files(source, fmt):
+            for chunk in _iter_table_chunks(path, fmt, chunksize, _usecols(columns)):
+                yield name, chunk
+    else:
+        usecols = _usecols(columns, class_column)
+        for chunk in _iter_table_chunks(source, fmt, chunksize, usecols):
+            yield from _split_classes(chunk, class_column).items()
+
+
+def _is_blank(row):
+    return row is None or all(v is None for v in row)
+
+
+def _excel_heads(path, last_rows=True):
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+            rows = sheet.iter_rows(values_only=True)
+            columns = _columns(next(rows, ()))
+            heads = {}
+            first = next(rows, None)
+            if not _is_blank(first):
+                heads[0] = first
+            # The sheet's recorded dimensions give the last row without
+            # reading the ones in between. Without them, or with blank
+            # rows at the end, the rows have to be walked.
+            last_row = sheet.max_row
+            if not last_rows:
+                count = max(last_row - 1, len(heads)) if last_row else len(heads)
+            else:
+                last = None
+                if last_row and last_row > 2:
+                    last = next(
+                        sheet.iter_rows(
+                            min_row=last_row, max_row=last_row, values_only=True
+                        ),
+                        None,
+                    )
+                if not _is_blank(last):
+                    heads[last_row - 2] = last
+                elif first is not None:
+                    for i, row in enumerate(rows, start=1):
+                        if not _is_blank(row):
+                            last_row, last = i, row
+                    if not _is_blank(last):
+                        heads[last_row] = last
+                count = max(heads) + 1 if heads else 0
+            padding = (None,) * len(columns)
+            frame = pd.DataFrame(
+                [(row + padding)[: len(columns)] for row in heads.values()],
+                columns=columns,
+                index=list(heads),
+            )
+            yield sheet_name, (frame, count)
+    finally:
+        workbook.close()
+
+
+def read_heads(source, fmt=None, class_column=CLASS_COLUMN, last_rows=True):
+    """Read just enough of a time log to describe it: the header, the first
+    and last row and the number of rows of every sheet. Excel workbooks
+    are opened read-only and only those rows are read. Other formats are
+    read whole, but still without parsing any dates or times.
+
+    Args:
+        source (str): path to a file or directory, or a buffer returned by
+            as_source.
+        fmt (str): optional format, one of FORMATS.
+        class_column (str): column used to split long format data.
+        last_rows (bool): also read the last row of every sheet. Reaching
+            it means streaming through the sheet, so when False Excel
+            workbooks only have their first rows read and the number of
+            rows comes from the recorded dimensions of each sheet.
+
+    Returns:
+        dict: sheet names mapped to tuples of a DataFrame with the first
+        and last row of the sheet and its number of rows.
+    """
+    fmt = fmt or detect_format(source)
+    if fmt == 'excel':
+        return dict(_excel_heads(source, last_rows=last_rows))
+    return {
+        name: (df.iloc[[0, -1]] if last_rows and len(df) > 1 else df[:1], len(df))
+        for name, df in read_sheets(source, fmt=fmt, class_column=class_column).items()
+    }
+
+
+def resolve_reading_list_path(path, base_dir=None):
+    """Turn the reading list path found in a time log into an absolute path.
+
+    Args:
+        path (str): path as written in the time log.
+        base_dir (str): directory to resolve relative paths against.
+
+    Returns:
+        str: absolute path, or None if there is no path or the reading
+        list doesn't exist.
+    """
+    if not isinstance(path, str):
+        return None
+
+    path = path.strip()
+    if not path:
+        return None
+
+    path = os.path.expanduser(path)
+    if base_dir and not os.path.isabs(path):
+        path = os.path.join(base_dir, path)
+
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        warnings.warn(f"Reading list not found: {path}", RuntimeWarning)
+        return None
+
+    return path
+
+
+def read_buffer(path):
+    """Read a whole file into memory.
+
+    Args:
+        path (str): path to a file.
+
+    Returns:
+        bytes: the contents of the file.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class Prefetcher:
+    """Read files into memory on a pool of threads so that slow storage,
+    e.g. a network share, is read in parallel and ahead of parsing. Use it
+    as a context manager to shut the pool down when done.
+
+    Args:
+        max_workers (int): maximum number of files read at the same time.
+    """
+
+    def __init__(self, max_workers=PREFETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the pool, dropping reads that haven't started yet."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._futures.clear()
+
+    def fetch(self, path):
+        """Start reading a file in the background unless it's already
+        being read. Directories are left to be read in place and inputs
+        that aren't paths are already in memory.
+
+        Args:
+            path (str): path to a file.
+        """
+        if not _is_path(path) or _is_directory(path):
+            return
+        if path not in self._futures:
+            self._futures[path] = self._executor.submit(read_buffer, path)
+
+    def get(self, path):
+        """Wait for a file to be read, fetching it first if it hasn't been.
+        The contents are handed over and not kept by the prefetcher.
+
+        Args:
+            path (str): path to a file.
+
+        Returns:
+            BytesIO: the contents of the file with a name attribute set to
+            path, so formats can still be detected from the extension.
+            Directories and inputs that aren't paths are returned
+            unchanged.
+        """
+        self.fetch(path)
+        future = self._futures.pop(path, None)
+        if future is None:
+            return path
+        buffer = BytesIO(future.result())
+        buffer.name = path
+        return buffer
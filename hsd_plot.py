@@ -2,26 +2,172 @@
 
 This module contains functions for handling data visualization with Bokeh.
 """
-import os
-import warnings
+import re
 from datetime import timedelta
+from itertools import accumulate
 from math import pi
 
+import numpy as np
 import pandas as pd
 from bokeh.models import (
+    CDSView,
+    ColorBar,
     ColumnDataSource,
+    CustomJS,
     DataTable,
     DatetimeTickFormatter,
     Div,
     HoverTool,
+    IndexFilter,
+    LinearColorMapper,
     RangeTool,
     TableColumn,
+    TextInput,
 )
 from bokeh.plotting import figure
 from bokeh.transform import factor_cmap
 from fi import get_percentage
 
-from hsd_constants import COLUMN_HEIGHT, PALETTE
+from hsd_constants import (
+    CALENDAR_HEIGHT,
+    COLUMN_HEIGHT,
+    HEATMAP_PALETTE,
+    PALETTE,
+    SLOT_MINUTES,
+    WEBGL_THRESHOLD,
+    WEEKDAYS,
+)
+from hsd_ingest import read_sheets, resolve_reading_list_path
+
+
+LINKED_TOTALS_JS = '''
+function bisect(values, x, right) {
+    let lo = 0;
+    let hi = values.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (right ? values[mid] <= x : values[mid] < x) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+function windowHours(dates, sums) {
+    return dates.map((d, i) =>
+        sums[i][bisect(d, x_range.end, true)] -
+        sums[i][bisect(d, x_range.start, false)]
+    );
+}
+const round = (x) => Math.round(x * 100) / 100;
+
+const hours = windowHours(class_dates, class_sums);
+const total = hours.reduce((a, b) => a + b, 0);
+
+if (bar_source !== null) {
+    bar_source.data = {...bar_source.data, data: hours};
+    bar_y_range.end = Math.max(...hours) || 1;
+}
+
+if (donut_source !== null) {
+    const percentages = hours.map((h) => total ? round(100 * h / total) : 0);
+    const start_angle = [];
+    const end_angle = [];
+    let angle = 0;
+    for (const p of percentages) {
+        start_angle.push(angle);
+        angle += p / 100 * 2 * Math.PI;
+        end_angle.push(angle);
+    }
+    donut_source.data = {
+        ...donut_source.data, data: percentages, start_angle, end_angle
+    };
+}
+
+if (total_div !== null) {
+    const teachers = windowHours(teacher_dates, teacher_sums)
+        .map((h, i) => [teacher_names[i], h])
+        .filter(([, h]) => h > 0)
+        .sort((a, b) => b[1] - a[1]);
+    let teacher_html = '';
+    if (teachers.length && total) {
+        teacher_html = '<hr style="margin: 0.5em 0;"/><p style="font-size: 0.5em;">' +
+            teachers.map(([t, h]) => `${t}: ${round(100 * h / total)}%`).join('<br/>') +
+            '</p>';
+    }
+    total_div.text = `<p><strong>${round(total)}</strong> <br/>hours of learning</p>${teacher_html}`;
+}
+'''
+
+# Columns of a reading list that can be searched
+SEARCH_FIELDS = ('titles', 'authors', 'isbns', 'language')
+
+READING_LIST_SEARCH_JS = '''
+const tokens = index.data.token;
+const ids = index.data.ids;
+// Index of the first token that is >= prefix in the sorted tokens
+function lowerBound(prefix) {
+    let lo = 0;
+    let hi = tokens.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (tokens[mid] < prefix) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+// Books with a word starting with prefix
+function matches(prefix) {
+    const found = new Set();
+    let t = lowerBound(prefix);
+    for (; t < tokens.length && tokens[t].startsWith(prefix); t++) {
+        for (const id of ids[t]) {
+            found.add(id);
+        }
+    }
+    return found;
+}
+
+const words = (cb_obj.value_input || '').toLowerCase().match(/[\\p{L}\\p{N}_]+/gu);
+if (!words) {
+    for (const filter of filters) {
+        filter.indices = null;
+    }
+} else {
+    // Every word has to match, start from the rarest
+    const sets = words.map(matches).sort((a, b) => a.size - b.size);
+    const hits = [...sets[0]].filter((id) => sets.every((set) => set.has(id)));
+    const rows = filters.map(() => []);
+    for (const id of hits.sort((a, b) => a - b)) {
+        let sheet = offsets.length - 1;
+        while (offsets[sheet] > id) {
+            sheet--;
+        }
+        rows[sheet].push(id - offsets[sheet]);
+    }
+    filters.forEach((filter, i) => {
+        filter.indices = rows[i];
+    });
+}
+'''
+
+
+def _search_words(value):
+    """Lower case words of a reading list cell for the search index. ISBNs
+    are also indexed without their dashes."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return set()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).lower()
+    words = set(re.findall(r'\w+', text))
+    if '-' in text:
+        words.update(re.findall(r'\w+', text.replace('-', '')))
+    return words
 
 
 def barchart(labels, data):
@@ -82,7 +228,10 @@ def donut(labels, data):
         Bokeh plot
     """
     total_hours = sum(data)
-    percentages = [get_percentage(d, total_hours, i=False, r=True) for d in data]
+    percentages = [
+        get_percentage(d, total_hours, i=False, r=True) if total_hours else 0
+        for d in data
+    ]
     source = ColumnDataSource(data=dict(labels=labels, data=percentages))
     donut = figure(
         title='Classes',
@@ -93,7 +242,7 @@ def donut(labels, data):
     )
 
     cumulative_angles = [0] + [
-        sum(percentages[: i + 1]) / 100 * 2 * pi for i in range(len(percentages))
+        p / 100 * 2 * pi for p in accumulate(percentages)
     ]
 
     source.add(cumulative_angles[:-1], 'start_angle')
@@ -126,7 +275,41 @@ def donut(labels, data):
     return donut
 
 
-def days(day_data, min_date, max_date):
+def day_columns(sessions, classes):
+    """Columns for the days plot, separately for each class.
+
+    Args:
+        sessions (DataFrame): sessions with hsd_data.SESSION_COLUMNS, e.g.
+            all of a grade's sessions or just the ones in a date range.
+        classes (list): class names, every class gets an entry and a
+            color from PALETTE by its position.
+
+    Returns:
+        dict: class names mapped to dictionaries of columns, see days.
+    """
+    day_data = {}
+    by_class = dict(list(sessions.groupby('class', sort=False)))
+    for i, class_name in enumerate(classes):
+        class_sessions = by_class.get(class_name, sessions.iloc[:0])
+        num_cells = len(class_sessions)
+        day_data[class_name] = {
+            'dates': list(class_sessions['date']),
+            'date_strings': list(class_sessions['date'].dt.strftime('%Y-%m-%d')),
+            'hours': list(class_sessions['hours']),
+            'start_times': list(class_sessions['start'].dt.time),
+            'start_time_strings': list(
+                class_sessions['start'].dt.strftime('%I:%M %p')
+            ),
+            'end_times': list(class_sessions['end'].dt.time),
+            'end_time_strings': list(class_sessions['end'].dt.strftime('%I:%M %p')),
+            'color': [PALETTE[i] for x in range(num_cells)],
+            'class': [class_name for x in range(num_cells)],
+            'description': list(class_sessions['description']),
+        }
+    return day_data
+
+
+def days(day_data, min_date, max_date, webgl=None):
     """Multicolor candlestick plot showing tasks completed by date (x axis)
     and time (y axis). Items plotted are color coated to correspond with
     their category label and display tooltips with details about the event.
@@ -149,6 +332,9 @@ def days(day_data, min_date, max_date):
             },}
         min_date: date object, the first date of time range for all day data.
         max_date: date object, the latest date for the same time range.
+        webgl (bool): draw both plots with WebGL, which keeps panning
+            smooth with thousands of sessions. By default WebGL is used
+            once the sessions in day_data reach WEBGL_THRESHOLD.
 
     Returns:
         List of Bokeh plots where the first is a candlestick plot of date time
@@ -165,7 +351,13 @@ def days(day_data, min_date, max_date):
         ('Description', '@description'),
     ]
 
+    if webgl is None:
+        sessions = sum(len(data['dates']) for data in day_data.values())
+        webgl = sessions >= WEBGL_THRESHOLD
+    backend = 'webgl' if webgl else 'canvas'
+
     p = figure(
+        output_backend=backend,
         x_axis_type='datetime',
         x_axis_location='above',
         height=COLUMN_HEIGHT,
@@ -192,10 +384,13 @@ def days(day_data, min_date, max_date):
 
         p.yaxis[0].formatter = DatetimeTickFormatter(hours='%I:%M %p')
 
+    # The slider always spans the whole year, not just the data it plots
     select = figure(
+        output_backend=backend,
         title='Drag the slider to change the range above',
         height=80,
         sizing_mode='stretch_width',
+        x_range=(min(min_date, p.x_range.start), max_date),
         y_range=p.y_range,
         x_axis_type='datetime',
         y_axis_type=None,
@@ -215,24 +410,473 @@ def days(day_data, min_date, max_date):
     return [p, select]
 
 
-def _resolve_reading_list_path(path, base_dir=None):
-    if not isinstance(path, str):
-        return None
+def total_hours(total, teacher_hours):
+    """Bokeh Div with the total hours of learning and the share of them
+    taught by each teacher.
+
+    Args:
+        total (float): total hours of learning.
+        teacher_hours (iterable): (teacher, hours) tuples sorted by hours.
+
+    Returns:
+        Bokeh Div
+    """
+    lines = [
+        f'{teacher}: {get_percentage(h, total, r=True)}%'
+        for teacher, h in teacher_hours
+        if h > 0 and total
+    ]
+    teacher_html = ''
+    if lines:
+        teacher_html = (
+            '<hr style="margin: 0.5em 0;"/>'
+            '<p style="font-size: 0.5em;">'
+            + '<br/>'.join(lines)
+            + '</p>'
+        )
+    return Div(
+        styles={'text-align': 'center', 'font-size': '2em'},
+        text=(
+            f'<p><strong>{round(total, 2)}</strong>'
+            f' <br/>hours of learning</p>'
+            f'{teacher_html}'
+        ),
+        sizing_mode='stretch_width',
+    )
+
+
+def _epoch_ms(value):
+    """Milliseconds since the epoch, the unit Bokeh uses for datetimes."""
+    if isinstance(value, (int, float)):
+        return value
+    return pd.Timestamp(value).value / 10**6
+
+
+def cumulative_hours(sessions, key, labels):
+    """Sort sessions by date and compute running totals of their hours,
+    separately for each label. The hours between two dates are then the
+    difference of two running totals found by binary search.
+
+    Args:
+        sessions (pandas.DataFrame): one row per session with 'date' and
+        'hours' columns and the key column.
+        key (str): column to group by, e.g. 'class' or 'teacher'.
+        labels (list): values of the key column to include, in order.
+
+    Returns:
+        tuple: labels, a list of sorted dates in milliseconds since the
+        epoch for each label and a list of running totals for each label.
+        Running totals start at 0 so they are one longer than the dates.
+    """
+    ordered = sessions.sort_values('date', kind='stable')
+    groups = dict(list(ordered.groupby(key, sort=False)))
+    dates = []
+    sums = []
+    for label in labels:
+        group = groups.get(label, ordered.iloc[:0])
+        ms = group['date'].astype('datetime64[ns]').astype('int64') / 10**6
+        dates.append(ms.tolist())
+        sums.append([0.0] + group['hours'].cumsum().tolist())
+    return list(labels), dates, sums
+
+
+def window_hours(labels, dates, sums, start, end):
+    """Hours for each label between start and end, both inclusive.
+
+    Args:
+        labels (list): labels returned by cumulative_hours.
+        dates (list): dates returned by cumulative_hours.
+        sums (list): running totals returned by cumulative_hours.
+        start: beginning of the window, a datetime or milliseconds.
+        end: end of the window, a datetime or milliseconds.
+
+    Returns:
+        list: floats, the hours for each label.
+    """
+    start = _epoch_ms(start)
+    end = _epoch_ms(end)
+    return [
+        s[np.searchsorted(d, end, side='right')]
+        - s[np.searchsorted(d, start, side='left')]
+        for d, s in zip(dates, sums)
+    ]
+
+
+def link_totals(
+    x_range, class_cumulative, teacher_cumulative, bar, donut_plot, total_div
+):
+    """Update the hours summary, barchart and donut with the hours inside
+    x_range every time the range changes. The work per change is a pair
+    of binary searches for each class and teacher, so dragging stays fast
+    no matter how many sessions there are.
+
+    Args:
+        x_range (Range1d): the range of the days plot.
+        class_cumulative (tuple): cumulative_hours output for classes, in
+        the same order as the barchart and donut labels.
+        teacher_cumulative (tuple): cumulative_hours output for teachers.
+        bar: Bokeh plot returned by barchart, or None.
+        donut_plot: Bokeh plot returned by donut, or None.
+        total_div: Bokeh Div returned by total_hours, or None.
+    """
+    _, class_dates, class_sums = class_cumulative
+    teacher_names, teacher_dates, teacher_sums = teacher_cumulative
+    callback = CustomJS(
+        args=dict(
+            x_range=x_range,
+            class_dates=class_dates,
+            class_sums=class_sums,
+            teacher_names=teacher_names,
+            teacher_dates=teacher_dates,
+            teacher_sums=teacher_sums,
+            bar_source=bar.renderers[0].data_source if bar else None,
+            bar_y_range=bar.y_range if bar else None,
+            donut_source=donut_plot.renderers[0].data_source if donut_plot else None,
+            total_div=total_div,
+        ),
+        code=LINKED_TOTALS_JS,
+    )
+    x_range.js_on_change('start', callback)
+    x_range.js_on_change('end', callback)
+
+
+def calendar_heatmap(dates, hours):
+    """Calendar heatmap of the total hours of learning on each day, with a
+    column for every week and a row for every weekday. Sessions are summed
+    into daily totals first so the plot never holds more than one cell per
+    day, no matter how many sessions were logged.
+
+    Args:
+        dates (pandas.Series): the date of each session.
+        hours (pandas.Series): the hours of each session, same length as
+        dates.
+
+    Returns:
+        Bokeh plot
+    """
+    daily = (
+        pd.Series(
+            np.asarray(hours, dtype=float),
+            index=pd.DatetimeIndex(dates).normalize(),
+        )
+        .groupby(level=0)
+        .sum()
+        .resample('D')
+        .sum()
+    )
+    days_in = daily.index
+    week_starts = days_in - pd.to_timedelta(days_in.weekday, unit='D')
+    source = ColumnDataSource(
+        data=dict(
+            week=week_starts + timedelta(days=3.5),
+            weekday=np.array(WEEKDAYS)[days_in.weekday],
+            date_strings=days_in.strftime('%a %Y-%m-%d'),
+            hours=daily.to_numpy(),
+        )
+    )
+    mapper = LinearColorMapper(
+        palette=HEATMAP_PALETTE, low=0, high=max(daily.max(), 1)
+    )
+
+    p = figure(
+        title='Hours per Day',
+        x_axis_type='datetime',
+        y_range=list(reversed(WEEKDAYS)),
+        height=CALENDAR_HEIGHT,
+        sizing_mode='stretch_width',
+        toolbar_location=None,
+        tools='hover',
+        tooltips=[
+            ('Date', '@date_strings'),
+            ('Hours', '@hours{0.00}'),
+        ],
+    )
+    p.rect(
+        x='week',
+        y='weekday',
+        width=timedelta(days=7) * 0.9,
+        height=0.9,
+        source=source,
+        line_color=None,
+        fill_color={'field': 'hours', 'transform': mapper},
+    )
+    p.add_layout(ColorBar(color_mapper=mapper, width=8), 'right')
+    p.xgrid.grid_line_color = None
+    p.ygrid.grid_line_color = None
+    p.axis.axis_line_color = None
+    p.axis.major_tick_line_color = None
+
+    return p
+
+
+def week_slot_hours(starts, ends):
+    """Hours of learning in every weekday and time of day slot of
+    SLOT_MINUTES, summed over all sessions. Sessions are split at slot
+    boundaries, so a session from 9:15 to 10:00 puts a quarter hour in the
+    9:00 slot and half an hour in the 9:30 slot.
+
+    Args:
+        starts (pandas.Series): start of each session.
+        ends (pandas.Series): end of each session, on the same day.
+
+    Returns:
+        numpy.ndarray: 7 rows, Monday first, of 24 * 60 / SLOT_MINUTES
+        slots.
+    """
+    day_minutes = 24 * 60
+    slots_per_day = day_minutes // SLOT_MINUTES
+    slots = 7 * slots_per_day
+    starts = pd.DatetimeIndex(starts)
+    ends = pd.DatetimeIndex(ends)
+    minute = pd.Timedelta(minutes=1)
+    # Minutes since the start of the week
+    start = np.asarray(
+        starts.weekday * day_minutes + (starts - starts.normalize()) / minute,
+        dtype=float,
+    )
+    end = start + np.asarray((ends - starts) / minute, dtype=float)
+
+    first = (start // SLOT_MINUTES).astype(int)
+    last = np.maximum(np.ceil(end / SLOT_MINUTES).astype(int) - 1, first)
+    spans = last > first
+    # The part of every session in its first slot, then the rest of the
+    # sessions that end in a later slot
+    minutes = np.bincount(
+        first,
+        weights=np.minimum(end, (first + 1) * SLOT_MINUTES) - start,
+        minlength=slots,
+    )
+    minutes += np.bincount(
+        last[spans],
+        weights=end[spans] - last[spans] * SLOT_MINUTES,
+        minlength=slots,
+    )
+    # Whole slots in between, marked where they begin and end
+    full = np.bincount(first[spans] + 1, minlength=slots + 1) - np.bincount(
+        last[spans], minlength=slots + 1
+    )
+    minutes += np.cumsum(full)[:slots] * SLOT_MINUTES
+    return (minutes / 60).reshape(7, slots_per_day)
+
+
+def time_of_day_heatmap(grid):
+    """Heatmap of the hours of learning by weekday and time of day. The
+    plot holds one cell per slot of the grid, however long the history.
+
+    Args:
+        grid (numpy.ndarray): hours per weekday and slot, see
+            week_slot_hours.
+
+    Returns:
+        Bokeh plot
+    """
+    slots_per_day = grid.shape[1]
+    slot_hours = 24 / slots_per_day
+    times = [
+        f'{int(m // 60)}:{int(m % 60):02d}'
+        for m in np.arange(slots_per_day + 1) * slot_hours * 60
+    ]
+    source = ColumnDataSource(
+        data={
+            'time': np.tile(np.arange(slots_per_day) + 0.5, 7) * slot_hours,
+            'weekday': np.repeat(WEEKDAYS, slots_per_day),
+            'slot': np.tile([f'{a} to {b}' for a, b in zip(times, times[1:])], 7),
+            'hours': grid.ravel(),
+        }
+    )
+    mapper = LinearColorMapper(
+        palette=HEATMAP_PALETTE, low=0, high=max(grid.max(), 1)
+    )
+
+    p = figure(
+        title='Hours by Time of Day',
+        x_range=(0, 24),
+        y_range=list(reversed(WEEKDAYS)),
+        height=CALENDAR_HEIGHT,
+        sizing_mode='stretch_width',
+        toolbar_location=None,
+        tools='hover',
+        tooltips=[
+            ('Day', '@weekday'),
+            ('Time', '@slot'),
+            ('Hours', '@hours{0.00}'),
+        ],
+    )
+    p.rect(
+        x='time',
+        y='weekday',
+        width=slot_hours * 0.95,
+        height=0.9,
+        source=source,
+        line_color=None,
+        fill_color={'field': 'hours', 'transform': mapper},
+    )
+    p.add_layout(ColorBar(color_mapper=mapper, width=8), 'right')
+    p.xaxis.ticker = list(range(0, 25, 3))
+    p.xaxis.major_label_overrides = {h: f'{h}:00' for h in range(0, 25, 3)}
+    p.xgrid.grid_line_color = None
+    p.ygrid.grid_line_color = None
+    p.axis.axis_line_color = None
+    p.axis.major_tick_line_color = None
+
+    return p
+
+
+def teacher_class_heatmap(crosstab):
+    """Heatmap of the hours each teacher spent on each class.
+
+    Args:
+        crosstab (pandas.DataFrame): hours with teachers as the index and
+        classes as the columns.
+
+    Returns:
+        Bokeh plot
+    """
+    teachers = [str(t) for t in crosstab.index]
+    classes = [str(c) for c in crosstab.columns]
+    values = crosstab.to_numpy(dtype=float)
+    class_totals = values.sum(axis=0)
+    shares = np.divide(
+        values,
+        class_totals,
+        out=np.zeros_like(values),
+        where=class_totals > 0,
+    )
+    source = ColumnDataSource(
+        data={
+            'teacher': np.repeat(teachers, len(classes)),
+            'class': np.tile(classes, len(teachers)),
+            'hours': values.ravel(),
+            'share': shares.ravel(),
+        }
+    )
+    mapper = LinearColorMapper(
+        palette=HEATMAP_PALETTE, low=0, high=max(values.max(), 1)
+    )
+
+    p = figure(
+        title='Hours by Teacher',
+        x_range=classes,
+        y_range=list(reversed(teachers)),
+        height=CALENDAR_HEIGHT + 30 * len(teachers),
+        sizing_mode='stretch_width',
+        toolbar_location=None,
+        tools='hover',
+        tooltips=[
+            ('Teacher', '@teacher'),
+            ('Class', '@class'),
+            ('Hours', '@hours{0.00}'),
+            ('Share of class', '@share{0.0%}'),
+        ],
+    )
+    p.rect(
+        x='class',
+        y='teacher',
+        width=0.95,
+        height=0.95,
+        source=source,
+        line_color=None,
+        fill_color={'field': 'hours', 'transform': mapper},
+    )
+    p.add_layout(ColorBar(color_mapper=mapper, width=8), 'right')
+    p.grid.grid_line_color = None
+    p.axis.axis_line_color = None
+    p.axis.major_tick_line_color = None
+
+    return p
+
+
+def grade_comparison(labels, class_hours):
+    """Stacked bars of the hours spent on each class in every grade, to
+    compare school years side by side.
+
+    Args:
+        labels (list): a unique label for each grade, in display order.
+        class_hours (dict): class names mapped to lists of hours, one per
+            grade in the order of labels.
+
+    Returns:
+        Bokeh plot
+    """
+    classes = list(class_hours)
+    source = ColumnDataSource(data={'grade': labels, **class_hours})
+    p = figure(
+        x_range=labels,
+        height=COLUMN_HEIGHT,
+        title='Hours per Grade',
+        sizing_mode='stretch_width',
+        toolbar_location=None,
+        tools='hover',
+        tooltips=[
+            ('Grade', '@grade'),
+            ('Class', '$name'),
+            ('Hours', '@$name{0.00}'),
+        ],
+    )
+    p.vbar_stack(
+        classes,
+        x='grade',
+        width=0.8,
+        color=[PALETTE[i % len(PALETTE)] for i in range(len(classes))],
+        line_color='white',
+        source=source,
+        legend_label=classes,
+    )
+    p.xgrid.grid_line_color = None
+    p.y_range.start = 0
+    p.legend.location = 'top_left'
+    p.legend.orientation = 'horizontal'
+
+    return p
+
 
-    path = path.strip()
-    if not path:
-        return None
+def lifetime_hours(monthly):
+    """Running total of the hours of learning across grades, a line per
+    student.
 
-    path = os.path.expanduser(path)
-    if base_dir and not os.path.isabs(path):
-        path = os.path.join(base_dir, path)
+    Args:
+        monthly (dict): student names mapped to Series of hours per month,
+            indexed by the first day of each month and sorted.
 
-    path = os.path.abspath(path)
-    if not os.path.isfile(path):
-        warnings.warn(f"Reading list not found: {path}", RuntimeWarning)
-        return None
+    Returns:
+        Bokeh plot
+    """
+    p = figure(
+        x_axis_type='datetime',
+        height=COLUMN_HEIGHT,
+        title='Hours over the Years',
+        sizing_mode='stretch_width',
+        toolbar_location=None,
+        tools='hover',
+        tooltips=[
+            ('Student', '@student'),
+            ('Month', '@month_strings'),
+            ('Total hours', '@hours{0.00}'),
+        ],
+    )
+    for i, (student, hours) in enumerate(monthly.items()):
+        source = ColumnDataSource(
+            data={
+                'month': hours.index,
+                'month_strings': hours.index.strftime('%B %Y'),
+                'student': [student] * len(hours),
+                'hours': hours.cumsum().to_numpy(),
+            }
+        )
+        color = PALETTE[i % len(PALETTE)]
+        p.line(
+            x='month',
+            y='hours',
+            source=source,
+            color=color,
+            line_width=2,
+            legend_label=student,
+        )
+        p.scatter(x='month', y='hours', source=source, color=color, size=5)
+    p.y_range.start = 0
+    p.legend.location = 'top_left'
 
-    return path
+    return p
 
 
 def reading_list(path, base_dir=None):
@@ -240,7 +884,8 @@ def reading_list(path, base_dir=None):
     a list of Bokeh DataTables with optional columns based on the available data.
 
     Args:
-        path (str): The file path to the Excel spreadsheet.
+        path (str): The file path to the spreadsheet, or any other input
+            supported by hsd_ingest.read_sheets.
         base_dir (str): Directory to resolve relative paths against.
 
     Returns:
@@ -248,22 +893,45 @@ def reading_list(path, base_dir=None):
             Each DataTable includes columns such as 'Title', 'Author', 'Language', 'ISBN',
             and an optional 'Level' column if the 'level' information is available.
     """
-    path = _resolve_reading_list_path(path, base_dir=base_dir)
+    path = resolve_reading_list_path(path, base_dir=base_dir)
     if path is None:
         return []
+    return reading_list_tables(read_sheets(path, class_column=None))
+
+
+def reading_list_tables(sheets):
+    """Creates the Bokeh DataTables for a reading list that has already been
+    read, see reading_list.
+
+    Args:
+        sheets (dict): sheet names mapped to DataFrames of book data.
+
+    Returns:
+        list: A list of [Div, DataTable] pairs, one per sheet.
+    """
+    return reading_list_views(reading_list_sources(sheets))
+
 
-    with pd.ExcelFile(path) as spreadsheet:
-        sheet_names = spreadsheet.sheet_names
+def reading_list_sources(sheets):
+    """Creates the data sources and table columns for a reading list. Build
+    them once per reading list and share them between all the DataTables
+    that show it, so the book data is only embedded in the page once.
 
-    book_lists = []
-    for sheet_name in sheet_names:
-        df = pd.read_excel(path, sheet_name=sheet_name)
-        df.columns = df.columns.str.lower()
+    Args:
+        sheets (dict): sheet names mapped to DataFrames of book data.
+
+    Returns:
+        list: (sheet name, ColumnDataSource, list of TableColumns) tuples,
+        one per sheet.
+    """
+    sources = []
+    for sheet_name, df in sheets.items():
+        df = df.set_axis(df.columns.str.lower(), axis=1)
         titles = df['title']
         authors = df['author'].fillna('')
         language = df['language'].fillna('')
         isbns = df['isbn'].fillna('')
-        index = df['index'] = list(range(1, len(df) + 1))
+        index = list(range(1, len(df) + 1))
 
         data = dict(
             index=index,
@@ -292,22 +960,90 @@ def reading_list(path, base_dir=None):
         if level.any():
             columns.append(TableColumn(field='level', title='Level'))
 
-        # Set source
-        source = ColumnDataSource(data)
+        sources.append((sheet_name, ColumnDataSource(data), columns))
+    return sources
 
-        book_lists.append(
-            [
-                Div(text=f'<h3>{sheet_name}</h3>', flow_mode='inline'),
-                DataTable(
-                    source=source,
-                    columns=columns,
-                    height_policy='auto',
-                    index_position=None,
-                    sizing_mode='stretch_width',
-                ),
-            ]
-        )
-    return book_lists
+
+def reading_list_index(sources):
+    """Builds an inverted index over the titles, authors, ISBNs and
+    languages of every sheet of a reading list, so the page can find books
+    without going through every table. Books are numbered across sheets,
+    sheet by sheet.
+
+    Args:
+        sources (list): the output of reading_list_sources.
+
+    Returns:
+        tuple: a ColumnDataSource with the sorted words in 'token' and the
+        numbers of the books that contain each in 'ids', and the number of
+        the first book of every sheet. Share the source between the views
+        of a reading list, so the index is only embedded in the page once.
+    """
+    postings = {}
+    offsets = []
+    offset = 0
+    for _, source, _ in sources:
+        offsets.append(offset)
+        rows = len(source.data['index'])
+        for field in SEARCH_FIELDS:
+            for row, value in enumerate(source.data[field]):
+                for word in _search_words(value):
+                    postings.setdefault(word, set()).add(offset + row)
+        offset += rows
+    tokens = sorted(postings)
+    index = ColumnDataSource(
+        data=dict(token=tokens, ids=[sorted(postings[t]) for t in tokens])
+    )
+    return index, offsets
+
+
+def reading_list_views(sources, index=None):
+    """Creates a heading and a DataTable for each sheet of a reading list
+    from shared data sources, see reading_list_sources.
+
+    Args:
+        sources (list): the output of reading_list_sources.
+        index (tuple): optional, the output of reading_list_index. Adds a
+            search box that filters the tables through the index.
+
+    Returns:
+        list: A list of [Div, DataTable] pairs, one per sheet. With an
+        index the search box comes first, as a list of its own.
+    """
+    views = [
+        [
+            Div(text=f'<h3>{sheet_name}</h3>', flow_mode='inline'),
+            DataTable(
+                source=source,
+                columns=columns,
+                view=CDSView(filter=IndexFilter()) if index else CDSView(),
+                height_policy='auto',
+                index_position=None,
+                sizing_mode='stretch_width',
+            ),
+        ]
+        for sheet_name, source, columns in sources
+    ]
+    if index is None:
+        return views
+
+    index_source, offsets = index
+    search = TextInput(
+        placeholder='Search by title, author, ISBN or language',
+        sizing_mode='stretch_width',
+    )
+    search.js_on_change(
+        'value_input',
+        CustomJS(
+            args=dict(
+                index=index_source,
+                offsets=offsets,
+                filters=[table.view.filter for _, table in views],
+            ),
+            code=READING_LIST_SEARCH_JS,
+        ),
+    )
+    return [[search]] + views
 
 
 def reading_level(level, date):
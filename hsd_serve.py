@@ -0,0 +1,267 @@
+"""Module Description
+
+This module contains a small HTTP server that renders the dashboard on
+request, so it can be opened from any device on the home network. Pages
+are rendered on a bounded pool of threads and cached until one of their
+input files changes. BokehJS is served by the server itself, so no
+internet connection is needed.
+"""
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from bokeh.resources import Resources
+from bokeh.util.paths import static_path
+
+from homeschool_dashboard import render
+from hsd_data import load_dashboard_data
+
+HOST = '127.0.0.1'
+PORT = 8000
+RENDER_WORKERS = 2
+CACHE_SIZE = 8
+STATIC_URL = '/static/'
+
+
+def _stamp(paths):
+    """Fingerprint of the path, modification time and size of files. The
+    files of a directory are included, missing files are skipped."""
+    stamp = hashlib.sha256()
+    for path in paths:
+        if not isinstance(path, (str, os.PathLike)):
+            continue
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, f) for f in os.listdir(path))
+        else:
+            files = [path]
+        for file in files:
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+            stamp.update(
+                f'{os.path.abspath(file)}\0{stat.st_mtime_ns}\0{stat.st_size}\n'
+                .encode()
+            )
+    return stamp.hexdigest()
+
+
+def fingerprint(files, **options):
+    """Fingerprint of a dashboard's inputs, changes whenever a time log is
+    modified or the options change.
+
+    Args:
+        files (list): paths to time logs.
+        options: any keyword arguments that change the output.
+
+    Returns:
+        str: a hex digest.
+    """
+    key = hashlib.sha256(repr(sorted(options.items())).encode())
+    key.update(_stamp(files).encode())
+    return key.hexdigest()
+
+
+@dataclass
+class Page:
+    """A rendered dashboard.
+
+    Attributes:
+        etag (str): quoted entity tag sent with the page.
+        body (bytes): the UTF-8 encoded HTML.
+        reading_lists (list): paths of the reading lists on the page.
+        reading_list_stamp (str): fingerprint of the reading lists when the
+            page was rendered.
+    """
+
+    etag: str
+    body: bytes
+    reading_lists: list
+    reading_list_stamp: str
+
+    @property
+    def fresh(self):
+        """bool: False if a reading list changed since rendering."""
+        return _stamp(self.reading_lists) == self.reading_list_stamp
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """HTTP server for one dashboard. Every request runs on its own thread,
+    while rendering happens on a pool of at most workers threads. Requests
+    that arrive while the same page is being rendered wait for it instead
+    of rendering it again.
+
+    Args:
+        address (tuple): host and port to listen on.
+        files (list): paths to time logs.
+        workers (int): maximum number of pages rendered at the same time.
+        cache_size (int): number of rendered pages to keep.
+        load_options: keyword arguments for load_dashboard_data.
+        render_options: keyword arguments for render.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        files,
+        workers=RENDER_WORKERS,
+        cache_size=CACHE_SIZE,
+        load_options=None,
+        render_options=None,
+    ):
+        super().__init__(address, DashboardHandler)
+        self.files = list(files)
+        self.cache_size = cache_size
+        self.load_options = load_options or {}
+        self.render_options = render_options or {}
+        self.resources = Resources(mode='server', root_url='/')
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._rendering = {}
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, key):
+        model = load_dashboard_data(self.files, **self.load_options)
+        body = render(
+            model, resources=self.resources, **self.render_options
+        ).encode('utf-8')
+        reading_lists = list(model.reading_lists)
+        reading_list_stamp = _stamp(reading_lists)
+        etag = hashlib.sha256(f'{key}{reading_list_stamp}'.encode()).hexdigest()
+        page = Page(f'"{etag}"', body, reading_lists, reading_list_stamp)
+        with self._lock:
+            self._cache[key] = page
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return page
+
+    def page(self):
+        """The dashboard for the current state of its input files, from
+        the cache if nothing changed.
+
+        Returns:
+            Page
+        """
+        key = fingerprint(
+            self.files, **self.load_options, **self.render_options
+        )
+        with self._lock:
+            page = self._cache.get(key)
+            if page is not None and page.fresh:
+                self._cache.move_to_end(key)
+                return page
+            future = self._rendering.get(key)
+            if future is None:
+                future = self._pool.submit(self._render, key)
+                self._rendering[key] = future
+        try:
+            return future.result()
+        finally:
+            with self._lock:
+                if self._rendering.get(key) is future:
+                    del self._rendering[key]
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """Serves the dashboard at / and BokehJS under STATIC_URL."""
+
+    def do_GET(self):
+        path = unquote(urlsplit(self.path).path)
+        if path == '/':
+            self.send_dashboard()
+        elif path.startswith(STATIC_URL):
+            self.send_static(path[len(STATIC_URL) :])
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def send_dashboard(self):
+        try:
+            page = self.server.page()
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, explain=str(e))
+            return
+
+        etags = self.headers.get('If-None-Match', '')
+        if page.etag in [t.strip() for t in etags.split(',')] or etags == '*':
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', page.etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(page.body)))
+        self.send_header('ETag', page.etag)
+        # Always revalidate, unchanged pages cost a 304
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(page.body)
+
+    def send_static(self, name):
+        root = os.path.realpath(static_path())
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'max-age=86400')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(
+    files,
+    host=HOST,
+    port=PORT,
+    workers=RENDER_WORKERS,
+    cache_size=CACHE_SIZE,
+    load_options=None,
+    render_options=None,
+):
+    """Serve a dashboard over HTTP until interrupted.
+
+    Args:
+        files (list): paths to time logs.
+        host (str): address to listen on, use '0.0.0.0' to make the
+            dashboard available to other devices on the network.
+        port (int): port to listen on.
+        workers (int): maximum number of pages rendered at the same time.
+        cache_size (int): number of rendered pages to keep.
+        load_options: keyword arguments for load_dashboard_data.
+        render_options: keyword arguments for render.
+    """
+    server = DashboardServer(
+        (host, port),
+        files,
+        workers=workers,
+        cache_size=cache_size,
+        load_options=load_options,
+        render_options=render_options,
+    )
+    print(f'Serving the dashboard at http://{host}:{server.server_port}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,262 @@
+"""Module Description
+
+This module writes the dashboard as a small static site: an index.html
+listing every student and grade with their totals, and a page per grade.
+Pages load BokehJS and the stylesheet from a shared static directory, so
+opening a grade only loads that grade's plots. What each page was built
+from is remembered, and pages whose time log, reading list and options
+are unchanged aren't loaded or rendered again.
+"""
+import json
+import os
+import re
+import shutil
+
+from bokeh.resources import Resources
+from bokeh.util.paths import static_path
+from jinja2 import Template
+
+from homeschool_dashboard import render_chunks, write_html
+from hsd_constants import COMPRESSION, LOGO_BW
+from hsd_data import DashboardData, load_dashboard_data
+from hsd_serve import fingerprint
+from styles import CSS
+from templates import SITE_INDEX_TEMPLATE_STR
+
+SITE_DIR = 'homeschool-dashboard'
+INDEX_PAGE = 'index.html'
+STATIC_DIR = 'static'
+CSS_FILE = 'dashboard.css'
+MANIFEST_FILE = '.homeschool-dashboard-site.json'
+# Bump when pages or entries change, older sites are then rebuilt
+MANIFEST_VERSION = 1
+
+
+def _slug(text):
+    """File name friendly version of text."""
+    return re.sub(r'[^\w]+', '-', text).strip('-') or 'grade'
+
+
+def _page_name(grade, taken):
+    """A page name for a grade that isn't taken yet."""
+    base = _slug(' '.join(t for t in (grade.name, grade.grade) if t))
+    if base == 'grade':
+        base = _slug(os.path.splitext(grade.source)[0])
+    page = f'{base}.html'
+    n = 2
+    while page in taken:
+        page = f'{base}-{n}.html'
+        n += 1
+    return page
+
+
+def _copy_if_changed(source, destination):
+    """Copy a file unless the destination already has the same size and
+    isn't older."""
+    try:
+        src, dst = os.stat(source), os.stat(destination)
+        if src.st_size == dst.st_size and src.st_mtime <= dst.st_mtime:
+            return
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    shutil.copy2(source, destination)
+
+
+def _write_if_changed(path, text):
+    """Write text to a file unless it already holds it."""
+    data = text.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def write_assets(output_dir, resources):
+    """Copy the BokehJS files used by resources and write the stylesheet
+    into the static directory of a site. Files that are already there are
+    left alone.
+
+    Args:
+        output_dir (str): the site directory.
+        resources (Resources): resources with URLs relative to the site,
+            see build_site.
+    """
+    root = static_path()
+    for url in resources.js_files + resources.css_files:
+        name = url.split('?')[0][len(f'{STATIC_DIR}/') :]
+        _copy_if_changed(
+            os.path.join(root, name), os.path.join(output_dir, STATIC_DIR, name)
+        )
+    _write_if_changed(os.path.join(output_dir, STATIC_DIR, CSS_FILE), CSS)
+
+
+def load_manifest(path):
+    """Read what a site's pages were built from.
+
+    Args:
+        path (str): path of the manifest.
+
+    Returns:
+        dict: time log paths mapped to their page entries. Empty if there
+        is no manifest or it's from another version.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+        return {entry['file']: entry for entry in data['pages']}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _entry(file, key, page, grade):
+    """Manifest entry for a rendered grade page."""
+    by_day = grade.cube.by_day
+    return {
+        'file': file,
+        'key': key,
+        'page': page,
+        'source': grade.source,
+        'grade': grade.grade,
+        'name': grade.name,
+        'reading_list': grade.reading_list,
+        'classes': len(grade.classes),
+        'total_hours': round(float(grade.cube.total), 2),
+        'start': by_day.index.min().strftime('%Y-%m-%d') if len(by_day) else None,
+        'end': by_day.index.max().strftime('%Y-%m-%d') if len(by_day) else None,
+    }
+
+
+def index_page(entries):
+    """Render the index of a site.
+
+    Args:
+        entries (list): manifest entries, see build_site.
+
+    Returns:
+        str: HTML
+    """
+    students = {}
+    for entry in entries:
+        students.setdefault(entry['name'], []).append(entry)
+    return Template(SITE_INDEX_TEMPLATE_STR).render(
+        students=list(students.items()),
+        css_url=f'{STATIC_DIR}/{CSS_FILE}',
+        logo=LOGO_BW,
+    )
+
+
+def build_site(
+    files,
+    output_dir=SITE_DIR,
+    load_options=None,
+    render_options=None,
+    compress=(),
+):
+    """Write a static site with an index and a page per grade. Grades whose
+    page is up to date, because neither their time log, their reading list
+    nor the options changed, are neither loaded nor rendered.
+
+    Args:
+        files (list): paths to time logs.
+        output_dir (str): directory to write the site to.
+        load_options: keyword arguments for load_dashboard_data.
+        render_options: keyword arguments for render_chunks.
+        compress (iterable): also write precompressed pages, see
+            homeschool_dashboard.write_html.
+
+    Returns:
+        list: names of the pages that were rendered.
+    """
+    load_options = dict(load_options or {})
+    render_options = render_options or {}
+    # Only the index is ordered, pages don't depend on it
+    order = load_options.pop('order', None)
+    # Nor on how time logs are read, only on what is read
+    content_options = {
+        name: value
+        for name, value in load_options.items()
+        if name not in ('chunksize', 'workers')
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    resources = Resources(mode='server', root_url='')
+    write_assets(output_dir, resources)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    old = load_manifest(manifest_path)
+    options = dict(content_options, **render_options, compress=sorted(compress))
+
+    def key(file, reading_list):
+        paths = [file, reading_list] if reading_list else [file]
+        return fingerprint(paths, **options)
+
+    entries = {}
+    stale = []
+    for file in files:
+        file = os.path.abspath(file)
+        entry = old.get(file)
+        if (
+            entry is not None
+            and entry['key'] == key(file, entry['reading_list'])
+            and os.path.exists(os.path.join(output_dir, entry['page']))
+        ):
+            entries[file] = entry
+        else:
+            stale.append(file)
+
+    rendered = []
+    if stale:
+        model = load_dashboard_data(stale, **load_options)
+        # Pages of time logs that are still given stay theirs, pages of
+        # time logs that are gone can go to a moved or renamed one
+        taken = {old[f]['page'] for f in stale if f in old}
+        taken.update(e['page'] for e in entries.values())
+        for file, grade in zip(stale, model.grades):
+            page = old[file]['page'] if file in old else _page_name(grade, taken)
+            taken.add(page)
+            reading_lists = {}
+            if grade.reading_list in model.reading_lists:
+                reading_lists[grade.reading_list] = model.reading_lists[
+                    grade.reading_list
+                ]
+            write_html(
+                render_chunks(
+                    DashboardData(grades=[grade], reading_lists=reading_lists),
+                    resources=resources,
+                    css_url=f'{STATIC_DIR}/{CSS_FILE}',
+                    home_url=INDEX_PAGE,
+                    **render_options,
+                ),
+                os.path.join(output_dir, page),
+                compress=compress,
+            )
+            entries[file] = _entry(file, key(file, grade.reading_list), page, grade)
+            rendered.append(page)
+
+    # Pages of time logs that are gone, unless another time log took them
+    in_use = {e['page'] for e in entries.values()}
+    for file, entry in old.items():
+        if file not in entries and entry['page'] not in in_use:
+            for ext in ('', *COMPRESSION.values()):
+                try:
+                    os.remove(os.path.join(output_dir, entry['page'] + ext))
+                except OSError:
+                    pass
+
+    ordered = [entries[os.path.abspath(f)] for f in files]
+    if order:
+        dated = [e for e in ordered if e['start']]
+        ordered = sorted(
+            dated, key=lambda e: e['start'], reverse=order == 'newest'
+        ) + [e for e in ordered if not e['start']]
+    _write_if_changed(os.path.join(output_dir, INDEX_PAGE), index_page(ordered))
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'pages': ordered}, f, indent=1)
+    return rendered
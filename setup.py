@@ -11,20 +11,30 @@ setup(
         'openpyxl',
         'pandas',
     ],
-    scripts=[
-        'homeschool_dashboard.py',
-    ],
+    extras_require={
+        'brotli': ['brotli'],
+        'ods': ['odfpy'],
+        'parquet': ['pyarrow'],
+    },
     py_modules=[
+        'hsd_app',
+        'hsd_cli',
         'hsd_constants',
+        'hsd_data',
+        'hsd_index',
+        'hsd_ingest',
         'homeschool_dashboard',
         'hsd_plot',
+        'hsd_serve',
+        'hsd_site',
+        'hsd_summary',
         'styles',
         'templates',
         'utils',
     ],
     entry_points={
         'console_scripts': [
-            'homeschool_dashboard = homeschool_dashboard:run',
+            'homeschool_dashboard = hsd_cli:run',
         ],
     },
     test_suite='tests',
@@ -15,7 +15,8 @@ header {
     text-align: center;
     padding: 1em;
 }
-h1 {
+h1,
+h2 {
     font-family: Helvetica, Arial, sans-serif;
 }
 #logo-main {
@@ -31,6 +32,21 @@ h1 {
     padding: 2em;
     margin-top: 28px;
 }
+.home {
+    color: #ffffff;
+    font-family: Helvetica, Arial, sans-serif;
+}
+table.grades {
+    border-collapse: collapse;
+    font-family: Helvetica, Arial, sans-serif;
+    margin-bottom: 2em;
+}
+table.grades th,
+table.grades td {
+    padding: 0.5em 1em;
+    border-bottom: 1px solid #eee;
+    text-align: left;
+}
 .accordion {
     background-color: #eee;
     cursor: pointer;
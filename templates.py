@@ -4,23 +4,54 @@ INNER_TEMPLATE_STR = '''
   {{ grade }}
 </button>
 <div class="panel">
-<div class="row">
-    <div class="grid-large-third">
-        {{ plot_div["barchart"] }}
+{% if plot_div["barchart"] or plot_div["donut"] or plot_div["total_hours"] %}
+    <div class="row">
+        {% if plot_div["barchart"] %}
+            <div class="grid-large-third">
+                {{ plot_div["barchart"] }}
+            </div>
+        {% endif %}
+        {% if plot_div["donut"] %}
+            <div class="grid-large-third">
+                {{ plot_div["donut"] }}
+            </div>
+        {% endif %}
+        {% if plot_div["total_hours"] %}
+            <div class="grid-small-slice color-box">
+                {{ plot_div["total_hours"] }}
+            </div>
+        {% endif %}
     </div>
-    <div class="grid-large-third">
-        {{ plot_div["donut"] }}
+{% endif %}
+{% if plot_div["days"] %}
+    <div class="row">
+        <div class="grid-full">
+            {{ plot_div["days"] }}
+            {{ plot_div["slider"] }}
+        </div>
     </div>
-    <div class="grid-small-slice color-box">
-        {{ plot_div["total_hours"] }}
+{% endif %}
+{% if plot_div["calendar"] %}
+    <div class="row">
+        <div class="grid-full">
+            {{ plot_div["calendar"] }}
+        </div>
     </div>
-</div>
-<div class="row">
-    <div class="grid-full">
-        {{ plot_div["days"] }}
-        {{ plot_div["slider"] }}
+{% endif %}
+{% if plot_div["time_of_day"] %}
+    <div class="row">
+        <div class="grid-full">
+            {{ plot_div["time_of_day"] }}
+        </div>
     </div>
-</div>
+{% endif %}
+{% if plot_div["teachers"] %}
+    <div class="row">
+        <div class="grid-full">
+            {{ plot_div["teachers"] }}
+        </div>
+    </div>
+{% endif %}
 {% if plot_div["curricula"] or plot_div["reading_level"] %}
     <div class="row">
         {% if plot_div["curricula"] %}
@@ -35,18 +66,23 @@ INNER_TEMPLATE_STR = '''
         {% endif %}
     </div>
 {% endif %}
-<div class="row">
-    {% for i in range(dyn_scripts|length) %}
-        {% if i is even  %}
-            {{ dyn_scripts[i] }}
-            {{ dyn_scripts[i+1] }}
+{% if search_div %}
+    <div class="row">
+        <div class="grid-full">
+            {{ search_div }}
+        </div>
+    </div>
+{% endif %}
+{% if sheet_divs %}
+    <div class="row">
+        {% for heading, table in sheet_divs %}
             <div class="grid-half">
-                {{ dyn_divs[i] }}
-                {{ dyn_divs[i+1] }}
+                {{ heading }}
+                {{ table }}
             </div>
-        {% endif %}
-    {% endfor %}
-</div>
+        {% endfor %}
+    </div>
+{% endif %}
 </div>
 '''
 
@@ -57,9 +93,13 @@ OUTER_TEMPLATE_STR = '''<!DOCTYPE html>
         <title>Homeschool Dashboard</title>
         {{ bokeh_js }}
         {{ bokeh_css }}
+        {% if css_url %}
+        <link rel="stylesheet" href="{{ css_url }}">
+        {% else %}
         <style>
             {{css}}
         </style>
+        {% endif %}
     </head>
     <body>
         <header>
@@ -75,13 +115,31 @@ OUTER_TEMPLATE_STR = '''<!DOCTYPE html>
                     {% endif %}
                 </div>
                 <div class="grid-third">
-                    &nbsp;
+                    {% if home_url %}
+                        <p><a class="home" href="{{ home_url }}">All grades</a></p>
+                    {% else %}
+                        &nbsp;
+                    {% endif %}
                 </div>
             </div>
         </header>
         <div class="main-wrapper">
-            {{ content }}
+            {% if comparison_div %}
+                {{ comparison_script }}
+                <div class="row">
+                    <div class="grid-half">
+                        {{ comparison_div["classes"] }}
+                    </div>
+                    <div class="grid-half">
+                        {{ comparison_div["lifetime"] }}
+                    </div>
+                </div>
+            {% endif %}
+            {% for panel in content %}
+                {{ panel }}
+            {% endfor %}
         </div>
+        {{ reading_list_script }}
         <script>
           var acc = document.getElementsByClassName("accordion");
           var i;
@@ -102,3 +160,52 @@ OUTER_TEMPLATE_STR = '''<!DOCTYPE html>
     </body>
 </html>
 '''
+
+
+SITE_INDEX_TEMPLATE_STR = '''<!DOCTYPE html>
+<html lang="en">
+    <head>
+        <meta charset="utf-8">
+        <title>Homeschool Dashboard</title>
+        <link rel="stylesheet" href="{{ css_url }}">
+    </head>
+    <body>
+        <header>
+            <div class="row">
+                <div class="grid-third">
+                    <div id="logo-main">
+                        {{ logo }}
+                    </div>
+                </div>
+                <div class="grid-third">
+                    <h1>Homeschool Dashboard</h1>
+                </div>
+                <div class="grid-third">
+                    &nbsp;
+                </div>
+            </div>
+        </header>
+        <div class="main-wrapper">
+            {% for student, grades in students %}
+            <h2>{{ student or 'Grades' }}</h2>
+            <table class="grades">
+                <tr>
+                    <th>Grade</th>
+                    <th>Dates</th>
+                    <th>Classes</th>
+                    <th>Hours</th>
+                </tr>
+                {% for grade in grades %}
+                <tr>
+                    <td><a href="{{ grade.page }}">{{ grade.grade or grade.source }}</a></td>
+                    <td>{{ grade.start or '' }}{% if grade.end %} to {{ grade.end }}{% endif %}</td>
+                    <td>{{ grade.classes }}</td>
+                    <td>{{ '%.2f' % grade.total_hours }}</td>
+                </tr>
+                {% endfor %}
+            </table>
+            {% endfor %}
+        </div>
+    </body>
+</html>
+'''
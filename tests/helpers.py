@@ -0,0 +1,49 @@
+import pandas as pd
+from hsd_data import GradeData
+
+
+def make_grade(
+    dates=('2023-01-02', '2023-01-03'),
+    classes=('Math', 'Art'),
+    hours=1.0,
+    teachers='Mom',
+    descriptions='Lesson',
+    **fields,
+):
+    """A GradeData built from literal sessions instead of a time log. Every
+    session starts at 9 AM on its date and lasts its hours.
+
+    Args:
+        dates (list): date of each session.
+        classes (list): class of each session, same length as dates.
+        hours: hours of each session, or the same hours for all.
+        teachers: teacher of each session, or the same teacher for all.
+        descriptions: description of each session, or one for all.
+        fields: other GradeData fields. The grade is '1st Grade' of
+            'Eliana' from 'Time-1.xlsx' unless given. The grade's classes
+            are those of the sessions, in order.
+
+    Returns:
+        GradeData
+    """
+    dates = pd.to_datetime(list(dates))
+    classes = list(classes)
+    start = dates + pd.Timedelta(hours=9)
+    sessions = pd.DataFrame(
+        {
+            'class': classes,
+            'date': dates,
+            'start': start,
+            'end': start + pd.to_timedelta(hours, unit='h'),
+            'hours': hours,
+            'teacher': teachers,
+            'description': descriptions,
+            'row': range(2, len(dates) + 2),
+        }
+    )
+    fields.setdefault('source', 'Time-1.xlsx')
+    fields.setdefault('grade', '1st Grade')
+    fields.setdefault('name', 'Eliana')
+    return GradeData(
+        classes=list(dict.fromkeys(classes)), sessions=sessions, **fields
+    )
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource, Plot, RangeTool
+from hsd_app import SessionWindow, dashboard, websocket_origins
+from hsd_data import DashboardData
+
+from tests.helpers import make_grade
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        dates = pd.date_range('2023-01-02', periods=400, freq='D')
+        self.grade = make_grade(dates, ['Math', 'Art'] * 200)
+        # Out of order, the way sheets are concatenated
+        sessions = self.grade.sessions
+        self.grade.sessions = pd.concat([sessions.iloc[1::2], sessions.iloc[::2]])
+        self.window = SessionWindow(self.grade.sessions, self.grade.classes)
+
+    def test_websocket_origins(self):
+        self.assertEqual(websocket_origins('localhost', 5006), ['localhost:5006'])
+        with patch('socket.gethostname', return_value='den'), patch(
+            'socket.getfqdn', return_value='den.lan'
+        ):
+            origins = websocket_origins('0.0.0.0', 5006, ['192.168.1.20', 'den.lan:80'])
+
+        # Never every origin
+        self.assertNotIn('*', origins)
+        self.assertEqual(
+            origins,
+            [
+                'localhost:5006',
+                'den:5006',
+                'den.lan:5006',
+                '192.168.1.20:5006',
+                'den.lan:80',
+            ],
+        )
+
+    def test_between(self):
+        sessions = self.window.between('2023-01-10', '2023-01-19')
+
+        self.assertEqual(len(sessions), 10)
+        self.assertTrue(sessions['date'].is_monotonic_increasing)
+        self.assertEqual(sessions['date'].iloc[0], pd.Timestamp('2023-01-10'))
+
+    def test_between_milliseconds(self):
+        start = pd.Timestamp('2023-01-10').value // 10**6
+
+        sessions = self.window.between(start, pd.Timestamp('2023-01-19'))
+
+        self.assertEqual(len(sessions), 10)
+
+    def test_span(self):
+        start, end = self.window.span('2023-01-10', '2023-01-20', margin=0.5)
+
+        self.assertEqual(start, pd.Timestamp('2023-01-05'))
+        self.assertEqual(end, pd.Timestamp('2023-01-25'))
+
+    def test_days_plot_holds_a_window(self):
+        doc = Document()
+        doc.add_root(dashboard(DashboardData(grades=[self.grade]), [self.window]))
+        x_range = doc.select_one({'type': RangeTool}).x_range
+        sources = [
+            s for s in doc.select({'type': ColumnDataSource}) if 'description' in s.data
+        ]
+
+        # 30 days shown plus half of that on both sides, up to the last day
+        self.assertEqual(sum(len(s.data['dates']) for s in sources), 46)
+
+        start, end = pd.Timestamp('2023-12-17'), pd.Timestamp('2024-01-16')
+        x_range.start = start.value // 10**6
+        x_range.end = end.value // 10**6
+
+        dates = [d for s in sources for d in s.data['dates']]
+        self.assertLessEqual(min(dates), start)
+        self.assertGreaterEqual(max(dates), end)
+        self.assertLess(len(dates), 100)
+
+    def test_webgl_counts_every_session(self):
+        # The window only holds 46 sessions, the grade has 400
+        with patch('homeschool_dashboard.WEBGL_THRESHOLD', 400):
+            layout = dashboard(DashboardData(grades=[self.grade]), [self.window])
+        x_range = next(layout.select({'type': RangeTool})).x_range
+        days_plots = [
+            p
+            for p in layout.select({'type': Plot})
+            if p.x_range is x_range or any(isinstance(t, RangeTool) for t in p.tools)
+        ]
+        self.assertEqual([p.output_backend for p in days_plots], ['webgl', 'webgl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
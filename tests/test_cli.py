@@ -0,0 +1,55 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+from hsd_cli import summary_argv
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'Time-1.xlsx')
+        df = pd.DataFrame(
+            {
+                'Date': ['2023-01-02'],
+                'Start Time': ['9:00 AM'],
+                'End Time': ['10:30 AM'],
+                'Description': ['Fractions'],
+            }
+        )
+        df.to_excel(self.path, sheet_name='Math', index=False)
+
+    def test_summary_argv(self):
+        self.assertEqual(
+            summary_argv(['--summary', 'Time-1.xlsx', '--json']), ['Time-1.xlsx', '--json']
+        )
+        self.assertIsNone(summary_argv(['Time-1.xlsx']))
+        # Subcommands keep their own arguments
+        self.assertIsNone(summary_argv(['serve', '--summary', 'Time-1.xlsx']))
+        self.assertIsNone(summary_argv(['site', 'Time-1.xlsx', '--summary']))
+
+    def test_summary_without_bokeh_or_jinja(self):
+        code = (
+            'import sys, hsd_cli; hsd_cli.run(sys.argv[1:]); '
+            'print("bokeh" in sys.modules, "jinja2" in sys.modules)'
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code, '--summary', self.path],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+        self.assertIn('Time-1.xlsx: 1.50 hours', output)
+        self.assertEqual(output.split()[-2:], ['False', 'False'])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
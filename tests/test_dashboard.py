@@ -0,0 +1,164 @@
+import gzip
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+from hsd_data import DashboardData
+from homeschool_dashboard import comparison_widgets, render, write_html
+
+from tests.helpers import make_grade
+
+# Art has no teacher, like a sheet without a Teacher column
+TEACHERS = ['Mom', None]
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'dashboard.html')
+        self.chunks = ['<html>', '<body>', 'Hours ✓' * 100, '</body>', '</html>']
+        self.html = ''.join(self.chunks)
+
+    def test_write_html(self):
+        paths = write_html(iter(self.chunks), self.path)
+
+        self.assertEqual(paths, [self.path])
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), self.html)
+
+    def test_write_html_gzip(self):
+        paths = write_html(iter(self.chunks), self.path, compress=['gzip'])
+
+        self.assertEqual(paths, [self.path, self.path + '.gz'])
+        with gzip.open(self.path + '.gz', 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), self.html)
+
+    def test_write_html_compressed_only(self):
+        paths = write_html(iter(self.chunks), self.path, compress=['gzip'], plain=False)
+
+        self.assertEqual(paths, [self.path + '.gz'])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_render_shares_reading_lists(self):
+        books = pd.DataFrame(
+            {
+                'title': ['Basic Economics'],
+                'author': ['Thomas Sowell'],
+                'language': ['English'],
+                'isbn': ['978-0465081387'],
+            }
+        )
+        model = DashboardData(
+            grades=[
+                make_grade(teachers=TEACHERS, reading_list='/lists/books.xlsx'),
+                make_grade(
+                    grade='Kindergarten',
+                    teachers=TEACHERS,
+                    reading_list='/lists/books.xlsx',
+                ),
+            ],
+            reading_lists={'/lists/books.xlsx': {'Kids': books}},
+        )
+
+        html = render(model)
+
+        self.assertIn('1st Grade', html)
+        self.assertIn('Kindergarten', html)
+        # Both grades show the list, its data is only embedded once
+        self.assertEqual(html.count('"name":"DataTable"'), 2)
+        self.assertEqual(html.count('Thomas Sowell'), 1)
+
+    def test_render_reading_list_layout(self):
+        books = pd.DataFrame(
+            {
+                'title': ['Basic Economics'],
+                'author': ['Thomas Sowell'],
+                'language': ['English'],
+                'isbn': ['978-0465081387'],
+            }
+        )
+        model = DashboardData(
+            grades=[make_grade(teachers=TEACHERS, reading_list='/lists/books.xlsx')],
+            reading_lists={
+                '/lists/books.xlsx': {'Adults': books, 'Kids': books, 'Teens': books}
+            },
+        )
+
+        html = render(model, widgets=['reading_lists'])
+
+        # Model type and text of every root, by the id the divs refer to
+        models = {
+            id_: (name, text)
+            for name, id_, text in re.findall(
+                r'"name":"(\w+)","id":"(p\d+)",'
+                r'"attributes":\{(?:[^{}]*"text":"([^"]*)")?',
+                html,
+            )
+        }
+
+        def roots(block):
+            return [models[r] for r in re.findall(r'data-root-id="(p\d+)"', block)]
+
+        search = re.findall(r'<div class="grid-full">(.*?)</div>\s*</div>', html, re.S)
+        self.assertEqual([name for name, _ in roots(search[-1])], ['TextInput'])
+        columns = re.findall(r'<div class="grid-half">(.*?)</div>\s*</div>', html, re.S)
+        self.assertEqual(
+            [roots(column) for column in columns],
+            [
+                [('Div', f'&lt;h3&gt;{sheet}&lt;/h3&gt;'), ('DataTable', '')]
+                for sheet in ('Adults', 'Kids', 'Teens')
+            ],
+        )
+
+    def test_render_selected_widgets(self):
+        model = DashboardData(
+            grades=[make_grade(teachers=TEACHERS, reading_list='/lists/books.xlsx')]
+        )
+
+        html = render(model, widgets=['barchart', 'total_hours'])
+
+        self.assertIn('hours of learning', html)
+        self.assertIn('"name":"VBar"', html)
+        self.assertNotIn('"name":"Wedge"', html)
+        self.assertNotIn('"name":"RangeTool"', html)
+        self.assertNotIn('class="grid-full"', html)
+
+    def test_comparison(self):
+        first = make_grade(teachers=TEACHERS)
+        second = make_grade(
+            dates=['2024-01-02', '2024-01-03'],
+            hours=[2.0, 0.5],
+            teachers=TEACHERS,
+            grade='2nd Grade',
+        )
+        second.classes = ['Math', 'Art', 'Music']
+        model = DashboardData(grades=[first, second])
+
+        plots = comparison_widgets(model)
+
+        classes = plots['classes'].renderers[0].data_source.data
+        self.assertEqual(classes['grade'], ['Eliana 1st Grade', 'Eliana 2nd Grade'])
+        self.assertEqual(classes['Math'], [1.0, 2.0])
+        self.assertEqual(classes['Music'], [0.0, 0.0])
+        lifetime = plots['lifetime'].renderers[0].data_source.data
+        self.assertEqual(list(lifetime['month_strings']), ['January 2023', 'January 2024'])
+        self.assertEqual(lifetime['hours'].tolist(), [2.0, 4.5])
+        self.assertEqual(comparison_widgets(DashboardData(grades=[first])), {})
+        self.assertIn('Hours per Grade', render(model))
+        self.assertNotIn('Hours per Grade', render(model, widgets=['barchart']))
+
+    def test_render_unknown_widget(self):
+        with self.assertRaises(ValueError):
+            render(
+                DashboardData(grades=[make_grade(teachers=TEACHERS)]), widgets=['pie']
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,322 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import hsd_ingest
+import pandas as pd
+from hsd_data import (
+    DashboardData,
+    find_duplicates,
+    find_overlaps,
+    inspect_grade,
+    load_dashboard_data,
+    load_grade,
+)
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'Time-1.xlsx')
+        self.math = pd.DataFrame(
+            {
+                'Date': ['2023-01-02', '2023-01-03', '2023-01-04'],
+                'Start Time': ['9:00 AM', '10:00 AM', '9:00 AM'],
+                'End Time': ['10:00 AM', '11:30 AM', '9:30 AM'],
+                'Description': ['Fractions', 'Decimals', 'Review'],
+                'Teacher': ['Mom', None, 'Dad'],
+                'Materials': ['Math Book', None, None],
+                'ISBN': ['978-0465081387', None, None],
+                'Grade': ['1st Grade', None, None],
+                'Name': ['Eliana', None, None],
+                'Reading Level': [1.5, None, 2.0],
+            }
+        )
+        self.art = pd.DataFrame(
+            {
+                'Date': ['2023-01-02'],
+                'Start Time': ['1:00 PM'],
+                'End Time': ['3:00 PM'],
+                'Description': ['Painting'],
+            }
+        )
+        self.write(self.path, Math=self.math, Art=self.art)
+
+    def write(self, path, **sheets):
+        with pd.ExcelWriter(path) as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+
+    def test_load_grade(self):
+        grade = load_grade(self.path)
+
+        self.assertEqual(grade.source, 'Time-1.xlsx')
+        self.assertEqual(grade.grade, '1st Grade')
+        self.assertEqual(grade.name, 'Eliana')
+        self.assertEqual(grade.classes, ['Math', 'Art'])
+        self.assertEqual(grade.class_hours, [3.0, 2.0])
+        self.assertEqual(grade.total_hours, 5.0)
+        self.assertEqual(grade.sessions['row'].to_list(), [2, 3, 4, 2])
+        self.assertEqual(
+            grade.sessions['start'].iloc[1], pd.Timestamp('2023-01-03 10:00')
+        )
+        self.assertEqual(grade.curricula['Materials'].to_list(), ['Math Book'])
+        self.assertEqual(grade.reading_level['level'].to_list(), [1.5, 2.0])
+
+    def test_load_grade_in_chunks(self):
+        whole = load_grade(self.path)
+
+        chunked = load_grade(self.path, chunksize=2)
+
+        self.assertEqual(chunked.classes, whole.classes)
+        self.assertEqual(chunked.grade, whole.grade)
+        self.assertEqual(chunked.name, whole.name)
+        self.assertEqual(chunked.class_hours, whole.class_hours)
+        self.assertEqual(chunked.sessions['row'].to_list(), [2, 3, 4, 2])
+        self.assertEqual(chunked.reading_level['level'].to_list(), [1.5, 2.0])
+        pd.testing.assert_frame_equal(chunked.curricula, whole.curricula)
+
+    def test_prefetched_reading_list(self):
+        books = pd.DataFrame({'Title': ['Frog and Toad'], 'Author': ['Lobel']})
+        self.write(os.path.join(self.dir, 'books.xlsx'), Kids=books)
+        self.math['Reading List'] = ['books.xlsx', None, None]
+        self.write(self.path, Math=self.math)
+
+        data = load_dashboard_data([self.path], workers=2)
+        in_place = load_dashboard_data([self.path], workers=0)
+
+        path = os.path.join(self.dir, 'books.xlsx')
+        self.assertEqual(data.grades[0].reading_list, path)
+        self.assertEqual(list(data.reading_lists), [path])
+        pd.testing.assert_frame_equal(
+            data.reading_lists[path]['Kids'], in_place.reading_lists[path]['Kids']
+        )
+        pd.testing.assert_frame_equal(data.grades[0].sessions, in_place.grades[0].sessions)
+
+    def test_chunked_time_logs_are_not_prefetched(self):
+        books = pd.DataFrame({'Title': ['Frog and Toad'], 'Author': ['Lobel']})
+        self.write(os.path.join(self.dir, 'books.xlsx'), Kids=books)
+        self.math['Reading List'] = ['books.xlsx', None, None]
+        self.write(self.path, Math=self.math)
+
+        with mock.patch.object(
+            hsd_ingest, 'read_buffer', wraps=hsd_ingest.read_buffer
+        ) as read_buffer:
+            data = load_dashboard_data([self.path], chunksize=2, workers=2)
+
+        # Only the reading list is read whole, the time log is streamed
+        path = os.path.join(self.dir, 'books.xlsx')
+        read_buffer.assert_called_once_with(path)
+        self.assertEqual(list(data.reading_lists), [path])
+        self.assertEqual(len(data.grades[0].sessions), 3)
+
+    def test_long_time_log_keeps_its_reading_list(self):
+        books = pd.DataFrame({'Title': ['Frog and Toad'], 'Author': ['Lobel']})
+        self.write(os.path.join(self.dir, 'books.xlsx'), Kids=books)
+        self.math['Reading List'] = ['books.xlsx', None, None]
+        # Art gets a blank reading list cell of its own in the long file
+        long = pd.concat(
+            [self.math.assign(Class='Math'), self.art.assign(Class='Art')]
+        )
+        csv = os.path.join(self.dir, 'Time-1.csv')
+        long.to_csv(csv, index=False)
+        parquet = os.path.join(self.dir, 'Time-1.parquet')
+        long.to_parquet(parquet)
+
+        path = os.path.join(self.dir, 'books.xlsx')
+        for time_log in (csv, parquet):
+            self.assertEqual(load_grade(time_log).reading_list, path)
+            self.assertEqual(inspect_grade(time_log).reading_list, 'books.xlsx')
+
+    def test_load_from_memory(self):
+        books = pd.DataFrame({'Title': ['Frog and Toad'], 'Author': ['Lobel']})
+        books_path = os.path.join(self.dir, 'books.xlsx')
+        self.write(books_path, Kids=books)
+        self.math['Reading List'] = ['books.xlsx', None, None]
+        self.write(self.path, Math=self.math)
+        with open(self.path, 'rb') as f:
+            time_log = f.read()
+        requested = []
+
+        def resolver(path, time_log):
+            requested.append((path, time_log))
+            with open(books_path, 'rb') as f:
+                return f.read()
+
+        data = load_dashboard_data(
+            [time_log], names=['Upload.xlsx'], reading_list_resolver=resolver
+        )
+
+        grade = data.grades[0]
+        self.assertEqual(grade.source, 'Upload.xlsx')
+        self.assertEqual(grade.class_hours, [3.0])
+        self.assertEqual(requested, [('books.xlsx', 'Upload.xlsx')])
+        self.assertEqual(grade.reading_list, 'books.xlsx')
+        self.assertEqual(data.reading_lists['books.xlsx']['Kids']['Title'].to_list(), ['Frog and Toad'])
+
+    def test_unnamed_bytes_need_a_format(self):
+        with open(self.path, 'rb') as f:
+            time_log = f.read()
+
+        with self.assertRaises(ValueError):
+            load_grade(time_log)
+
+        self.assertEqual(load_grade(time_log, fmt='excel').classes, ['Math', 'Art'])
+
+    def test_inspect_grade(self):
+        self.math['Reading List'] = ['books.xlsx', None, None]
+        self.write(self.path, Math=self.math, Art=self.art)
+
+        info = inspect_grade(self.path)
+
+        self.assertEqual(info.source, 'Time-1.xlsx')
+        self.assertEqual(info.grade, '1st Grade')
+        self.assertEqual(info.name, 'Eliana')
+        self.assertEqual(info.reading_list, 'books.xlsx')
+        self.assertEqual(info.classes, {'Math': 3, 'Art': 1})
+        self.assertEqual(info.rows, 4)
+        self.assertEqual(info.start, pd.Timestamp('2023-01-02'))
+        self.assertEqual(info.end, pd.Timestamp('2023-01-04'))
+        self.assertEqual(info.to_dict()['end'], '2023-01-04')
+        self.assertIsNone(inspect_grade(self.path, last_rows=False).end)
+
+    def test_order_grades_by_date(self):
+        older = os.path.join(self.dir, 'Time-K.xlsx')
+        self.math['Date'] = ['2022-01-03', '2022-01-04', '2022-01-05']
+        self.math['Grade'] = ['Kindergarten', None, None]
+        self.write(older, Math=self.math)
+        with open(older, 'rb') as f:
+            in_memory = f.read()
+
+        oldest = load_dashboard_data([self.path, older], order='oldest')
+        newest = load_dashboard_data(
+            [in_memory, self.path], names=['Time-K.xlsx', None], order='newest'
+        )
+
+        self.assertEqual([g.grade for g in oldest.grades], ['Kindergarten', '1st Grade'])
+        self.assertEqual([g.grade for g in newest.grades], ['1st Grade', 'Kindergarten'])
+        self.assertEqual(newest.grades[1].source, 'Time-K.xlsx')
+        with self.assertRaises(ValueError):
+            load_dashboard_data([self.path], order='alphabetical')
+
+    def test_teacher_hours_skip_sheets_without_teacher(self):
+        grade = load_grade(self.path)
+
+        self.assertEqual(
+            grade.teacher_hours.to_dict(), {'Independent': 1.5, 'Mom': 1.0, 'Dad': 0.5}
+        )
+        self.assertEqual(list(grade.teacher_classes.columns), ['Math'])
+
+    def test_hours_cube_rollups(self):
+        cube = load_grade(self.path).cube
+
+        self.assertEqual(cube.total, 5.0)
+        self.assertEqual(cube.by_class.to_list(), [3.0, 2.0])
+        self.assertEqual(
+            cube.by_day.to_dict(),
+            {
+                pd.Timestamp('2023-01-02'): 3.0,
+                pd.Timestamp('2023-01-03'): 1.5,
+                pd.Timestamp('2023-01-04'): 0.5,
+            },
+        )
+        daily = cube.rollup('date', 'class')
+        self.assertEqual(daily[(pd.Timestamp('2023-01-02'), 'Art')], 2.0)
+        # Roll-ups are computed once
+        self.assertIs(cube.rollup('date', 'class'), daily)
+
+    def test_invalid_rows_are_reported(self):
+        self.math.loc[1, 'End Time'] = '9:00 AM'
+        self.write(self.path, Math=self.math)
+
+        with self.assertRaises(ValueError) as cm:
+            load_grade(self.path)
+
+        self.assertIn("Sheet 'Math' in 'Time-1.xlsx'", str(cm.exception))
+        self.assertIn('Row 3: end time is before start time', str(cm.exception))
+
+    def test_missing_columns_are_reported(self):
+        self.write(self.path, Math=self.math.drop(columns=['End Time']))
+
+        with self.assertRaises(KeyError) as cm:
+            load_grade(self.path)
+
+        self.assertIn('Missing required column(s): end time', str(cm.exception))
+
+    def test_overlapping_sessions(self):
+        # Art from 1 to 3 PM on Jan 2, double booked with Math
+        self.math['Date'] = ['2023-01-02', '2023-01-02', '2023-01-03']
+        self.math['Start Time'] = ['9:00 AM', '2:00 PM', '1:00 PM']
+        self.math['End Time'] = ['10:00 AM', '2:30 PM', '3:00 PM']
+        self.write(self.path, Math=self.math, Art=self.art)
+
+        grade = load_grade(self.path)
+
+        self.assertEqual(
+            find_overlaps(grade.sessions), ["  Row 3 of 'Math': overlaps row 2 of 'Art'"]
+        )
+        with self.assertWarns(RuntimeWarning):
+            load_grade(self.path, overlaps='warn')
+        with self.assertRaisesRegex(ValueError, "Row 3 of 'Math'"):
+            load_grade(self.path, overlaps='fail')
+
+    def test_adjacent_sessions_dont_overlap(self):
+        self.math['Start Time'] = ['12:00 PM', '10:00 AM', '9:00 AM']
+        self.math['End Time'] = ['1:00 PM', '11:30 AM', '9:30 AM']
+        self.write(self.path, Math=self.math, Art=self.art)
+
+        self.assertEqual(find_overlaps(load_grade(self.path).sessions), [])
+
+    def test_duplicate_sessions(self):
+        # Row 4 repeats row 2 but for the case and spacing of the description
+        self.math.loc[2] = self.math.loc[0]
+        self.math.loc[2, 'Description'] = ' fractions'
+        self.write(self.path, Math=self.math, Art=self.art)
+
+        grade = load_grade(self.path)
+        duplicate, messages = find_duplicates(grade.sessions)
+
+        self.assertEqual(duplicate.tolist(), [False, False, True, False])
+        self.assertEqual(messages, ["  Row 4 of 'Math': duplicates row 2 of 'Math'"])
+        with self.assertWarns(RuntimeWarning):
+            self.assertEqual(len(load_grade(self.path, duplicates='warn').sessions), 4)
+        with self.assertWarns(RuntimeWarning):
+            grade = load_grade(self.path, duplicates='drop')
+        self.assertEqual(grade.sessions['row'].tolist(), [2, 3, 2])
+        self.assertEqual(grade.total_hours, 4.5)
+        with self.assertRaisesRegex(ValueError, "Row 4 of 'Math'"):
+            load_grade(self.path, duplicates='fail')
+
+    def test_duplicates_across_chunks(self):
+        self.math.loc[2] = self.math.loc[0]
+        self.write(self.path, Math=self.math)
+
+        grade = load_grade(self.path, chunksize=2)
+
+        self.assertEqual(
+            find_duplicates(grade.sessions)[1],
+            ["  Row 4 of 'Math': duplicates row 2 of 'Math'"],
+        )
+
+    def test_json_round_trip(self):
+        data = load_dashboard_data([self.path])
+
+        restored = DashboardData.from_json(data.to_json())
+
+        self.assertEqual(restored.name, 'Eliana')
+        grade = restored.grades[0]
+        self.assertEqual(grade.classes, ['Math', 'Art'])
+        self.assertEqual(grade.class_hours, [3.0, 2.0])
+        self.assertEqual(grade.teacher_hours.to_dict(), data.grades[0].teacher_hours.to_dict())
+        pd.testing.assert_series_equal(
+            grade.sessions['start'], data.grades[0].sessions['start'], check_index=False
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
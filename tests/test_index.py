@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import hsd_index
+import pandas as pd
+from hsd_index import INDEX_FILE, discover, load_index, update_index
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.dir, 'Eliana', '1st Grade'))
+        os.makedirs(os.path.join(self.dir, '.trash'))
+        self.time_log = os.path.join(self.dir, 'Eliana', '1st Grade', 'Time-1.xlsx')
+        self.write_time_log('2023-01-02')
+        books = pd.DataFrame({'Title': ['Frog and Toad'], 'Author': ['Lobel']})
+        books.to_excel(
+            os.path.join(self.dir, 'Eliana', 'books.xlsx'), sheet_name='Kids', index=False
+        )
+        shutil.copy(self.time_log, os.path.join(self.dir, '.trash', 'Time-1.xlsx'))
+
+    def write_time_log(self, date):
+        df = pd.DataFrame(
+            {
+                'Date': [date],
+                'Start Time': ['9:00 AM'],
+                'End Time': ['10:00 AM'],
+                'Grade': ['1st Grade'],
+                'Name': ['Eliana'],
+                'Reading List': ['../books.xlsx'],
+            }
+        )
+        df.to_excel(self.time_log, sheet_name='Math', index=False)
+
+    def test_discover(self):
+        self.assertEqual(discover(self.dir), [self.time_log])
+
+        entries = load_index(os.path.join(self.dir, INDEX_FILE))
+        entry = entries[os.path.join('Eliana', '1st Grade', 'Time-1.xlsx')]
+        self.assertEqual(entry.student, 'Eliana')
+        self.assertEqual(entry.grade, '1st Grade')
+        self.assertEqual(entry.start, '2023-01-02')
+        self.assertEqual(entry.reading_list, os.path.join('Eliana', 'books.xlsx'))
+        self.assertFalse(entries[os.path.join('Eliana', 'books.xlsx')].time_log)
+
+    def test_only_changed_files_are_opened(self):
+        update_index(self.dir)
+
+        with mock.patch.object(
+            hsd_index, 'inspect_grade', wraps=hsd_index.inspect_grade
+        ) as inspect:
+            update_index(self.dir)
+            self.assertEqual(inspect.call_count, 0)
+
+            self.write_time_log('2023-09-05')
+            entries = update_index(self.dir)
+            self.assertEqual(inspect.call_count, 1)
+
+        self.assertEqual([e.start for e in entries if e.time_log], ['2023-09-05'])
+
+    def test_discover_directory_time_log(self):
+        directory = os.path.join(self.dir, 'Eliana', 'Kindergarten')
+        os.makedirs(directory)
+        for name, date in (('Math', '2022-01-03'), ('Art', '2022-01-04')):
+            pd.DataFrame(
+                {
+                    'Date': [date],
+                    'Start Time': ['9:00 AM'],
+                    'End Time': ['10:00 AM'],
+                    'Grade': ['Kindergarten'],
+                    'Name': ['Eliana'],
+                }
+            ).to_csv(os.path.join(directory, f'{name}.csv'), index=False)
+
+        self.assertEqual(discover(self.dir), [self.time_log, directory])
+
+        entries = load_index(os.path.join(self.dir, INDEX_FILE))
+        entry = entries[os.path.join('Eliana', 'Kindergarten')]
+        self.assertEqual(entry.grade, 'Kindergarten')
+        self.assertEqual(entry.start, '2022-01-03')
+        art = entries[os.path.join('Eliana', 'Kindergarten', 'Art.csv')]
+        self.assertTrue(art.class_file)
+        self.assertFalse(art.time_log)
+
+        # Nothing is opened again until a class changes
+        with mock.patch.object(
+            hsd_index, 'inspect_grade', wraps=hsd_index.inspect_grade
+        ) as inspect:
+            discover(self.dir)
+            self.assertEqual(inspect.call_count, 0)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+from hsd_ingest import (
+    Prefetcher,
+    detect_format,
+    iter_chunks,
+    read_heads,
+    read_sheets,
+)
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.math = pd.DataFrame(
+            {
+                'Date': ['2023-01-02', '2023-01-03'],
+                'Start Time': ['9:00 AM', '10:00 AM'],
+                'End Time': ['10:00 AM', '11:30 AM'],
+                'Description': ['Fractions', 'Decimals'],
+            }
+        )
+        self.reading = pd.DataFrame(
+            {
+                'Date': ['2023-01-02'],
+                'Start Time': ['1:00 PM'],
+                'End Time': ['2:00 PM'],
+                'Description': ['Phonics'],
+            }
+        )
+        self.long = pd.concat(
+            [self.math.assign(Class='Math'), self.reading.assign(Class='Reading')],
+            ignore_index=True,
+        )
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format('Time-1.xlsx'), 'excel')
+        self.assertEqual(detect_format('Time-1.ODS'), 'ods')
+        self.assertEqual(detect_format('Time-1.csv'), 'csv')
+        self.assertEqual(detect_format('Time-1.parquet'), 'parquet')
+        self.assertEqual(detect_format(self.dir), 'csv')
+        with self.assertRaises(ValueError):
+            detect_format('Time-1.txt')
+
+    def test_read_excel(self):
+        path = self.path('time.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            self.math.to_excel(writer, sheet_name='Math', index=False)
+            self.reading.to_excel(writer, sheet_name='Reading', index=False)
+
+        sheets = read_sheets(path)
+
+        self.assertEqual(list(sheets), ['Math', 'Reading'])
+        self.assertEqual(len(sheets['Math']), 2)
+
+    def test_read_csv_directory(self):
+        self.reading.to_csv(self.path('Reading.csv'), index=False)
+        self.math.to_csv(self.path('Math.csv'), index=False)
+
+        sheets = read_sheets(self.dir)
+
+        self.assertEqual(list(sheets), ['Math', 'Reading'])
+        self.assertEqual(sheets['Math']['Description'].to_list(), ['Fractions', 'Decimals'])
+
+    def test_read_long_csv(self):
+        path = self.path('time.csv')
+        self.long.to_csv(path, index=False)
+
+        sheets = read_sheets(path)
+
+        self.assertEqual(list(sheets), ['Math', 'Reading'])
+        # Rows keep their position in the file for error reporting
+        self.assertEqual(sheets['Reading'].index.to_list(), [2])
+
+    def test_read_long_csv_without_class_column(self):
+        path = self.path('time.csv')
+        self.math.to_csv(path, index=False)
+
+        with self.assertRaises(KeyError):
+            read_sheets(path)
+
+        self.assertEqual(list(read_sheets(path, class_column=None)), ['time'])
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow not installed')
+    def test_read_long_parquet(self):
+        path = self.path('time.parquet')
+        self.long.to_parquet(path)
+
+        sheets = read_sheets(path)
+
+        self.assertEqual(list(sheets), ['Math', 'Reading'])
+        self.assertEqual(len(sheets['Math']), 2)
+
+    def test_iter_chunks_excel(self):
+        path = self.path('time.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            self.math.to_excel(writer, sheet_name='Math', index=False)
+            self.reading.iloc[:0].to_excel(writer, sheet_name='Reading', index=False)
+
+        chunks = list(iter_chunks(path, chunksize=1))
+
+        self.assertEqual([name for name, _ in chunks], ['Math', 'Math', 'Reading'])
+        # Indexes continue across chunks and empty sheets still yield a chunk
+        self.assertEqual([c.index.to_list() for _, c in chunks], [[0], [1], []])
+        self.assertEqual(list(chunks[0][1].columns), list(self.math.columns))
+        self.assertEqual(chunks[1][1]['Description'].to_list(), ['Decimals'])
+
+    def test_read_heads_excel(self):
+        path = self.path('time.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            self.math.to_excel(writer, sheet_name='Math', index=False)
+            self.reading.to_excel(writer, sheet_name='Reading', index=False)
+            self.reading.iloc[:0].to_excel(writer, sheet_name='Art', index=False)
+
+        heads = read_heads(path)
+
+        self.assertEqual(list(heads), ['Math', 'Reading', 'Art'])
+        df, rows = heads['Math']
+        self.assertEqual(rows, 2)
+        self.assertEqual(df.index.to_list(), [0, 1])
+        self.assertEqual(df['Description'].to_list(), ['Fractions', 'Decimals'])
+        self.assertEqual(heads['Reading'][1], 1)
+        self.assertEqual(heads['Art'][1], 0)
+        self.assertTrue(heads['Art'][0].empty)
+
+        first, rows = read_heads(path, last_rows=False)['Math']
+        self.assertEqual(first['Description'].to_list(), ['Fractions'])
+        self.assertEqual(rows, 2)
+
+    def test_read_selected_columns(self):
+        path = self.path('time.xlsx')
+        self.math.assign(Notes='Scratch').to_excel(path, sheet_name='Math', index=False)
+        columns = ['date', 'description']
+
+        sheets = read_sheets(path, columns=columns)
+        chunks = list(iter_chunks(path, chunksize=1, columns=columns))
+
+        self.assertEqual(list(sheets['Math'].columns), ['Date', 'Description'])
+        self.assertEqual(list(chunks[1][1].columns), ['Date', 'Description'])
+        self.assertEqual(chunks[1][1]['Description'].to_list(), ['Decimals'])
+
+    def test_read_selected_columns_long_csv(self):
+        path = self.path('time.csv')
+        self.long.assign(Notes='Scratch').to_csv(path, index=False)
+
+        sheets = read_sheets(path, columns=['date'])
+        chunks = list(iter_chunks(path, chunksize=2, columns=['date']))
+
+        # The class column is always read to split the table
+        self.assertEqual(list(sheets['Math'].columns), ['Date', 'Class'])
+        self.assertEqual(list(chunks[1][1].columns), ['Date', 'Class'])
+
+    def test_read_heads_long_csv(self):
+        path = self.path('time.csv')
+        self.long.to_csv(path, index=False)
+
+        heads = read_heads(path)
+
+        self.assertEqual(heads['Math'][1], 2)
+        self.assertEqual(heads['Math'][0]['Description'].to_list(), ['Fractions', 'Decimals'])
+        self.assertEqual(heads['Reading'][1], 1)
+
+    def test_iter_chunks_long_csv(self):
+        path = self.path('time.csv')
+        self.long.to_csv(path, index=False)
+
+        chunks = list(iter_chunks(path, chunksize=2))
+
+        self.assertEqual([name for name, _ in chunks], ['Math', 'Reading'])
+        self.assertEqual(chunks[1][1].index.to_list(), [2])
+
+    def test_iter_chunks_ods_not_supported(self):
+        with self.assertRaises(ValueError):
+            list(iter_chunks(self.path('time.ods')))
+
+    def test_prefetcher(self):
+        path = self.path('time.csv')
+        self.long.to_csv(path, index=False)
+
+        with Prefetcher(max_workers=2) as prefetcher:
+            prefetcher.fetch(path)
+            buffer = prefetcher.get(path)
+            self.assertEqual(prefetcher.get(self.dir), self.dir)
+            with self.assertRaises(FileNotFoundError):
+                prefetcher.get(self.path('missing.csv'))
+
+        self.assertEqual(buffer.name, path)
+        self.assertEqual(detect_format(buffer), 'csv')
+        self.assertEqual(list(read_sheets(buffer)), ['Math', 'Reading'])
+        buffer.seek(0)
+        self.assertEqual(list(read_sheets(buffer, class_column=None)), ['time'])
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            read_sheets(self.dir, fmt='json')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
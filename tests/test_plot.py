@@ -4,12 +4,30 @@ from datetime import datetime
 from unittest.mock import patch
 
 import pandas as pd
-from bokeh.models import ColumnDataSource, DataTable, Div, RangeTool
+from bokeh.models import ColumnDataSource, DataTable, Div, RangeTool, TextInput
 from bokeh.models.glyphs import VBar
 from bokeh.models.renderers import GlyphRenderer
 from bokeh.plotting import figure
 from hsd_constants import COLUMN_HEIGHT, PALETTE
-from hsd_plot import barchart, curricula, days, donut, reading_level, reading_list
+from hsd_plot import (
+    barchart,
+    calendar_heatmap,
+    cumulative_hours,
+    curricula,
+    days,
+    donut,
+    link_totals,
+    reading_level,
+    reading_list,
+    reading_list_index,
+    reading_list_sources,
+    reading_list_views,
+    teacher_class_heatmap,
+    time_of_day_heatmap,
+    total_hours,
+    week_slot_hours,
+    window_hours,
+)
 
 
 class Tests(unittest.TestCase):
@@ -132,6 +150,135 @@ class Tests(unittest.TestCase):
         self.assertTrue(isinstance(plots[1], figure))
         self.assertTrue(any(isinstance(tool, RangeTool) for tool in plots[1].tools))
 
+        # Two sessions are drawn on the canvas unless WebGL is asked for or
+        # they reach the threshold
+        self.assertEqual([p.output_backend for p in plots], ['canvas', 'canvas'])
+        plots = days(day_data, min_date, max_date, webgl=True)
+        self.assertEqual([p.output_backend for p in plots], ['webgl', 'webgl'])
+        with patch('hsd_plot.WEBGL_THRESHOLD', 2):
+            plots = days(day_data, min_date, max_date)
+            self.assertEqual(plots[0].output_backend, 'webgl')
+            plots = days(day_data, min_date, max_date, webgl=False)
+            self.assertEqual(plots[0].output_backend, 'canvas')
+
+    def test_calendar_heatmap(self):
+        dates = pd.Series(pd.to_datetime(['2023-01-02', '2023-01-02', '2023-01-11']))
+        hours = pd.Series([1.5, 2.0, 1.0])
+
+        p = calendar_heatmap(dates, hours)
+
+        self.assertIsInstance(p, figure)
+        self.assertEqual(p.title.text, 'Hours per Day')
+        data = p.renderers[0].data_source.data
+        # One cell per day in the range, sessions on the same day summed
+        self.assertEqual(len(data['hours']), 10)
+        self.assertEqual(data['hours'][0], 3.5)
+        self.assertEqual(data['hours'][-1], 1.0)
+        self.assertEqual(sum(data['hours']), 4.5)
+        self.assertEqual(list(data['weekday'][:3]), ['Mon', 'Tue', 'Wed'])
+
+    def test_week_slot_hours(self):
+        starts = pd.Series(pd.to_datetime(['2023-01-02 09:15', '2023-01-03 08:00']))
+        ends = pd.Series(pd.to_datetime(['2023-01-02 10:00', '2023-01-03 11:00']))
+
+        grid = week_slot_hours(starts, ends)
+
+        self.assertEqual(grid.shape, (7, 48))
+        self.assertAlmostEqual(grid.sum(), 3.75)
+        # Monday 9:15 to 10:00 is split over the 9:00 and 9:30 slots
+        self.assertEqual(grid[0, 18:20].tolist(), [0.25, 0.5])
+        # Tuesday 8:00 to 11:00 fills six whole slots
+        self.assertEqual(grid[1, 16:22].tolist(), [0.5] * 6)
+        self.assertEqual(grid[1, 22], 0)
+
+    def test_time_of_day_heatmap(self):
+        grid = week_slot_hours(
+            pd.Series(pd.to_datetime(['2023-01-02 09:00'] * 100)),
+            pd.Series(pd.to_datetime(['2023-01-02 10:00'] * 100)),
+        )
+
+        p = time_of_day_heatmap(grid)
+
+        data = p.renderers[0].data_source.data
+        self.assertEqual(len(data['hours']), 7 * 48)
+        self.assertEqual(data['slot'][18], '9:00 to 9:30')
+        self.assertEqual(data['hours'][18], 50)
+
+    def test_teacher_class_heatmap(self):
+        crosstab = pd.DataFrame(
+            {'Math': [3.0, 1.0], 'Reading': [0.0, 2.0]},
+            index=['Mom', 'Dad'],
+        )
+
+        p = teacher_class_heatmap(crosstab)
+
+        self.assertIsInstance(p, figure)
+        self.assertEqual(list(p.x_range.factors), ['Math', 'Reading'])
+        self.assertEqual(list(p.y_range.factors), ['Dad', 'Mom'])
+        data = p.renderers[0].data_source.data
+        self.assertEqual(list(data['teacher']), ['Mom', 'Mom', 'Dad', 'Dad'])
+        self.assertEqual(list(data['class']), ['Math', 'Reading', 'Math', 'Reading'])
+        self.assertEqual(list(data['hours']), [3.0, 0.0, 1.0, 2.0])
+        self.assertEqual(list(data['share']), [0.75, 0.0, 0.25, 1.0])
+
+    def test_total_hours(self):
+        div = total_hours(10, [('Mom', 7.5), ('Dad', 2.5), ('Tutor', 0)])
+
+        self.assertIsInstance(div, Div)
+        self.assertIn('<strong>10</strong>', div.text)
+        self.assertIn('Mom: 75.0%<br/>Dad: 25.0%', div.text)
+        self.assertNotIn('Tutor', div.text)
+
+    def test_window_hours(self):
+        sessions = pd.DataFrame(
+            {
+                'date': pd.to_datetime(
+                    ['2023-01-03', '2023-01-01', '2023-01-02', '2023-01-05']
+                ),
+                'class': ['Math', 'Math', 'Reading', 'Math'],
+                'hours': [2.0, 1.0, 0.5, 4.0],
+            }
+        )
+
+        cumulative = cumulative_hours(sessions, 'class', ['Math', 'Reading', 'Art'])
+        labels, dates, sums = cumulative
+
+        self.assertEqual(labels, ['Math', 'Reading', 'Art'])
+        self.assertEqual(sums, [[0.0, 1.0, 3.0, 7.0], [0.0, 0.5], [0.0]])
+        self.assertEqual(dates[2], [])
+        self.assertEqual(
+            window_hours(*cumulative, datetime(2023, 1, 2), datetime(2023, 1, 3)),
+            [2.0, 0.5, 0.0],
+        )
+        self.assertEqual(
+            window_hours(*cumulative, datetime(2022, 1, 1), datetime(2024, 1, 1)),
+            [7.0, 0.5, 0.0],
+        )
+
+    def test_link_totals(self):
+        sessions = pd.DataFrame(
+            {
+                'date': pd.to_datetime(['2023-01-01', '2023-01-02']),
+                'class': ['ClassA', 'ClassB'],
+                'teacher': ['Mom', 'Dad'],
+                'hours': [1.0, 2.0],
+            }
+        )
+        plot = figure(x_range=(datetime(2023, 1, 1), datetime(2023, 1, 2)))
+        div = total_hours(3, [('Dad', 2.0), ('Mom', 1.0)])
+
+        link_totals(
+            plot.x_range,
+            cumulative_hours(sessions, 'class', ['ClassA', 'ClassB']),
+            cumulative_hours(sessions, 'teacher', ['Dad', 'Mom']),
+            barchart(['ClassA', 'ClassB'], [1.0, 2.0]),
+            donut(['ClassA', 'ClassB'], [1.0, 2.0]),
+            div,
+        )
+
+        self.assertEqual(len(plot.x_range.js_property_callbacks['change:start']), 1)
+        self.assertEqual(len(plot.x_range.js_property_callbacks['change:end']), 1)
+
     def test_reading_list(self):
         # Test the reading_list function with the sample spreadsheet
         book_lists = reading_list(self.path)
@@ -231,6 +378,54 @@ class Tests(unittest.TestCase):
         # Check that the kids columns do not have a level column
         self.assertFalse(any(column.field == 'level' for column in kids_columns))
 
+    def test_reading_list_views_share_sources(self):
+        sources = reading_list_sources(
+            pd.read_excel(self.path, sheet_name=None)
+        )
+
+        first = reading_list_views(sources)
+        second = reading_list_views(sources)
+
+        self.assertEqual(len(sources), 2)
+        self.assertIsNot(first[0][1], second[0][1])
+        self.assertIs(first[0][1].source, second[0][1].source)
+        self.assertIs(first[1][1].source, sources[1][1])
+
+    def test_reading_list_index(self):
+        sources = reading_list_sources(
+            pd.read_excel(self.path, sheet_name=None)
+        )
+
+        index, offsets = reading_list_index(sources)
+        postings = dict(zip(index.data['token'], index.data['ids']))
+
+        self.assertEqual(offsets, [0, 3])
+        self.assertEqual(index.data['token'], sorted(index.data['token']))
+        self.assertEqual(postings['sowell'], [1])
+        # Books are numbered across sheets, Kids starts at 3
+        self.assertEqual(postings['boyack'], [4, 5])
+        self.assertEqual(postings['spanish'], [4, 5])
+        # ISBNs are found with and without dashes
+        self.assertEqual(postings['9780465081387'], [1])
+        self.assertEqual(postings['0465081387'], [1])
+
+    def test_reading_list_views_with_search(self):
+        sources = reading_list_sources(
+            pd.read_excel(self.path, sheet_name=None)
+        )
+        index = reading_list_index(sources)
+
+        views = reading_list_views(sources, index)
+
+        self.assertEqual(len(views), 3)
+        search = views[0][0]
+        self.assertIsInstance(search, TextInput)
+        callback = search.js_property_callbacks['change:value_input'][0]
+        self.assertIs(callback.args['index'], index[0])
+        self.assertEqual(
+            callback.args['filters'], [table.view.filter for _, table in views[1:]]
+        )
+
     def test_reading_list_resolves_relative_path_from_base_dir(self):
         base_dir = os.path.dirname(os.path.abspath(self.path))
 
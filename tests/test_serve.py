@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pandas as pd
+from hsd_serve import DashboardServer, fingerprint
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'Time-1.xlsx')
+        self.write('Fractions')
+        self.server = DashboardServer(('127.0.0.1', 0), [self.path], workers=1)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def write(self, description):
+        df = pd.DataFrame(
+            {
+                'Date': ['2023-01-02'],
+                'Start Time': ['9:00 AM'],
+                'End Time': ['10:00 AM'],
+                'Description': [description],
+                'Grade': ['1st Grade'],
+            }
+        )
+        df.to_excel(self.path, sheet_name='Math', index=False)
+
+    def get(self, path, **headers):
+        try:
+            return urlopen(Request(self.url + path, headers=headers))
+        except HTTPError as e:
+            return e
+
+    def test_fingerprint(self):
+        key = fingerprint([self.path], minify=False)
+
+        self.assertEqual(fingerprint([self.path], minify=False), key)
+        self.assertNotEqual(fingerprint([self.path], minify=True), key)
+        self.write('Decimals and fractions')
+        self.assertNotEqual(fingerprint([self.path], minify=False), key)
+
+    def test_dashboard_is_cached(self):
+        response = self.get('/')
+        etag = response.headers['ETag']
+        body = response.read().decode('utf-8')
+
+        self.assertEqual(response.status, 200)
+        self.assertIn('Fractions', body)
+        self.assertIn('src="/static/js/bokeh.min.js"', body)
+        self.assertEqual(self.get('/', **{'If-None-Match': etag}).status, 304)
+
+        self.write('Decimals and fractions')
+        response = self.get('/', **{'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_static_files(self):
+        response = self.get('/static/js/bokeh.min.js')
+
+        self.assertEqual(response.status, 200)
+        self.assertIn('javascript', response.headers['Content-Type'])
+        self.assertEqual(self.get('/static/../__init__.py').status, 404)
+        self.assertEqual(self.get('/missing').status, 404)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+from hsd_site import INDEX_PAGE, build_site
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.site = os.path.join(self.dir, 'site')
+        self.first = os.path.join(self.dir, 'Time-1.xlsx')
+        self.kindergarten = os.path.join(self.dir, 'Time-K.xlsx')
+        self.write(self.first, '1st Grade', '2023-01-02')
+        self.write(self.kindergarten, 'Kindergarten', '2022-01-03')
+
+    def write(self, path, grade, date, description='Fractions'):
+        df = pd.DataFrame(
+            {
+                'Date': [date],
+                'Start Time': ['9:00 AM'],
+                'End Time': ['10:30 AM'],
+                'Description': [description],
+                'Grade': [grade],
+                'Name': ['Eliana'],
+            }
+        )
+        df.to_excel(path, sheet_name='Math', index=False)
+
+    def read(self, name):
+        with open(os.path.join(self.site, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_build_site(self):
+        rendered = build_site([self.first, self.kindergarten], self.site)
+
+        self.assertEqual(rendered, ['Eliana-1st-Grade.html', 'Eliana-Kindergarten.html'])
+        index = self.read(INDEX_PAGE)
+        self.assertIn('<h2>Eliana</h2>', index)
+        self.assertIn('<a href="Eliana-Kindergarten.html">Kindergarten</a>', index)
+        self.assertIn('1.50', index)
+        page = self.read('Eliana-1st-Grade.html')
+        self.assertIn('src="static/js/bokeh.min.js', page)
+        self.assertIn('href="static/dashboard.css"', page)
+        self.assertNotIn('Kindergarten', page)
+        self.assertTrue(os.path.isfile(os.path.join(self.site, 'static', 'js', 'bokeh.min.js')))
+
+    def test_only_changed_grades_are_rendered(self):
+        build_site([self.first, self.kindergarten], self.site)
+
+        self.assertEqual(build_site([self.first, self.kindergarten], self.site), [])
+
+        self.write(self.first, '1st Grade', '2023-01-02', 'Decimals')
+        self.assertEqual(
+            build_site([self.first, self.kindergarten], self.site), ['Eliana-1st-Grade.html']
+        )
+        self.assertIn('Decimals', self.read('Eliana-1st-Grade.html'))
+
+        build_site([self.first], self.site)
+        self.assertFalse(os.path.exists(os.path.join(self.site, 'Eliana-Kindergarten.html')))
+        self.assertNotIn('Kindergarten', self.read(INDEX_PAGE))
+
+    def test_reading_options_dont_rebuild_pages(self):
+        build_site([self.first, self.kindergarten], self.site)
+
+        rendered = build_site(
+            [self.first, self.kindergarten],
+            self.site,
+            load_options={'chunksize': 1, 'workers': 0},
+        )
+
+        self.assertEqual(rendered, [])
+
+    def test_moved_time_log_keeps_its_page(self):
+        build_site([self.first, self.kindergarten], self.site)
+        os.makedirs(os.path.join(self.dir, 'moved'))
+        moved = os.path.join(self.dir, 'moved', 'Time-1.xlsx')
+        shutil.move(self.first, moved)
+
+        rendered = build_site([moved, self.kindergarten], self.site)
+
+        self.assertEqual(rendered, ['Eliana-1st-Grade.html'])
+        self.assertIn('Fractions', self.read('Eliana-1st-Grade.html'))
+        self.assertIn('href="Eliana-1st-Grade.html"', self.read(INDEX_PAGE))
+
+    def test_new_time_log_doesnt_take_a_kept_page(self):
+        build_site([self.first], self.site)
+        other = os.path.join(self.dir, 'Time-1-copy.xlsx')
+        self.write(other, '1st Grade', '2023-01-02', 'Decimals')
+        self.write(self.first, '1st Grade', '2023-01-02', 'Geometry')
+
+        rendered = build_site([other, self.first], self.site)
+
+        self.assertEqual(rendered, ['Eliana-1st-Grade-2.html', 'Eliana-1st-Grade.html'])
+        self.assertIn('Geometry', self.read('Eliana-1st-Grade.html'))
+        self.assertIn('Decimals', self.read('Eliana-1st-Grade-2.html'))
+
+    def test_index_order(self):
+        build_site(
+            [self.first, self.kindergarten], self.site, load_options={'order': 'oldest'}
+        )
+
+        index = self.read(INDEX_PAGE)
+        self.assertLess(index.index('Kindergarten'), index.index('1st Grade'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
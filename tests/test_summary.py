@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import unittest
+
+from hsd_summary import grade_summary, summary_table
+
+from tests.helpers import make_grade
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.grade = make_grade(
+            dates=['2023-01-02', '2023-01-02', '2023-01-03'],
+            classes=['Math', 'Art', 'Math'],
+            hours=[1.0, 3.0, 1.0],
+            teachers=['Mom', 'Dad', 'Mom'],
+        )
+
+    def test_grade_summary(self):
+        summary = grade_summary(self.grade)
+
+        self.assertEqual(summary['total_hours'], 5.0)
+        self.assertEqual(
+            summary['classes'],
+            {'Math': {'hours': 2.0, 'percent': 40.0}, 'Art': {'hours': 3.0, 'percent': 60.0}},
+        )
+        self.assertEqual(list(summary['teachers']), ['Dad', 'Mom'])
+
+    def test_summary_table(self):
+        table = summary_table([grade_summary(self.grade)])
+
+        self.assertIn('Eliana, 1st Grade: 5.00 hours', table)
+        self.assertIn('Math      2.00   40.00%', table)
+
+    def test_no_bokeh_or_jinja(self):
+        code = 'import sys, hsd_summary; print("bokeh" in sys.modules, "jinja2" in sys.modules)'
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.split(), ['False', 'False'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch, Mock
-from utils import parse_date
+from utils import minify_html, parse_date
 
 
 class TestParseDate(unittest.TestCase):
@@ -83,5 +83,17 @@ class TestParseDate(unittest.TestCase):
         self.assertEqual(parse_date('1:00').strftime('%I:%M %p'), '01:00 AM')
 
 
+class TestMinifyHtml(unittest.TestCase):
+
+    def test_minify_html(self):
+        html = '<div>\n    <p>Hi</p>\n\n    <script>\n      // comment\n      go();\n    </script>\n</div>\n'
+
+        result = minify_html(html)
+
+        self.assertEqual(
+            result, '<div>\n<p>Hi</p>\n<script>\n// comment\ngo();\n</script>\n</div>'
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
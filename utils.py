@@ -14,3 +14,16 @@ def parse_date(date_str):
     if date_str:
         return dateparser.parse(date_str)
     return None
+
+
+def minify_html(text):
+    """Strip indentation and blank lines from HTML, CSS or template source.
+    Line breaks are kept so inline scripts with // comments still work.
+
+    Args:
+        text (str): source to minify.
+
+    Returns:
+        str
+    """
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())